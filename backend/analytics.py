@@ -0,0 +1,271 @@
+import asyncio
+import logging
+import os
+import sys
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from skill_index import SKILLS
+
+
+logger = logging.getLogger(__name__)
+
+# (label, lower bound inclusive, upper bound exclusive) in years of experience
+EXPERIENCE_BUCKETS: List[Tuple[str, int, Optional[int]]] = [
+    ("<1", 0, 1),
+    ("1-2", 1, 3),
+    ("3-4", 3, 5),
+    ("5-9", 5, 10),
+    ("10+", 10, None),
+]
+
+
+def experience_bucket(years: Optional[int]) -> str:
+    years = max(0, years or 0)
+    for label, lower, upper in EXPERIENCE_BUCKETS:
+        if years >= lower and (upper is None or years < upper):
+            return label
+    return EXPERIENCE_BUCKETS[-1][0]
+
+
+def buckets_between(min_years: Optional[int], max_years: Optional[int]) -> List[str]:
+    """Buckets covering exactly [min_years, max_years); both bounds must be bucket edges"""
+    lower_edges = [lower for _, lower, _ in EXPERIENCE_BUCKETS]
+    upper_edges = [upper for _, _, upper in EXPERIENCE_BUCKETS if upper is not None]
+    if min_years is not None and min_years not in lower_edges:
+        raise ValueError(f"min_experience_years must be one of {lower_edges}")
+    if max_years is not None and max_years not in upper_edges:
+        raise ValueError(f"max_experience_years must be one of {upper_edges}")
+    if min_years is not None and max_years is not None and min_years >= max_years:
+        raise ValueError("min_experience_years must be below max_experience_years")
+
+    selected = []
+    for label, lower, upper in EXPERIENCE_BUCKETS:
+        if min_years is not None and lower < min_years:
+            continue
+        if max_years is not None and (upper is None or upper > max_years):
+            continue
+        selected.append(label)
+    return selected
+
+
+def rollup_role(analysis: Dict[str, Any]) -> str:
+    """Role an analysis is counted under: its canonical target role, else the role as asked"""
+    return analysis.get("target_role_canonical") or analysis["target_role"]
+
+
+def _missing_skills(analysis: Dict[str, Any]) -> List[str]:
+    skills, _ = SKILLS.canonicalize_all(analysis.get("missing_skills", []))
+    return skills
+
+
+class SkillGapRollups:
+    """Materialized "missing skill" counts per target role x experience bucket.
+
+    Each user contributes their latest analysis per target role. ``fold`` applies
+    the difference between a user's previous and new analysis as ``$inc`` updates,
+    so the rollups stay current without scanning ``skill_gap_analyses``. The
+    analysis currently counted for a user and role carries ``rolled_up: true``;
+    only that one is ever subtracted, so analyses stored before the rollups existed
+    (or whose fold failed) cannot drive counts negative. The marker moves before
+    the counts change and moves back if they could not be changed. Run ``rebuild`` once after
+    deploying to count those older analyses too. Concurrent analyses for the same
+    user and role can skew counts slightly; ``rebuild`` recomputes everything from
+    the source collections and swaps the result in.
+    """
+
+    def __init__(self, db, rollups: str = "skill_gap_rollups", cohorts: str = "skill_gap_cohorts"):
+        self.db = db
+        self.rollups_name = rollups
+        self.cohorts_name = cohorts
+
+    async def ensure_indexes(self):
+        await self.db[self.rollups_name].create_index([("role", 1), ("experience_bucket", 1), ("count", -1)])
+        await self.db[self.cohorts_name].create_index([("role", 1), ("experience_bucket", 1)])
+        await self.db.skill_gap_analyses.create_index([("user_id", 1), ("rolled_up", 1)])
+
+    async def fold(self, analysis: Dict[str, Any]):
+        """Count a newly stored analysis in place of the user's currently counted one for the role"""
+        role = rollup_role(analysis)
+        previous = await self.db.skill_gap_analyses.find_one({
+            "user_id": analysis["user_id"],
+            "rolled_up": True,
+            "id": {"$ne": analysis["id"]},
+            "$or": [{"target_role_canonical": role}, {"target_role_canonical": None, "target_role": role}],
+        })
+        # Move the marker before touching the counts: a failed marking then leaves the
+        # counts alone instead of counting an analysis that can never be subtracted
+        try:
+            await self._mark(analysis, previous)
+            await self.record(analysis, previous)
+        except Exception:
+            await self._mark(previous, analysis)
+            raise
+
+    async def _mark(self, counted: Optional[Dict[str, Any]], uncounted: Optional[Dict[str, Any]]):
+        if counted:
+            await self.db.skill_gap_analyses.update_one({"id": counted["id"]}, {"$set": {"rolled_up": True}})
+        if uncounted:
+            await self.db.skill_gap_analyses.update_one({"id": uncounted["id"]}, {"$set": {"rolled_up": False}})
+
+    async def record(self, analysis: Dict[str, Any], previous: Optional[Dict[str, Any]] = None):
+        """Apply the rollup deltas for counting ``analysis`` instead of ``previous`` (which must be counted)"""
+        role = rollup_role(analysis)
+        skill_delta: Counter = Counter()
+        cohort_delta: Counter = Counter()
+
+        bucket = analysis["experience_bucket"]
+        cohort_delta[bucket] += 1
+        for skill in _missing_skills(analysis):
+            skill_delta[(bucket, skill)] += 1
+
+        if previous:
+            previous_bucket = previous.get("experience_bucket") or bucket
+            cohort_delta[previous_bucket] -= 1
+            for skill in _missing_skills(previous):
+                skill_delta[(previous_bucket, skill)] -= 1
+
+        now = datetime.now(timezone.utc).isoformat()
+        skill_ops = [
+            UpdateOne(
+                {"_id": f"{role}|{bucket}|{skill}"},
+                {"$inc": {"count": delta}, "$set": {"role": role, "experience_bucket": bucket, "skill": skill, "updated_at": now}},
+                upsert=True
+            )
+            for (bucket, skill), delta in skill_delta.items() if delta
+        ]
+        cohort_ops = [
+            UpdateOne(
+                {"_id": f"{role}|{bucket}"},
+                {"$inc": {"users": delta}, "$set": {"role": role, "experience_bucket": bucket, "updated_at": now}},
+                upsert=True
+            )
+            for bucket, delta in cohort_delta.items() if delta
+        ]
+        if skill_ops:
+            await self.db[self.rollups_name].bulk_write(skill_ops, ordered=False)
+        if cohort_ops:
+            await self.db[self.cohorts_name].bulk_write(cohort_ops, ordered=False)
+
+    async def top_missing_skills(self, role: str, min_experience_years: Optional[int] = None, max_experience_years: Optional[int] = None, limit: int = 10) -> Dict[str, Any]:
+        buckets = buckets_between(min_experience_years, max_experience_years)
+        cohort_filter = {"role": role, "experience_bucket": {"$in": buckets}}
+
+        skills_pipeline = [
+            {"$match": {**cohort_filter, "count": {"$gt": 0}}},
+            {"$group": {"_id": "$skill", "count": {"$sum": "$count"}}},
+            {"$sort": {"count": -1, "_id": 1}},
+            {"$limit": limit},
+        ]
+        users_pipeline = [
+            {"$match": cohort_filter},
+            {"$group": {"_id": None, "users": {"$sum": "$users"}}},
+        ]
+        skills, users = await asyncio.gather(
+            self.db[self.rollups_name].aggregate(skills_pipeline).to_list(limit),
+            self.db[self.cohorts_name].aggregate(users_pipeline).to_list(1),
+        )
+        total_users = users[0]["users"] if users else 0
+
+        return {
+            "role": role,
+            "experience_buckets": buckets,
+            "users": total_users,
+            "top_missing_skills": [
+                {"skill": s["_id"], "users": s["count"], "share": round(s["count"] / total_users, 4) if total_users else 0.0}
+                for s in skills
+            ],
+        }
+
+    async def rebuild(self, batch_size: int = 1000) -> Dict[str, int]:
+        """Recompute all rollups from skill_gap_analyses and atomically replace the current ones"""
+        pipeline = [
+            {"$match": {"source": {"$ne": "fallback"}}},
+            {"$sort": {"created_at": -1}},
+            {"$group": {
+                "_id": {"user_id": "$user_id", "target_role": {"$ifNull": ["$target_role_canonical", "$target_role"]}},
+                "id": {"$first": "$id"},
+                "missing_skills": {"$first": "$missing_skills"},
+                "experience_bucket": {"$first": "$experience_bucket"},
+            }},
+        ]
+        skill_counts: Counter = Counter()
+        cohort_counts: Counter = Counter()
+        counted_ids: List[str] = []
+        pending: List[Dict[str, Any]] = []
+
+        async def flush():
+            # Older analyses predate the stored bucket: fall back to the profile's experience
+            missing = list({doc["_id"]["user_id"] for doc in pending if not doc.get("experience_bucket")})
+            experience = {}
+            if missing:
+                async for profile in self.db.user_profiles.find({"id": {"$in": missing}}, {"id": 1, "experience_years": 1}):
+                    experience[profile["id"]] = profile.get("experience_years")
+            for doc in pending:
+                counted_ids.append(doc["id"])
+                bucket = doc.get("experience_bucket") or experience_bucket(experience.get(doc["_id"]["user_id"]))
+                role = doc["_id"]["target_role"]
+                cohort_counts[(role, bucket)] += 1
+                for skill in _missing_skills(doc):
+                    skill_counts[(role, bucket, skill)] += 1
+            pending.clear()
+
+        async for doc in self.db.skill_gap_analyses.aggregate(pipeline, allowDiskUse=True, batchSize=batch_size):
+            pending.append(doc)
+            if len(pending) >= batch_size:
+                await flush()
+        await flush()
+
+        now = datetime.now(timezone.utc).isoformat()
+        await self._swap(self.rollups_name, [
+            {"_id": f"{role}|{bucket}|{skill}", "role": role, "experience_bucket": bucket, "skill": skill, "count": count, "updated_at": now}
+            for (role, bucket, skill), count in skill_counts.items()
+        ])
+        await self._swap(self.cohorts_name, [
+            {"_id": f"{role}|{bucket}", "role": role, "experience_bucket": bucket, "users": users, "updated_at": now}
+            for (role, bucket), users in cohort_counts.items()
+        ])
+        await self.ensure_indexes()
+
+        # Exactly the analyses just counted are the ones later folds may subtract
+        await self.db.skill_gap_analyses.update_many({"rolled_up": True}, {"$set": {"rolled_up": False}})
+        for start in range(0, len(counted_ids), batch_size):
+            await self.db.skill_gap_analyses.update_many({"id": {"$in": counted_ids[start:start + batch_size]}}, {"$set": {"rolled_up": True}})
+
+        return {"cohorts": len(cohort_counts), "skill_rows": len(skill_counts), "analyses": sum(cohort_counts.values())}
+
+    async def _swap(self, name: str, docs: List[Dict[str, Any]]):
+        staging = self.db[f"{name}_rebuild"]
+        await staging.drop()
+        for start in range(0, len(docs), 1000):
+            await staging.insert_many(docs[start:start + 1000])
+        if docs:
+            await staging.rename(name, dropTarget=True)
+        else:
+            await self.db[name].delete_many({})
+
+
+if __name__ == "__main__":
+    # Full rebuild: python analytics.py rebuild
+    from pathlib import Path
+
+    from dotenv import load_dotenv
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    if sys.argv[1:] != ["rebuild"]:
+        print("usage: python analytics.py rebuild")
+        sys.exit(1)
+
+    load_dotenv(Path(__file__).parent / '.env')
+    logging.basicConfig(level=logging.INFO)
+
+    async def main():
+        client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+        result = await SkillGapRollups(client[os.environ['DB_NAME']]).rebuild()
+        print(f"Rebuilt skill gap rollups: {result}")
+        client.close()
+
+    asyncio.run(main())
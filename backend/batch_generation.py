@@ -0,0 +1,243 @@
+import json
+import logging
+from collections import deque
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken is optional, estimates fall back to ~4 characters per token
+    tiktoken = None
+
+
+logger = logging.getLogger(__name__)
+
+RECOMMENDATION_FIELDS = (
+    "job_title",
+    "description",
+    "required_skills",
+    "salary_range",
+    "growth_potential",
+    "match_percentage",
+    "reasons",
+    "learning_resources",
+)
+
+# Shared instruction block, sent once per batch instead of once per profile
+BATCH_INSTRUCTIONS = """Generate 5 personalized career recommendations for EACH of the user profiles below.
+Each profile line starts with a reference like u1; treat every profile independently.
+
+For each recommendation, provide:
+1. Job title
+2. Brief description (2-3 sentences)
+3. Required skills (list of 5-8 skills)
+4. Salary range (realistic based on location and experience)
+5. Growth potential (High/Medium/Low with brief explanation)
+6. Match percentage (0-100%)
+7. 3-4 specific reasons why this role fits
+8. 3-4 learning resources (with titles and types like "Course", "Certification", "Book")
+
+Respond with a single JSON object mapping each profile reference to a JSON array of its recommendations,
+e.g. {"u1": [...], "u2": [...]}, using these exact field names: """ + ", ".join(RECOMMENDATION_FIELDS) + """.
+
+Profiles:
+"""
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:  # the BPE file is fetched on first use and may be unavailable
+        logger.warning(f"tiktoken encoding unavailable, estimating tokens from length: {e}")
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    return len(text) // 4 + 1
+
+
+def compact_profile_summary(ref: str, profile: Dict[str, Any]) -> str:
+    """One-line profile summary for a batch prompt (no name or contact details)"""
+    parts = [
+        ref,
+        f"education: {profile.get('education') or '-'}",
+        f"role: {profile.get('current_role') or '-'}",
+        f"experience: {profile.get('experience_years') or 0}y",
+        f"skills: {', '.join(profile.get('skills', [])) or '-'}",
+        f"interests: {', '.join(profile.get('interests', [])) or '-'}",
+        f"goals: {', '.join(profile.get('career_goals', [])) or '-'}",
+        f"industries: {', '.join(profile.get('preferred_industries', [])) or '-'}",
+    ]
+    return " | ".join(parts)
+
+
+def _valid_recommendations(value: Any) -> bool:
+    return (
+        isinstance(value, list)
+        and len(value) > 0
+        and all(isinstance(rec, dict) and all(field in rec for field in RECOMMENDATION_FIELDS) for rec in value)
+    )
+
+
+class AdaptiveBatchSizer:
+    """Chooses how many profiles go into the next batch prompt.
+
+    The size grows by one after every fully parsed batch and halves after a parse
+    failure (additive increase, multiplicative decrease). It is also capped so the
+    estimated prompt plus expected completion fits in ``token_budget``; the
+    expected completion per profile is a moving average of what responses have
+    actually used.
+    """
+
+    def __init__(self, token_budget: int = 12000, initial_size: int = 4, max_size: int = 20, output_tokens_per_profile: int = 1000):
+        self.token_budget = token_budget
+        self.size = initial_size
+        self.max_size = max_size
+        self.output_tokens_per_profile = float(output_tokens_per_profile)
+        self.prefix_tokens = estimate_tokens(BATCH_INSTRUCTIONS)
+
+    def budget_cap(self, summary_tokens: float) -> int:
+        per_profile = summary_tokens + self.output_tokens_per_profile
+        return max(1, int((self.token_budget - self.prefix_tokens) // per_profile))
+
+    def next_size(self, summary_tokens: float) -> int:
+        return max(1, min(self.size, self.max_size, self.budget_cap(summary_tokens)))
+
+    def on_success(self, batch_size: int, response_tokens: int):
+        observed = response_tokens / batch_size
+        self.output_tokens_per_profile = 0.7 * self.output_tokens_per_profile + 0.3 * observed
+        self.size = min(self.max_size, max(self.size, batch_size) + 1)
+
+    def on_failure(self, batch_size: int):
+        self.size = max(1, batch_size // 2)
+
+
+class BatchRecommendationGenerator:
+    """Generates career recommendations for many profiles with few LLM calls.
+
+    Profiles are packed into prompts that share one instruction block and refer to
+    each profile as ``u1``, ``u2``, ... The JSON response is split back out per
+    profile. A response that does not parse is retried as two halves (down to one
+    profile), and profiles missing from an otherwise valid response are retried on
+    their own batch. ``send`` performs one LLM call for a prompt.
+    """
+
+    def __init__(self, send: Callable[[str], Awaitable[str]], sizer: Optional[AdaptiveBatchSizer] = None):
+        self.send = send
+        self.sizer = sizer or AdaptiveBatchSizer()
+        self.stats = {"calls": 0, "profiles_requested": 0, "profiles_generated": 0, "parse_failures": 0, "call_failures": 0, "failed_profiles": 0}
+
+    async def generate(self, profiles: List[Dict[str, Any]]) -> Tuple[Dict[str, List[Dict[str, Any]]], List[str]]:
+        """(recommendation data per user id, user ids that could not be generated)"""
+        results: Dict[str, List[Dict[str, Any]]] = {}
+        failed: List[str] = []
+        queue = deque(profiles)
+        self.stats["profiles_requested"] += len(profiles)
+
+        while queue:
+            pending = list(queue)[:self.sizer.max_size]
+            summary_tokens = sum(estimate_tokens(compact_profile_summary("u0", p)) for p in pending) / len(pending)
+            size = self.sizer.next_size(summary_tokens)
+            batch = [queue.popleft() for _ in range(min(size, len(queue)))]
+            await self._run(batch, results, failed)
+
+        self.stats["failed_profiles"] += len(failed)
+        return results, failed
+
+    async def _run(self, batch: List[Dict[str, Any]], results: Dict[str, List[Dict[str, Any]]], failed: List[str]):
+        refs = {f"u{i}": profile for i, profile in enumerate(batch, start=1)}
+        prompt = BATCH_INSTRUCTIONS + "\n".join(compact_profile_summary(ref, profile) for ref, profile in refs.items())
+
+        self.stats["calls"] += 1
+        try:
+            response = await self.send(prompt)
+        except Exception as e:
+            self.stats["call_failures"] += 1
+            logger.warning(f"Batch recommendation call for {len(batch)} profiles failed: {e}")
+            failed.extend(profile["id"] for profile in batch)
+            return
+
+        try:
+            parsed = json.loads(response)
+            if not isinstance(parsed, dict):
+                raise ValueError("expected a JSON object keyed by profile reference")
+        except ValueError as e:
+            parsed = {}
+            logger.warning(f"Batch recommendation response for {len(batch)} profiles did not parse: {e}")
+
+        missing = []
+        for ref, profile in refs.items():
+            if _valid_recommendations(parsed.get(ref)):
+                results[profile["id"]] = parsed[ref]
+                self.stats["profiles_generated"] += 1
+            else:
+                missing.append(profile)
+
+        if len(missing) < len(batch):
+            self.sizer.on_success(len(batch), estimate_tokens(response))
+            if missing:
+                await self._run(missing, results, failed)
+            return
+
+        # Nothing usable came back: likely truncated or malformed, so shrink and split
+        self.stats["parse_failures"] += 1
+        self.sizer.on_failure(len(batch))
+        if len(batch) == 1:
+            failed.append(batch[0]["id"])
+            return
+        middle = len(batch) // 2
+        await self._run(batch[:middle], results, failed)
+        await self._run(batch[middle:], results, failed)
+
+    def describe(self) -> Dict[str, Any]:
+        calls = self.stats["calls"]
+        return {
+            **self.stats,
+            "profiles_per_call": round(self.stats["profiles_generated"] / calls, 2) if calls else None,
+            "batch_size": self.sizer.size,
+            "token_budget": self.sizer.token_budget,
+            "output_tokens_per_profile": round(self.sizer.output_tokens_per_profile),
+            "token_estimator": "tiktoken" if _encoding() is not None else "chars/4",
+        }
+
+
+async def backfill_recommendations(
+    db,
+    generator: BatchRecommendationGenerator,
+    store: Callable[[str, List[Dict[str, Any]]], Awaitable[Any]],
+    limit: Optional[int] = None,
+    chunk_size: int = 100,
+) -> Dict[str, int]:
+    """Generate recommendations in batches for every profile that has none yet.
+
+    ``store`` persists one user's recommendation data; see scripts/backfill_recommendations.py.
+    """
+    have = set(await db.career_recommendations.distinct("user_id"))
+    # Collect ids up front: LLM calls between chunks would outlive an open cursor
+    user_ids = [
+        profile["id"] async for profile in db.user_profiles.find({}, {"id": 1})
+        if profile["id"] not in have
+    ][:limit]
+
+    totals = {"profiles": 0, "generated": 0, "failed": 0}
+    for start in range(0, len(user_ids), chunk_size):
+        chunk_ids = user_ids[start:start + chunk_size]
+        profiles = await db.user_profiles.find({"id": {"$in": chunk_ids}}).to_list(len(chunk_ids))
+        generated, failed = await generator.generate(profiles)
+        for user_id, recommendations_data in generated.items():
+            try:
+                await store(user_id, recommendations_data)
+                totals["generated"] += 1
+            except Exception as e:
+                logger.warning(f"Backfilled recommendations for {user_id} could not be stored: {e}")
+                failed.append(user_id)
+        totals["profiles"] += len(profiles)
+        totals["failed"] += len(failed)
+        logger.info(f"Backfill progress: {totals}")
+    return totals
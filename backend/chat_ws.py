@@ -0,0 +1,144 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Set
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+
+logger = logging.getLogger(__name__)
+
+# handle_message(session, thread_id, text) - produces the reply frames for one message
+MessageHandler = Callable[["ChatSocketSession", str, str], Awaitable[None]]
+
+
+class ChatSocketSession:
+    """One mentor chat WebSocket: per-connection state plus multiplexed threads.
+
+    Client frames are JSON objects with a ``type``:
+
+    - ``{"type": "message", "thread_id": "...", "message": "..."}``
+    - ``{"type": "pong"}`` in answer to a server ``ping``
+    - ``{"type": "reload_profile"}`` to refresh the cached profile context
+
+    Messages on different threads are answered concurrently; messages on the same
+    thread are answered in order. The server sends ``ping`` every
+    ``heartbeat_seconds`` and closes the socket when the client stops answering,
+    or when nothing has happened for ``idle_timeout_seconds``.
+    """
+
+    def __init__(
+        self,
+        websocket: WebSocket,
+        user_id: str,
+        handle_message: MessageHandler,
+        reload_profile: Callable[["ChatSocketSession"], Awaitable[None]],
+        heartbeat_seconds: float = 20.0,
+        idle_timeout_seconds: float = 300.0,
+        max_threads: int = 8,
+    ):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.handle_message = handle_message
+        self.reload_profile = reload_profile
+        self.heartbeat_seconds = heartbeat_seconds
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.max_threads = max_threads
+
+        # Filled in by reload_profile and the message handler
+        self.profile: Dict[str, Any] = {}
+        self.context = ""
+        self.thread_history: Dict[str, list] = {}
+
+        self._send_lock = asyncio.Lock()
+        self._thread_locks: Dict[str, asyncio.Lock] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._last_activity = time.monotonic()
+        self._last_seen = time.monotonic()
+        self._closed = False
+
+    async def send(self, payload: Dict[str, Any]):
+        if self._closed:
+            return
+        async with self._send_lock:
+            await self.websocket.send_json(payload)
+
+    async def close(self, code: int = 1000, reason: str = ""):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            await self.websocket.close(code=code, reason=reason)
+        except RuntimeError:
+            pass  # already closed by the client
+
+    async def _answer(self, thread_id: str, text: str):
+        async with self._thread_locks[thread_id]:
+            try:
+                await self.handle_message(self, thread_id, text)
+            except Exception:
+                # The detail (database, LLM client) stays in the log, not on the wire
+                logger.exception(f"WebSocket chat reply failed for {self.user_id}")
+                await self.send({"type": "error", "thread_id": thread_id, "detail": "Could not answer this message, please try again"})
+            finally:
+                self._last_activity = time.monotonic()
+
+    async def _watchdog(self):
+        while not self._closed:
+            await asyncio.sleep(self.heartbeat_seconds)
+            now = time.monotonic()
+            if now - self._last_seen > 2 * self.heartbeat_seconds:
+                await self.close(code=1001, reason="heartbeat timeout")
+                return
+            if not self._tasks and now - self._last_activity > self.idle_timeout_seconds:
+                await self.close(code=1000, reason="idle timeout")
+                return
+            await self.send({"type": "ping"})
+
+    async def run(self):
+        await self.reload_profile(self)
+        await self.send({"type": "ready", "user_id": self.user_id})
+
+        watchdog = asyncio.create_task(self._watchdog())
+        try:
+            while not self._closed:
+                raw = await self.websocket.receive_text()
+                self._last_seen = time.monotonic()
+                try:
+                    frame = json.loads(raw)
+                    kind = frame.get("type")
+                except (ValueError, AttributeError):
+                    await self.send({"type": "error", "detail": "Frames must be JSON objects"})
+                    continue
+
+                if kind == "pong":
+                    continue
+                self._last_activity = self._last_seen
+
+                if kind == "reload_profile":
+                    await self.reload_profile(self)
+                    await self.send({"type": "profile_reloaded"})
+                elif kind == "message":
+                    thread_id = str(frame.get("thread_id") or "default")
+                    text = (frame.get("message") or "").strip()
+                    if not text:
+                        await self.send({"type": "error", "thread_id": thread_id, "detail": "Empty message"})
+                        continue
+                    if thread_id not in self._thread_locks and len(self._thread_locks) >= self.max_threads:
+                        await self.send({"type": "error", "thread_id": thread_id, "detail": "Too many threads on this connection"})
+                        continue
+                    self._thread_locks.setdefault(thread_id, asyncio.Lock())
+                    task = asyncio.create_task(self._answer(thread_id, text))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+                else:
+                    await self.send({"type": "error", "detail": f"Unknown frame type: {kind}"})
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+        finally:
+            self._closed = True
+            watchdog.cancel()
+            for task in list(self._tasks):
+                task.cancel()
+            await asyncio.gather(watchdog, *self._tasks, return_exceptions=True)
@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the dependency while the breaker is open"""
+
+
+class CircuitBreaker:
+    """Error-rate and latency circuit breaker for an async dependency.
+
+    While closed, the outcome of every call is kept in a rolling window. Once the
+    window holds ``min_calls`` outcomes and either the failure rate or the slow-call
+    rate reaches its threshold, the breaker opens and calls fail immediately with
+    ``CircuitOpenError``. After ``open_seconds`` it goes half-open and lets up to
+    ``half_open_probes`` calls through; that many successes close it again, any
+    failure re-opens it.
+
+    Each call remembers the breaker generation (bumped on every state change) it
+    was admitted in and whether it was a probe. Outcomes of calls admitted in an
+    earlier generation - e.g. a slow call started while closed that returns during
+    half-open - still count in the counters but never move the state.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: int = 50,
+        min_calls: int = 10,
+        failure_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 30.0,
+        slow_call_rate_threshold: float = 0.8,
+        open_seconds: float = 30.0,
+        half_open_probes: int = 2,
+        call_timeout: Optional[float] = None,
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.call_timeout = call_timeout
+
+        self.state = CLOSED
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window)  # (failed, slow)
+        self._opened_at = 0.0
+        self._generation = 0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self.counters = {"calls": 0, "failures": 0, "slow_calls": 0, "rejected": 0, "opened": 0}
+
+    def _transition(self, state: str):
+        if state == self.state:
+            return
+        logger.warning(f"Circuit breaker '{self.name}': {self.state} -> {state}")
+        self.state = state
+        self._generation += 1
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+            self.counters["opened"] += 1
+        elif state == HALF_OPEN:
+            self._probes_in_flight = 0
+            self._probe_successes = 0
+        elif state == CLOSED:
+            self._outcomes.clear()
+
+    def _admit(self) -> Optional[Tuple[int, bool]]:
+        """(generation, is_probe) for an admitted call, None if it must be rejected"""
+        if self.state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN)
+
+        if self.state == CLOSED:
+            return self._generation, False
+        if self.state == HALF_OPEN and self._probes_in_flight < self.half_open_probes:
+            self._probes_in_flight += 1
+            return self._generation, True
+        return None
+
+    def _rates(self) -> Tuple[float, float]:
+        if not self._outcomes:
+            return 0.0, 0.0
+        failures = sum(1 for failed, _ in self._outcomes if failed)
+        slow = sum(1 for _, is_slow in self._outcomes if is_slow)
+        return failures / len(self._outcomes), slow / len(self._outcomes)
+
+    def _record(self, failed: bool, elapsed: float, generation: int, probe: bool):
+        slow = elapsed >= self.slow_call_seconds
+        if failed:
+            self.counters["failures"] += 1
+        if slow:
+            self.counters["slow_calls"] += 1
+
+        if generation != self._generation:
+            return
+
+        if probe:
+            self._probes_in_flight -= 1
+            if failed or slow:
+                self._transition(OPEN)
+            else:
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_probes:
+                    self._transition(CLOSED)
+            return
+
+        if self.state != CLOSED:
+            return
+
+        self._outcomes.append((failed, slow))
+        if len(self._outcomes) < self.min_calls:
+            return
+        failure_rate, slow_rate = self._rates()
+        if failure_rate >= self.failure_rate_threshold or slow_rate >= self.slow_call_rate_threshold:
+            self._transition(OPEN)
+
+    async def call(self, func: Callable[[], Awaitable[Any]]) -> Any:
+        admitted = self._admit()
+        if admitted is None:
+            self.counters["rejected"] += 1
+            raise CircuitOpenError(f"Circuit '{self.name}' is open")
+        generation, probe = admitted
+
+        self.counters["calls"] += 1
+        started = time.monotonic()
+        try:
+            if self.call_timeout:
+                result = await asyncio.wait_for(func(), timeout=self.call_timeout)
+            else:
+                result = await func()
+        except asyncio.CancelledError:
+            # The caller went away; that says nothing about the dependency
+            if probe and generation == self._generation:
+                self._probes_in_flight -= 1
+            raise
+        except Exception:
+            self._record(True, time.monotonic() - started, generation, probe)
+            raise
+
+        self._record(False, time.monotonic() - started, generation, probe)
+        return result
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == OPEN and time.monotonic() - self._opened_at < self.open_seconds
+
+    def stats(self) -> Dict[str, Any]:
+        failure_rate, slow_rate = self._rates()
+        return {
+            "state": self.state,
+            "window_calls": len(self._outcomes),
+            "failure_rate": failure_rate,
+            "slow_call_rate": slow_rate,
+            "seconds_until_half_open": max(0.0, self.open_seconds - (time.monotonic() - self._opened_at)) if self.state == OPEN else 0.0,
+            "counters": dict(self.counters),
+        }
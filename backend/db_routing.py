@@ -0,0 +1,113 @@
+import logging
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+from pymongo.read_preferences import Nearest, Primary, PrimaryPreferred, Secondary, SecondaryPreferred
+
+
+logger = logging.getLogger(__name__)
+
+# MongoDB rejects maxStalenessSeconds below 90
+MIN_MAX_STALENESS_SECONDS = 90
+
+_MODES = {
+    "primary": Primary,
+    "primarypreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondarypreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+
+def parse_read_preferences(spec: str) -> Dict[str, str]:
+    """Parse ``endpoint=mode,endpoint=mode`` into a dict, e.g. ``get_profile=secondaryPreferred``"""
+    preferences = {}
+    for item in spec.split(","):
+        if not item.strip():
+            continue
+        endpoint, _, mode = item.partition("=")
+        if mode.strip().lower() not in _MODES:
+            raise ValueError(f"Unknown read preference '{mode}' for {endpoint}")
+        preferences[endpoint.strip()] = mode.strip().lower()
+    return preferences
+
+
+def pool_options(max_pool_size: Optional[str], min_pool_size: Optional[str], max_idle_time_ms: Optional[str]) -> Dict[str, int]:
+    """AsyncIOMotorClient pool keyword arguments for the settings that are configured"""
+    options = {}
+    if max_pool_size:
+        options["maxPoolSize"] = int(max_pool_size)
+    if min_pool_size:
+        options["minPoolSize"] = int(min_pool_size)
+    if max_idle_time_ms:
+        options["maxIdleTimeMS"] = int(max_idle_time_ms)
+    return options
+
+
+class ReadRouter:
+    """Picks the read preference for each endpoint's reads on a replica set.
+
+    Endpoints listed in ``preferences`` read with that mode (bounded by
+    ``max_staleness_seconds`` for the non-primary modes); everything else reads from
+    the primary. After ``note_write(user_id)`` that user's reads go to the primary
+    for ``stickiness_seconds`` so they always see their own writes. Stickiness is
+    tracked per worker process, which is enough while a client's requests stay on
+    one worker for the few seconds after a write; the window defaults to the
+    staleness bound so a secondary that lags by less than that is never consulted
+    too early.
+
+    On a standalone server every mode degrades to reading from that server.
+    """
+
+    def __init__(self, db, preferences: Dict[str, str], max_staleness_seconds: int = MIN_MAX_STALENESS_SECONDS, stickiness_seconds: Optional[float] = None):
+        if max_staleness_seconds < MIN_MAX_STALENESS_SECONDS:
+            logger.warning(f"maxStalenessSeconds must be at least {MIN_MAX_STALENESS_SECONDS}, using that instead of {max_staleness_seconds}")
+            max_staleness_seconds = MIN_MAX_STALENESS_SECONDS
+
+        self.db = db
+        self.preferences = preferences
+        self.max_staleness_seconds = max_staleness_seconds
+        self.stickiness_seconds = stickiness_seconds if stickiness_seconds is not None else max_staleness_seconds
+        self._read_preferences = {
+            endpoint: self._build(mode) for endpoint, mode in preferences.items()
+        }
+        self._sticky_until: Dict[str, float] = {}
+        self.stats: Counter = Counter()
+
+    def _build(self, mode: str):
+        if mode == "primary":
+            return Primary()
+        return _MODES[mode](max_staleness=self.max_staleness_seconds)
+
+    def note_write(self, user_id: str):
+        now = time.monotonic()
+        self._sticky_until[user_id] = now + self.stickiness_seconds
+        # Drop expired entries now and then so the map stays small
+        if len(self._sticky_until) > 10000:
+            self._sticky_until = {uid: until for uid, until in self._sticky_until.items() if until > now}
+
+    def is_sticky(self, user_id: Optional[str]) -> bool:
+        return user_id is not None and self._sticky_until.get(user_id, 0) > time.monotonic()
+
+    def collection(self, name: str, endpoint: str, user_id: Optional[str] = None):
+        """The collection handle to read ``name`` with for this endpoint and user"""
+        read_preference = self._read_preferences.get(endpoint)
+        if read_preference is None:
+            self.stats["primary"] += 1
+            return self.db[name]
+        if self.is_sticky(user_id):
+            self.stats["sticky_primary"] += 1
+            return self.db[name]
+
+        self.stats[self.preferences[endpoint]] += 1
+        return self.db.get_collection(name, read_preference=read_preference)
+
+    def describe(self) -> Dict:
+        return {
+            "preferences": self.preferences,
+            "max_staleness_seconds": self.max_staleness_seconds,
+            "stickiness_seconds": self.stickiness_seconds,
+            "sticky_users": sum(1 for until in self._sticky_until.values() if until > time.monotonic()),
+            "reads": dict(self.stats),
+        }
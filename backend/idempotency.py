@@ -0,0 +1,225 @@
+import asyncio
+import hashlib
+import json
+import logging
+import uuid
+from datetime import datetime, timezone, timedelta
+from typing import Dict, Optional, Tuple
+
+from pymongo.errors import DuplicateKeyError
+from starlette.datastructures import Headers
+
+
+logger = logging.getLogger(__name__)
+
+IN_PROGRESS = "in_progress"
+COMPLETED = "completed"
+
+# (status, [(header, value)], body) of a finished response
+StoredResponse = Tuple[int, list, bytes]
+
+# Response headers worth replaying; everything else is recomputed by outer middleware
+REPLAYED_HEADERS = {b"content-type", b"etag", b"last-modified", b"location"}
+
+
+async def ensure_indexes(collection):
+    # Completed keys expire after the TTL, in-progress claims once their owner stops renewing them
+    await collection.create_index("expires_at", expireAfterSeconds=0)
+
+
+class IdempotencyMiddleware:
+    """``Idempotency-Key`` support for POST routes under ``path_prefix``.
+
+    The first request with a key claims it by inserting an ``in_progress`` document
+    (the key is the ``_id``, so only one request can win). Its response is captured
+    and stored with a TTL, then replayed for later requests with the same key. A
+    duplicate that arrives while the original is still running waits for it - on
+    the same worker through an in-memory future, across workers by polling the
+    document - and receives the same response. Reusing a key with a different
+    request body is rejected with 422. Server errors (5xx) are not stored, so the
+    client may retry them with the same key.
+
+    A claim records an owner token and expires after ``claim_seconds`` unless the
+    owner renews it; the owner renews it while the handler runs, however long that
+    takes, so only a crashed owner's claim lapses. Finishing or releasing a claim
+    only acts on a document that still carries the owner's token.
+    """
+
+    def __init__(
+        self,
+        app,
+        collection,
+        path_prefix: str = "/api",
+        ttl_seconds: int = 24 * 3600,
+        wait_timeout: float = 120.0,
+        poll_interval: float = 0.25,
+        max_body_bytes: int = 1024 * 1024,
+        claim_seconds: float = 120.0,
+    ):
+        self.app = app
+        self.collection = collection
+        self.path_prefix = path_prefix
+        self.ttl_seconds = ttl_seconds
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.max_body_bytes = max_body_bytes
+        self.claim_seconds = claim_seconds
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        key = Headers(scope=scope).get("idempotency-key")
+        if not key:
+            await self.app(scope, receive, send)
+            return
+
+        # Buffer the request body so it can be fingerprinted and then handed to the app
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        body = b"".join(chunks)
+
+        fingerprint = hashlib.sha256(
+            b"\0".join([scope["path"].encode(), scope.get("query_string", b""), body])
+        ).hexdigest()
+
+        owner = uuid.uuid4().hex
+        now = datetime.now(timezone.utc)
+        try:
+            await self.collection.insert_one({
+                "_id": key,
+                "owner": owner,
+                "fingerprint": fingerprint,
+                "status": IN_PROGRESS,
+                "created_at": now.isoformat(),
+                # A crashed owner must not block the key forever
+                "expires_at": now + timedelta(seconds=self.claim_seconds),
+            })
+        except DuplicateKeyError:
+            await self._serve_duplicate(key, fingerprint, send)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        heartbeat = asyncio.create_task(self._renew_claim(key, owner))
+        try:
+            stored = await self._run_and_capture(scope, body, receive, send)
+            heartbeat.cancel()
+            await self._finish(key, owner, stored)
+            future.set_result(stored)
+        except BaseException as e:
+            heartbeat.cancel()
+            await self.collection.delete_one({"_id": key, "owner": owner, "status": IN_PROGRESS})
+            future.set_exception(e if isinstance(e, Exception) else RuntimeError("request cancelled"))
+            future.exception()  # mark retrieved when nobody joined
+            raise
+        finally:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    async def _renew_claim(self, key: str, owner: str):
+        """Keep pushing the claim's expiry out while the handler is still running"""
+        while True:
+            await asyncio.sleep(self.claim_seconds / 4)
+            try:
+                await self.collection.update_one(
+                    {"_id": key, "owner": owner, "status": IN_PROGRESS},
+                    {"$set": {"expires_at": datetime.now(timezone.utc) + timedelta(seconds=self.claim_seconds)}},
+                )
+            except Exception as e:
+                logger.warning(f"Could not renew idempotency claim {key}: {e}")
+
+    async def _run_and_capture(self, scope, body: bytes, receive, send) -> StoredResponse:
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        status = 500
+        headers = []
+        response_chunks = []
+
+        async def capture_send(message):
+            nonlocal status, headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = [(k, v) for k, v in message.get("headers", []) if k.lower() in REPLAYED_HEADERS]
+            elif message["type"] == "http.response.body":
+                response_chunks.append(message.get("body", b""))
+            await send(message)
+
+        await self.app(scope, replay_receive, capture_send)
+        return status, headers, b"".join(response_chunks)
+
+    async def _finish(self, key: str, owner: str, stored: StoredResponse):
+        status, headers, body = stored
+        if status >= 500 or len(body) > self.max_body_bytes:
+            await self.collection.delete_one({"_id": key, "owner": owner})
+            return
+
+        await self.collection.update_one({"_id": key, "owner": owner}, {"$set": {
+            "status": COMPLETED,
+            "response_status": status,
+            "response_headers": [[k.decode("latin-1"), v.decode("latin-1")] for k, v in headers],
+            "response_body": body,
+            "expires_at": datetime.now(timezone.utc) + timedelta(seconds=self.ttl_seconds),
+        }})
+
+    async def _serve_duplicate(self, key: str, fingerprint: str, send):
+        existing = await self.collection.find_one({"_id": key})
+        if existing and existing["fingerprint"] != fingerprint:
+            await self._send_error(send, 422, "Idempotency-Key was already used with a different request")
+            return
+
+        stored = await self._wait_for(key, existing)
+        if stored is None:
+            await self._send_error(send, 409, "A request with this Idempotency-Key is still in progress")
+            return
+
+        status, headers, body = stored
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": headers + [(b"idempotent-replayed", b"true"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def _wait_for(self, key: str, existing: Optional[dict]) -> Optional[StoredResponse]:
+        future = self._in_flight.get(key)
+        if future is not None:
+            try:
+                return await asyncio.wait_for(asyncio.shield(future), timeout=self.wait_timeout)
+            except Exception:
+                return None
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.wait_timeout
+        while existing is not None and existing["status"] == IN_PROGRESS and loop.time() < deadline:
+            await asyncio.sleep(self.poll_interval)
+            existing = await self.collection.find_one({"_id": key})
+
+        if existing is None or existing["status"] != COMPLETED:
+            return None
+        headers = [(k.encode("latin-1"), v.encode("latin-1")) for k, v in existing["response_headers"]]
+        return existing["response_status"], headers, existing["response_body"]
+
+    async def _send_error(self, send, status: int, detail: str):
+        body = json.dumps({"detail": detail}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
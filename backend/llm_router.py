@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ModelRoute:
+    """Primary model for an endpoint plus the model used for hedges and failover"""
+    primary: Tuple[str, str]
+    hedge: Tuple[str, str]
+
+    @staticmethod
+    def _parse_model(spec: str) -> Tuple[str, str]:
+        provider, _, model = spec.strip().partition(":")
+        if not provider or not model:
+            raise ValueError(f"Invalid LLM model '{spec}': expected 'provider:model', e.g. 'openai:gpt-4o'")
+        return provider, model
+
+    @classmethod
+    def parse(cls, primary: str, hedge: Optional[str] = None) -> "ModelRoute":
+        """Build a route from ``provider:model`` strings, e.g. ``openai:gpt-4o``"""
+        primary_model = cls._parse_model(primary)
+        hedge_model = cls._parse_model(hedge) if hedge else primary_model
+        return cls(primary=primary_model, hedge=hedge_model)
+
+
+class LatencyTracker:
+    """Rolling window of call latencies used to pick the hedge deadline"""
+
+    def __init__(self, window: int = 200):
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def __len__(self):
+        return len(self._samples)
+
+    def percentile(self, p: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(round(p * (len(ordered) - 1))))
+        return ordered[index]
+
+
+class HedgedLlmRouter:
+    """Routes prompts to a per-endpoint model and hedges slow calls.
+
+    If the primary call has not returned by the deadline (a percentile of recent
+    primary latencies for that endpoint, clamped to a min/max) a second request is
+    sent to the route's hedge model and whichever succeeds first wins. A primary that
+    fails before the deadline fails over to the hedge model straight away.
+
+    ``complete(model, prompt)`` performs one LLM call; by default a fresh
+    ``LlmChat`` session is opened for it.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str],
+        system_message: str,
+        routes: Dict[str, ModelRoute],
+        default_route: ModelRoute,
+        hedge_percentile: float = 0.9,
+        initial_deadline: float = 20.0,
+        min_deadline: float = 2.0,
+        max_deadline: float = 60.0,
+        min_samples: int = 20,
+        window: int = 200,
+        complete: Optional[Callable[[Tuple[str, str], str], Awaitable[str]]] = None,
+    ):
+        self.api_key = api_key
+        self.system_message = system_message
+        self.routes = routes
+        self.default_route = default_route
+        self.hedge_percentile = hedge_percentile
+        self.initial_deadline = initial_deadline
+        self.min_deadline = min_deadline
+        self.max_deadline = max_deadline
+        self.min_samples = min_samples
+        self.window = window
+        self.complete = complete or self._llm_chat_complete
+        self._latencies: Dict[Tuple[str, str], LatencyTracker] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    def route_for(self, endpoint: str) -> ModelRoute:
+        return self.routes.get(endpoint, self.default_route)
+
+    def _tracker(self, endpoint: str, model: Tuple[str, str]) -> LatencyTracker:
+        key = (endpoint, ":".join(model))
+        if key not in self._latencies:
+            self._latencies[key] = LatencyTracker(self.window)
+        return self._latencies[key]
+
+    def _count(self, endpoint: str, name: str):
+        counters = self._counters.setdefault(endpoint, {
+            "calls": 0, "primary_wins": 0, "hedged": 0, "hedge_wins": 0, "failovers": 0, "failures": 0,
+        })
+        counters[name] += 1
+
+    def deadline(self, endpoint: str) -> float:
+        tracker = self._tracker(endpoint, self.route_for(endpoint).primary)
+        if len(tracker) < self.min_samples:
+            return self.initial_deadline
+        return min(self.max_deadline, max(self.min_deadline, tracker.percentile(self.hedge_percentile)))
+
+    async def _llm_chat_complete(self, model: Tuple[str, str], prompt: str) -> str:
+        from emergentintegrations.llm.chat import LlmChat, UserMessage
+
+        # A fresh session per call: concurrent hedges must not share conversation state
+        chat = LlmChat(
+            api_key=self.api_key,
+            session_id=f"tutobit-{uuid.uuid4()}",
+            system_message=self.system_message
+        ).with_model(*model)
+        return await chat.send_message(UserMessage(text=prompt))
+
+    async def _call(self, endpoint: str, model: Tuple[str, str], prompt: str) -> str:
+        started = time.monotonic()
+        try:
+            response = await self.complete(model, prompt)
+        except asyncio.CancelledError:
+            # Lost the race: the elapsed time is still a lower bound on its latency
+            self._tracker(endpoint, model).record(time.monotonic() - started)
+            raise
+
+        self._tracker(endpoint, model).record(time.monotonic() - started)
+        return response
+
+    async def send(self, prompt: str, endpoint: str) -> str:
+        route = self.route_for(endpoint)
+        self._count(endpoint, "calls")
+
+        primary = asyncio.create_task(self._call(endpoint, route.primary, prompt))
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.deadline(endpoint))
+            if done and primary.exception() is None:
+                self._count(endpoint, "primary_wins")
+                return primary.result()
+
+            last_error = primary.exception() if done else None
+            if last_error is not None:
+                self._count(endpoint, "failovers")
+                logger.warning(f"LLM primary failed for {endpoint}, failing over: {last_error}")
+                pending = set()
+            else:
+                self._count(endpoint, "hedged")
+                pending = {primary}
+
+            hedge = asyncio.create_task(self._call(endpoint, route.hedge, prompt))
+            tasks.add(hedge)
+            pending.add(hedge)
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self._count(endpoint, "hedge_wins")
+                        else:
+                            self._count(endpoint, "primary_wins")
+                        return task.result()
+                    last_error = task.exception()
+
+            self._count(endpoint, "failures")
+            raise last_error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    def stats(self) -> Dict[str, Dict]:
+        endpoints = set(self._counters) | {endpoint for endpoint, _ in self._latencies}
+        result = {}
+        for endpoint in sorted(endpoints):
+            route = self.route_for(endpoint)
+            latencies = {}
+            for (ep, model), tracker in self._latencies.items():
+                if ep == endpoint and len(tracker):
+                    latencies[model] = {
+                        "samples": len(tracker),
+                        "p50": tracker.percentile(0.5),
+                        "p90": tracker.percentile(0.9),
+                        "p99": tracker.percentile(0.99),
+                    }
+            result[endpoint] = {
+                "primary_model": ":".join(route.primary),
+                "hedge_model": ":".join(route.hedge),
+                "hedge_deadline": self.deadline(endpoint),
+                "counters": self._counters.get(endpoint, {}),
+                "latency": latencies,
+            }
+        return result
@@ -0,0 +1,176 @@
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import deque
+from datetime import datetime, timezone, timedelta
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# Profile fields that change what the LLM would produce. Edits to anything
+# else (name, email, age) do not invalidate speculative results.
+MATERIAL_PROFILE_FIELDS = (
+    "education",
+    "current_role",
+    "experience_years",
+    "skills",
+    "interests",
+    "career_goals",
+    "preferred_industries",
+)
+
+# (kind, target_role, coroutine factory) - one background LLM call each
+PrecomputeJob = Tuple[str, Optional[str], Callable[[], Awaitable[Any]]]
+
+
+def profile_fingerprint(profile: Dict[str, Any]) -> str:
+    """Stable hash of the profile fields that feed the LLM prompts"""
+    material = {field: profile.get(field) for field in MATERIAL_PROFILE_FIELDS}
+    encoded = json.dumps(material, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()
+
+
+class SpendBudget:
+    """Sliding one-hour window capping how many background LLM calls may start"""
+
+    def __init__(self, max_calls_per_hour: int):
+        self.max_calls_per_hour = max_calls_per_hour
+        self._calls: Deque[float] = deque()
+
+    def try_acquire(self) -> bool:
+        now = time.monotonic()
+        while self._calls and now - self._calls[0] > 3600:
+            self._calls.popleft()
+        if len(self._calls) >= self.max_calls_per_hour:
+            return False
+        self._calls.append(now)
+        return True
+
+    @property
+    def used(self) -> int:
+        return len(self._calls)
+
+
+class SpeculativePrecomputer:
+    """Generates LLM results in the background right after a profile is written.
+
+    Results are stored against a fingerprint of the profile so the first explicit
+    request can be served from them. Scheduling again for the same user cancels the
+    in-flight task, and anything computed for an older fingerprint is never served.
+    """
+
+    def __init__(
+        self,
+        collection,
+        build_jobs: Callable[[Dict[str, Any]], Awaitable[List[PrecomputeJob]]],
+        delay_seconds: float = 5.0,
+        max_calls_per_hour: int = 60,
+        max_concurrency: int = 1,
+        ttl_hours: int = 24,
+        enabled: bool = True,
+    ):
+        self.collection = collection
+        self.build_jobs = build_jobs
+        self.delay_seconds = delay_seconds
+        self.ttl_hours = ttl_hours
+        self.enabled = enabled
+        self.budget = SpendBudget(max_calls_per_hour)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.stats = {"scheduled": 0, "cancelled": 0, "computed": 0, "served": 0, "budget_skipped": 0, "failed": 0}
+
+    async def ensure_indexes(self):
+        await self.collection.create_index([("user_id", 1), ("kind", 1), ("target_role", 1)])
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+
+    def schedule(self, user_id: str, profile: Dict[str, Any]) -> None:
+        """Start (or restart) background generation for this profile version"""
+        if not self.enabled:
+            return
+
+        previous = self._tasks.pop(user_id, None)
+        if previous and not previous.done():
+            previous.cancel()
+            self.stats["cancelled"] += 1
+
+        task = asyncio.create_task(self._run(user_id, dict(profile), profile_fingerprint(profile)))
+        self._tasks[user_id] = task
+        task.add_done_callback(lambda t, uid=user_id: self._forget(uid, t))
+        self.stats["scheduled"] += 1
+
+    def _forget(self, user_id: str, task: asyncio.Task):
+        if self._tasks.get(user_id) is task:
+            del self._tasks[user_id]
+
+    async def _run(self, user_id: str, profile: Dict[str, Any], fingerprint: str):
+        # Nobody awaits this task, so anything that escapes would only be logged by the loop
+        try:
+            # Wait out quick successive edits before spending anything
+            await asyncio.sleep(self.delay_seconds)
+            await self._compute(user_id, profile, fingerprint)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.stats["failed"] += 1
+            logger.warning(f"Precompute failed for {user_id}: {e}")
+
+    async def _compute(self, user_id: str, profile: Dict[str, Any], fingerprint: str):
+        await self.collection.delete_many({"user_id": user_id, "profile_fingerprint": {"$ne": fingerprint}})
+
+        for kind, target_role, job in await self.build_jobs(profile):
+            if not self.budget.try_acquire():
+                self.stats["budget_skipped"] += 1
+                logger.info(f"Precompute budget exhausted, skipping {kind} for {user_id}")
+                return
+
+            async with self._semaphore:
+                try:
+                    data = await job()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.stats["failed"] += 1
+                    logger.warning(f"Precompute {kind} failed for {user_id}: {e}")
+                    continue
+
+            now = datetime.now(timezone.utc)
+            await self.collection.replace_one(
+                {"user_id": user_id, "kind": kind, "target_role": target_role},
+                {
+                    "user_id": user_id,
+                    "kind": kind,
+                    "target_role": target_role,
+                    "profile_fingerprint": fingerprint,
+                    "data": data,
+                    "created_at": now.isoformat(),
+                    "expires_at": now + timedelta(hours=self.ttl_hours),
+                },
+                upsert=True,
+            )
+            self.stats["computed"] += 1
+
+    async def take(self, user_id: str, kind: str, profile: Dict[str, Any], target_role: Optional[str] = None) -> Optional[Any]:
+        """Pop a stored result if it was computed for the profile as it is now"""
+        if not self.enabled:
+            return None
+
+        stored = await self.collection.find_one_and_delete({
+            "user_id": user_id,
+            "kind": kind,
+            "target_role": target_role,
+            "profile_fingerprint": profile_fingerprint(profile),
+        })
+        if not stored:
+            return None
+
+        self.stats["served"] += 1
+        return stored["data"]
+
+    async def shutdown(self):
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
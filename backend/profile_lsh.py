@@ -0,0 +1,369 @@
+import asyncio
+import hashlib
+import logging
+import os
+import random
+import sys
+import time
+from collections import deque
+from datetime import datetime, timezone, timedelta
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from analytics import experience_bucket
+from skill_index import SKILLS, canonical_role, normalize_term
+
+
+logger = logging.getLogger(__name__)
+
+# Mersenne prime for the universal hash family (a * x + b) mod p
+_PRIME = (1 << 61) - 1
+
+# Sources of recommendation sets that may be handed to another user. Matched positively:
+# sets stored before sources were recorded (including demo fallbacks) are never reused.
+REUSABLE_SOURCES = ["llm", "llm_batch", "precomputed"]
+
+# match_percentage adjustment: share of the skill coverage difference, and a bonus for a stated goal
+SKILL_COVERAGE_WEIGHT = 50.0
+GOAL_ALIGNMENT_BONUS = 5.0
+
+
+def _hash64(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def profile_features(profile: Dict[str, Any]) -> Set[str]:
+    """Prefixed feature tokens of the profile fields that shape recommendations"""
+    features = {f"exp:{experience_bucket(profile.get('experience_years'))}"}
+    if profile.get("education"):
+        features.add(f"edu:{normalize_term(profile['education'])}")
+    if profile.get("current_role"):
+        features.add(f"role:{(canonical_role(profile['current_role']) or normalize_term(profile['current_role'])).lower()}")
+    for skill in profile.get("skills", []):
+        features.add(f"skill:{(SKILLS.canonical(skill) or normalize_term(skill)).lower()}")
+    for interest in profile.get("interests", []):
+        features.add(f"interest:{normalize_term(interest)}")
+    for goal in profile.get("career_goals", []):
+        features.add(f"goal:{(canonical_role(goal) or normalize_term(goal)).lower()}")
+    for industry in profile.get("preferred_industries", []):
+        features.add(f"industry:{normalize_term(industry)}")
+    features.discard("")
+    return features
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """MinHash signatures over feature sets, split into LSH band keys.
+
+    Two sets agree on one signature slot with probability equal to their Jaccard
+    similarity, so they share at least one of ``num_bands`` bands of
+    ``rows_per_band`` slots with probability ``1 - (1 - s^rows)^bands``. With the
+    default 16 x 4 that is ~100% at s=0.8 and ~64% at s=0.5.
+    """
+
+    def __init__(self, num_bands: int = 16, rows_per_band: int = 4, seed: int = 1):
+        self.num_bands = num_bands
+        self.rows_per_band = rows_per_band
+        rng = random.Random(seed)
+        self._params = [
+            (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME))
+            for _ in range(num_bands * rows_per_band)
+        ]
+
+    def signature(self, features: Set[str]) -> List[int]:
+        hashed = [_hash64(feature) % _PRIME for feature in features]
+        if not hashed:
+            return [_PRIME] * len(self._params)
+        return [min((a * x + b) % _PRIME for x in hashed) for a, b in self._params]
+
+    def bands(self, signature: List[int]) -> List[str]:
+        rows = self.rows_per_band
+        return [
+            f"{band}:{hashlib.blake2b(repr(signature[band * rows:(band + 1) * rows]).encode(), digest_size=8).hexdigest()}"
+            for band in range(self.num_bands)
+        ]
+
+
+class ProfileLshIndex:
+    """Locality-sensitive index of user profiles, stored in MongoDB.
+
+    One document per user holds the profile's feature set and its LSH band keys;
+    a multikey index on ``bands`` turns a neighbour lookup into a single ``$in``
+    query. The ``max_candidates`` profiles sharing the most bands are then ranked
+    by exact Jaccard similarity of their stored features, so band collisions never
+    produce a false match.
+    """
+
+    def __init__(self, collection, hasher: Optional[MinHasher] = None, threshold: float = 0.8, max_candidates: int = 50):
+        self.collection = collection
+        self.hasher = hasher or MinHasher()
+        self.threshold = threshold
+        self.max_candidates = max_candidates
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("bands")
+
+    def _document(self, profile: Dict[str, Any]) -> Dict[str, Any]:
+        features = profile_features(profile)
+        return {
+            "_id": profile["id"],
+            "features": sorted(features),
+            "bands": self.hasher.bands(self.hasher.signature(features)),
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    async def upsert(self, profile: Dict[str, Any]):
+        document = self._document(profile)
+        await self.collection.replace_one({"_id": document["_id"]}, document, upsert=True)
+
+    async def nearest(self, profile: Dict[str, Any]) -> Optional[Tuple[str, float, Set[str]]]:
+        """(user_id, similarity, features) of the most similar other profile at or above the threshold"""
+        document = self._document(profile)
+        features = set(document["features"])
+        # Common profiles collide with many users; keep the candidates sharing the most
+        # bands (the closest MinHash estimates) rather than whichever come back first
+        candidates = self.collection.aggregate([
+            {"$match": {"bands": {"$in": document["bands"]}, "_id": {"$ne": document["_id"]}}},
+            {"$project": {"features": 1, "shared_bands": {"$size": {"$filter": {"input": "$bands", "cond": {"$in": ["$$this", document["bands"]]}}}}}},
+            {"$sort": {"shared_bands": -1, "_id": 1}},
+            {"$limit": self.max_candidates},
+        ])
+
+        best = None
+        async for candidate in candidates:
+            candidate_features = set(candidate["features"])
+            similarity = jaccard(features, candidate_features)
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (candidate["_id"], similarity, candidate_features)
+        return best
+
+    async def rebuild(self, profiles_collection) -> int:
+        """Index every stored profile (for profiles created before the index existed)"""
+        await self.ensure_indexes()
+        count = 0
+        async for profile in profiles_collection.find({}):
+            await self.upsert(profile)
+            count += 1
+        return count
+
+
+def _feature_values(features: Set[str], prefix: str) -> Set[str]:
+    return {feature[len(prefix):] for feature in features if feature.startswith(prefix)}
+
+
+def _title_key(title: str) -> str:
+    return (canonical_role(title) or normalize_term(title)).lower()
+
+
+def adapt_recommendations(recommendations: List[Dict[str, Any]], neighbor_features: Set[str], profile: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Rescore a neighbour's recommendations for this profile.
+
+    The neighbour's match_percentage is shifted by the difference in how much of
+    each role's required skills the two users cover, plus a bonus (or penalty)
+    when only one of them named the role as a goal. Results are reordered by the
+    new score.
+    """
+    features = profile_features(profile)
+    skills = _feature_values(features, "skill:")
+    neighbor_skills = _feature_values(neighbor_features, "skill:")
+    goals = _feature_values(features, "goal:")
+    neighbor_goals = _feature_values(neighbor_features, "goal:")
+
+    adapted = []
+    for rec in recommendations:
+        required, _ = SKILLS.canonicalize_all(rec.get("required_skills", []))
+        required = {skill.lower() for skill in required}
+        coverage = len(required & skills) / len(required) if required else 0.0
+        neighbor_coverage = len(required & neighbor_skills) / len(required) if required else 0.0
+
+        title = _title_key(rec["job_title"])
+        goal_shift = (title in goals) - (title in neighbor_goals)
+
+        match = float(rec["match_percentage"]) + SKILL_COVERAGE_WEIGHT * (coverage - neighbor_coverage) + GOAL_ALIGNMENT_BONUS * goal_shift
+        adapted.append({**rec, "match_percentage": round(min(100.0, max(0.0, match)), 1)})
+
+    adapted.sort(key=lambda rec: rec["match_percentage"], reverse=True)
+    return adapted
+
+
+def compare_recommendations(adapted: List[Dict[str, Any]], generated: List[Dict[str, Any]]) -> Dict[str, Optional[float]]:
+    """How close adapted recommendations came to a fresh generation for the same profile"""
+    adapted_scores = {_title_key(rec["job_title"]): float(rec["match_percentage"]) for rec in adapted}
+    generated_scores = {_title_key(rec["job_title"]): float(rec["match_percentage"]) for rec in generated}
+    shared = adapted_scores.keys() & generated_scores.keys()
+    return {
+        "title_overlap": jaccard(set(adapted_scores), set(generated_scores)),
+        "match_abs_error": sum(abs(adapted_scores[t] - generated_scores[t]) for t in shared) / len(shared) if shared else None,
+    }
+
+
+class SimilarProfileReuse:
+    """Serves a near-duplicate profile's recent recommendations instead of calling the LLM.
+
+    ``find`` looks up the nearest indexed profile; if it is similar enough and has
+    an LLM-generated recommendation set (``REUSABLE_SOURCES``) younger than
+    ``max_age_hours``, that set is adapted to the requesting profile and returned.
+    Sets that were themselves adapted, came from the demo fallback or predate source
+    tracking are never reused, and neither is a set whose text mentions the
+    neighbour by name.
+
+    A ``shadow_rate`` share of hits also runs the real generation in the background
+    and compares it with what was served, so the quality cost of reuse is measured.
+    """
+
+    def __init__(
+        self,
+        index: ProfileLshIndex,
+        recommendations,
+        profiles,
+        max_age_hours: float = 72,
+        shadow_rate: float = 0.0,
+        min_features: int = 4,
+        enabled: bool = True,
+    ):
+        self.index = index
+        self.recommendations = recommendations
+        self.profiles = profiles
+        self.max_age_hours = max_age_hours
+        self.shadow_rate = shadow_rate
+        self.min_features = min_features
+        self.enabled = enabled
+        self.counts = {"lookups": 0, "hits": 0, "no_neighbor": 0, "no_recent_recommendations": 0, "mentions_neighbor": 0}
+        self._latencies_ms: Deque[float] = deque(maxlen=500)
+        self._shadow = {"runs": 0, "failed": 0, "title_overlap_sum": 0.0, "match_abs_error_sum": 0.0, "match_abs_error_runs": 0}
+        self._shadow_tasks: Set[asyncio.Task] = set()
+
+    async def ensure_indexes(self):
+        await self.index.ensure_indexes()
+        await self.recommendations.create_index([("user_id", 1), ("created_at", -1)])
+
+    async def _recent_recommendations(self, user_id: str) -> List[Dict[str, Any]]:
+        cutoff = (datetime.now(timezone.utc) - timedelta(hours=self.max_age_hours)).isoformat()
+        query = {"user_id": user_id, "created_at": {"$gte": cutoff}, "source": {"$in": REUSABLE_SOURCES}}
+        latest = await self.recommendations.find_one(query, sort=[("created_at", -1)])
+        if not latest:
+            return []
+        if not latest.get("batch_id"):
+            return [latest]
+        return await self.recommendations.find({**query, "batch_id": latest["batch_id"]}).to_list(100)
+
+    async def _mentions_name(self, user_id: str, recommendations: List[Dict[str, Any]]) -> bool:
+        profile = await self.profiles.find_one({"id": user_id}, {"name": 1})
+        names = [part for part in normalize_term((profile or {}).get("name", "")).split() if len(part) >= 3]
+        if not names:
+            return False
+        text = normalize_term(" ".join(" ".join([rec.get("description", ""), *rec.get("reasons", [])]) for rec in recommendations))
+        words = set(text.split())
+        return any(name in words for name in names)
+
+    async def _lookup(self, profile: Dict[str, Any]) -> Tuple[str, Optional[Tuple[List[Dict[str, Any]], Dict[str, Any]]]]:
+        """(outcome, hit) where outcome is "hits" or the name of the miss reason counter"""
+        neighbor = await self.index.nearest(profile)
+        if neighbor is None:
+            return "no_neighbor", None
+
+        neighbor_id, similarity, neighbor_features = neighbor
+        recommendations = await self._recent_recommendations(neighbor_id)
+        if not recommendations:
+            return "no_recent_recommendations", None
+        if await self._mentions_name(neighbor_id, recommendations):
+            return "mentions_neighbor", None
+
+        adapted = adapt_recommendations(recommendations, neighbor_features, profile)
+        return "hits", (adapted, {"adapted_from": neighbor_id, "similarity": round(similarity, 4)})
+
+    def _eligible(self, profile: Dict[str, Any]) -> bool:
+        return self.enabled and len(profile_features(profile)) >= self.min_features
+
+    async def find(self, profile: Dict[str, Any]) -> Optional[Tuple[List[Dict[str, Any]], Dict[str, Any]]]:
+        """(adapted recommendation data, provenance) or None when the LLM has to be called"""
+        if not self._eligible(profile):
+            return None
+
+        started = time.perf_counter()
+        self.counts["lookups"] += 1
+        outcome, hit = await self._lookup(profile)
+        self.counts[outcome] += 1
+        if hit is not None:
+            self._latencies_ms.append((time.perf_counter() - started) * 1000)
+        return hit
+
+    async def available(self, profile: Dict[str, Any]) -> bool:
+        """Whether ``find`` would currently serve this profile, without counting a lookup"""
+        if not self._eligible(profile):
+            return False
+        _, hit = await self._lookup(profile)
+        return hit is not None
+
+    def maybe_shadow(self, adapted: List[Dict[str, Any]], generate: Callable[[], Awaitable[List[Dict[str, Any]]]]):
+        """Start a background generation to compare against a served hit, for a sample of hits"""
+        if self.shadow_rate <= 0 or random.random() >= self.shadow_rate:
+            return
+        task = asyncio.create_task(self._run_shadow(adapted, generate))
+        self._shadow_tasks.add(task)
+        task.add_done_callback(self._shadow_tasks.discard)
+
+    async def _run_shadow(self, adapted: List[Dict[str, Any]], generate: Callable[[], Awaitable[List[Dict[str, Any]]]]):
+        try:
+            generated = await generate()
+            comparison = compare_recommendations(adapted, generated)
+        except Exception as e:
+            self._shadow["failed"] += 1
+            logger.warning(f"Shadow generation for similar-profile reuse failed: {e}")
+            return
+
+        self._shadow["runs"] += 1
+        self._shadow["title_overlap_sum"] += comparison["title_overlap"]
+        if comparison["match_abs_error"] is not None:
+            self._shadow["match_abs_error_sum"] += comparison["match_abs_error"]
+            self._shadow["match_abs_error_runs"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies_ms)
+        shadow = self._shadow
+        return {
+            **self.counts,
+            "hit_rate": round(self.counts["hits"] / self.counts["lookups"], 4) if self.counts["lookups"] else None,
+            "adaptation_ms_avg": round(sum(latencies) / len(latencies), 2) if latencies else None,
+            "adaptation_ms_p95": round(latencies[int(0.95 * (len(latencies) - 1))], 2) if latencies else None,
+            "shadow": {
+                "runs": shadow["runs"],
+                "failed": shadow["failed"],
+                "mean_title_overlap": round(shadow["title_overlap_sum"] / shadow["runs"], 4) if shadow["runs"] else None,
+                "mean_match_abs_error": round(shadow["match_abs_error_sum"] / shadow["match_abs_error_runs"], 2) if shadow["match_abs_error_runs"] else None,
+            },
+        }
+
+    async def shutdown(self):
+        for task in list(self._shadow_tasks):
+            task.cancel()
+        await asyncio.gather(*self._shadow_tasks, return_exceptions=True)
+
+
+if __name__ == "__main__":
+    # Index existing profiles: python profile_lsh.py rebuild
+    from pathlib import Path
+
+    from dotenv import load_dotenv
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    if sys.argv[1:] != ["rebuild"]:
+        print("usage: python profile_lsh.py rebuild")
+        sys.exit(1)
+
+    load_dotenv(Path(__file__).parent / '.env')
+    logging.basicConfig(level=logging.INFO)
+
+    async def main():
+        client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+        db = client[os.environ['DB_NAME']]
+        hasher = MinHasher(int(os.environ.get('PROFILE_LSH_BANDS', '16')), int(os.environ.get('PROFILE_LSH_ROWS', '4')))
+        count = await ProfileLshIndex(db.profile_signatures, hasher).rebuild(db.user_profiles)
+        print(f"Indexed {count} profiles")
+        client.close()
+
+    asyncio.run(main())
@@ -0,0 +1,183 @@
+import asyncio
+import hmac
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+
+
+logger = logging.getLogger(__name__)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+class StackSampler:
+    """Samples one thread's Python stack on a timer and aggregates folded stacks.
+
+    The output is the "folded" format understood by flamegraph.pl, speedscope and
+    inferno: one ``root;...;leaf count`` line per distinct stack.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(labels))] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._sample, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        return self.stacks
+
+    def write_folded(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class RequestProfilingMiddleware:
+    """Opt-in sampling profiler for individual requests.
+
+    A request is profiled when it carries ``X-Profile: <token>`` matching the
+    configured token, or when it falls into the random ``sample_rate``. The event
+    loop thread is sampled for the lifetime of the request and a ``.folded`` dump is
+    written to ``output_dir``; its file name is returned in ``X-Profile-File``.
+    Because all requests share the loop thread, samples from concurrent requests
+    show up too - profile on a quiet worker when that matters. Only one request per
+    worker is profiled at a time.
+    """
+
+    def __init__(self, app, output_dir: Path, token: Optional[str] = None, sample_rate: float = 0.0, interval: float = 0.005):
+        self.app = app
+        self.output_dir = Path(output_dir)
+        self.token = token
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self._active = False
+
+    def _wanted(self, scope) -> bool:
+        if self._active:
+            return False
+        header = Headers(scope=scope).get("x-profile")
+        # Constant-time comparison: the token gates disk writes
+        if self.token and header is not None and hmac.compare_digest(header.encode(), self.token.encode()):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", scope["path"]).strip("_")[:80]
+        file_name = f"{stamp}-{scope['method']}-{slug}.folded"
+
+        async def send_with_profile_header(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Profile-File"] = file_name
+            await send(message)
+
+        self._active = True
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_header)
+        finally:
+            sampler.stop()
+            self._active = False
+            elapsed = time.perf_counter() - started
+            await asyncio.to_thread(sampler.write_folded, self.output_dir / file_name)
+            logger.info(f"Profiled {scope['method']} {scope['path']} in {elapsed * 1000:.0f}ms -> {file_name}")
+
+
+class EventLoopLagMonitor:
+    """Logs the loop thread's stack whenever the event loop is blocked too long.
+
+    A coroutine on the loop records a heartbeat every ``interval`` seconds; a watcher
+    thread notices when the heartbeat goes stale by more than ``threshold`` seconds
+    and logs what the loop thread is executing at that moment - typically sync work
+    such as large prompt formatting or model validation.
+    """
+
+    def __init__(self, threshold: float = 0.1, interval: float = 0.02):
+        self.threshold = threshold
+        self.interval = interval
+        self.stats: Dict[str, Any] = {"stalls": 0, "max_lag_ms": 0.0, "last_stall_at": None}
+        self._last_tick = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._stop = threading.Event()
+        self._ticker: Optional[asyncio.Task] = None
+        self._watcher: Optional[threading.Thread] = None
+
+    async def _tick(self):
+        while True:
+            before = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = now - before - self.interval
+            if lag * 1000 > self.stats["max_lag_ms"]:
+                self.stats["max_lag_ms"] = lag * 1000
+            self._last_tick = now
+
+    def _watch(self):
+        reported = False
+        while not self._stop.wait(self.interval):
+            blocked_for = time.monotonic() - self._last_tick
+            if blocked_for < self.threshold + self.interval:
+                reported = False
+                continue
+            if reported:
+                continue
+            # Report each stall once, with the stack that is holding the loop
+            reported = True
+            self.stats["stalls"] += 1
+            self.stats["last_stall_at"] = datetime.now(timezone.utc).isoformat()
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else "<no frame>"
+            logger.warning(f"Event loop blocked for over {blocked_for * 1000:.0f}ms:\n{stack}")
+
+    def start(self):
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._ticker = asyncio.create_task(self._tick())
+        self._watcher = threading.Thread(target=self._watch, name="event-loop-lag-monitor", daemon=True)
+        self._watcher.start()
+
+    async def stop(self):
+        self._stop.set()
+        if self._ticker:
+            self._ticker.cancel()
+            await asyncio.gather(self._ticker, return_exceptions=True)
@@ -1,16 +1,36 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Query, Request, WebSocket
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
+import csv
+import io
 import logging
+import zlib
 from pathlib import Path
 from pydantic import BaseModel, Field
 from typing import List, Optional, Dict, Any
 import uuid
+import asyncio
 from datetime import datetime, timezone
-from emergentintegrations.llm.chat import LlmChat, UserMessage
 import json
+import re
+
+from chat_ws import ChatSocketSession
+from analytics import SkillGapRollups, experience_bucket
+from batch_generation import AdaptiveBatchSizer, BatchRecommendationGenerator
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+from db_routing import ReadRouter, parse_read_preferences, pool_options
+from http_caching import CompressionMiddleware, conditional_json, latest_timestamp
+from idempotency import IdempotencyMiddleware, ensure_indexes as ensure_idempotency_indexes
+from llm_router import HedgedLlmRouter, ModelRoute
+from precompute import SpeculativePrecomputer, profile_fingerprint
+from profile_lsh import MinHasher, ProfileLshIndex, SimilarProfileReuse
+from profiling import EventLoopLagMonitor, RequestProfilingMiddleware
+from pymongo import UpdateOne
+from skill_index import SKILLS, canonical_role, role_in_goal
 
 
 ROOT_DIR = Path(__file__).parent
@@ -18,452 +38,1014 @@ load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(mongo_url, **pool_options(
+    os.environ.get('MONGO_MAX_POOL_SIZE'),
+    os.environ.get('MONGO_MIN_POOL_SIZE'),
+    os.environ.get('MONGO_MAX_IDLE_TIME_MS'),
+))
 db = client[os.environ['DB_NAME']]
 
+# Per-endpoint read preferences for replica sets; a user's own writes pin their reads to the primary
+reads = ReadRouter(
+    db,
+    parse_read_preferences(os.environ.get(
+        'MONGO_READ_PREFERENCES',
+        'get_profile=secondaryPreferred,get_chat_history=secondaryPreferred,get_learning_resources=secondaryPreferred,'
+        'get_dashboard=secondaryPreferred,export_chat_history=secondaryPreferred'
+    )),
+    max_staleness_seconds=int(os.environ.get('MONGO_MAX_STALENESS_SECONDS', '90')),
+    stickiness_seconds=float(os.environ['MONGO_READ_YOUR_WRITES_SECONDS']) if os.environ.get('MONGO_READ_YOUR_WRITES_SECONDS') else None,
+)
+
 # Create the main app without a prefix
 app = FastAPI(title="TutoBit AI API", version="1.0.0")
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
-# LLM Chat instance
-llm_chat = LlmChat(
+# LLM routing: per-endpoint models ("provider:model"), hedged against slow responses
+CHAT_SHORT_MESSAGE_CHARS = int(os.environ.get('CHAT_SHORT_MESSAGE_CHARS', '200'))
+llm_router = HedgedLlmRouter(
     api_key=os.environ.get('EMERGENT_LLM_KEY'),
-        session_id="tutobit-main",
-            system_message="""You are TutoBit AI, an expert career guidance counselor and mentor. You provide personalized career advice, skill gap analysis, and learning recommendations. Always be encouraging, professional, and provide actionable insights. Focus on practical advice that helps users advance their careers."""
-            ).with_model("openai", "gpt-4o")
-
-            # Define Models
-            class UserProfile(BaseModel):
-                id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-                    name: str
-                        email: str
-                            age: Optional[int] = None
-                                education: str
-                                    current_role: Optional[str] = None
-                                        experience_years: Optional[int] = 0
-                                            skills: List[str] = []
-                                                interests: List[str] = []
-                                                    career_goals: List[str] = []
-                                                        preferred_industries: List[str] = []
-                                                            created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-                                                                updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-
-                                                                class UserProfileCreate(BaseModel):
-                                                                    name: str
-                                                                        email: str
-                                                                            age: Optional[int] = None
-                                                                                education: str
-                                                                                    current_role: Optional[str] = None
-                                                                                        experience_years: Optional[int] = 0
-                                                                                            skills: List[str] = []
-                                                                                                interests: List[str] = []
-                                                                                                    career_goals: List[str] = []
-                                                                                                        preferred_industries: List[str] = []
-
-                                                                                                        class CareerRecommendation(BaseModel):
-                                                                                                            id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-                                                                                                                user_id: str
-                                                                                                                    job_title: str
-                                                                                                                        description: str
-                                                                                                                            required_skills: List[str]
-                                                                                                                                salary_range: str
-                                                                                                                                    growth_potential: str
-                                                                                                                                        match_percentage: float
-                                                                                                                                            reasons: List[str]
-                                                                                                                                                learning_resources: List[Dict[str, str]]
-                                                                                                                                                    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-
-                                                                                                                                                    class SkillGapAnalysis(BaseModel):
-                                                                                                                                                        id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-                                                                                                                                                            user_id: str
-                                                                                                                                                                target_role: str
-                                                                                                                                                                    current_skills: List[str]
-                                                                                                                                                                        required_skills: List[str]
-                                                                                                                                                                            missing_skills: List[str]
-                                                                                                                                                                                skill_gaps: List[Dict[str, Any]]
-                                                                                                                                                                                    learning_recommendations: List[Dict[str, str]]
-                                                                                                                                                                                        estimated_time_to_bridge: str
-                                                                                                                                                                                            priority_skills: List[str]
-                                                                                                                                                                                                created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-
-                                                                                                                                                                                                class ChatMessage(BaseModel):
-                                                                                                                                                                                                    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-                                                                                                                                                                                                        user_id: str
-                                                                                                                                                                                                            message: str
-                                                                                                                                                                                                                response: str
-                                                                                                                                                                                                                    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-
-                                                                                                                                                                                                                    class ChatRequest(BaseModel):
-                                                                                                                                                                                                                        user_id: str
-                                                                                                                                                                                                                            message: str
-
-                                                                                                                                                                                                                            # Routes
-                                                                                                                                                                                                                            @api_router.get("/")
-                                                                                                                                                                                                                            async def root():
-                                                                                                                                                                                                                                return {"message": "TutoBit AI API is running!"}
-
-                                                                                                                                                                                                                                @api_router.post("/profile", response_model=UserProfile)
-                                                                                                                                                                                                                                async def create_profile(profile_data: UserProfileCreate):
-                                                                                                                                                                                                                                    profile_dict = profile_data.dict()
-                                                                                                                                                                                                                                        profile_obj = UserProfile(**profile_dict)
-                                                                                                                                                                                                                                            
-                                                                                                                                                                                                                                                # Prepare for MongoDB
-                                                                                                                                                                                                                                                    profile_for_db = profile_obj.dict()
-                                                                                                                                                                                                                                                        profile_for_db['created_at'] = profile_for_db['created_at'].isoformat()
-                                                                                                                                                                                                                                                            profile_for_db['updated_at'] = profile_for_db['updated_at'].isoformat()
-                                                                                                                                                                                                                                                                
-                                                                                                                                                                                                                                                                    await db.user_profiles.insert_one(profile_for_db)
-                                                                                                                                                                                                                                                                        return profile_obj
-
-                                                                                                                                                                                                                                                                        @api_router.get("/profile/{user_id}", response_model=UserProfile)
-                                                                                                                                                                                                                                                                        async def get_profile(user_id: str):
-                                                                                                                                                                                                                                                                            profile = await db.user_profiles.find_one({"id": user_id})
-                                                                                                                                                                                                                                                                                if not profile:
-                                                                                                                                                                                                                                                                                        raise HTTPException(status_code=404, detail="Profile not found")
-                                                                                                                                                                                                                                                                                            
-                                                                                                                                                                                                                                                                                                # Parse dates
-                                                                                                                                                                                                                                                                                                    if isinstance(profile.get('created_at'), str):
-                                                                                                                                                                                                                                                                                                            profile['created_at'] = datetime.fromisoformat(profile['created_at'])
-                                                                                                                                                                                                                                                                                                                if isinstance(profile.get('updated_at'), str):
-                                                                                                                                                                                                                                                                                                                        profile['updated_at'] = datetime.fromisoformat(profile['updated_at'])
-                                                                                                                                                                                                                                                                                                                            
-                                                                                                                                                                                                                                                                                                                                return UserProfile(**profile)
-
-                                                                                                                                                                                                                                                                                                                                @api_router.put("/profile/{user_id}", response_model=UserProfile)
-                                                                                                                                                                                                                                                                                                                                async def update_profile(user_id: str, profile_data: UserProfileCreate):
-                                                                                                                                                                                                                                                                                                                                    existing_profile = await db.user_profiles.find_one({"id": user_id})
-                                                                                                                                                                                                                                                                                                                                        if not existing_profile:
-                                                                                                                                                                                                                                                                                                                                                raise HTTPException(status_code=404, detail="Profile not found")
-                                                                                                                                                                                                                                                                                                                                                    
-                                                                                                                                                                                                                                                                                                                                                        profile_dict = profile_data.dict()
-                                                                                                                                                                                                                                                                                                                                                            profile_dict['id'] = user_id
-                                                                                                                                                                                                                                                                                                                                                                profile_dict['created_at'] = existing_profile['created_at']
-                                                                                                                                                                                                                                                                                                                                                                    profile_dict['updated_at'] = datetime.now(timezone.utc).isoformat()
-                                                                                                                                                                                                                                                                                                                                                                        
-                                                                                                                                                                                                                                                                                                                                                                            await db.user_profiles.replace_one({"id": user_id}, profile_dict)
-                                                                                                                                                                                                                                                                                                                                                                                
-                                                                                                                                                                                                                                                                                                                                                                                    # Parse date for response
-                                                                                                                                                                                                                                                                                                                                                                                        if isinstance(profile_dict.get('created_at'), str):
-                                                                                                                                                                                                                                                                                                                                                                                                profile_dict['created_at'] = datetime.fromisoformat(profile_dict['created_at'])
-                                                                                                                                                                                                                                                                                                                                                                                                    profile_dict['updated_at'] = datetime.fromisoformat(profile_dict['updated_at'])
-                                                                                                                                                                                                                                                                                                                                                                                                        
-                                                                                                                                                                                                                                                                                                                                                                                                            return UserProfile(**profile_dict)
-
-                                                                                                                                                                                                                                                                                                                                                                                                            @api_router.post("/recommendations/{user_id}", response_model=List[CareerRecommendation])
-                                                                                                                                                                                                                                                                                                                                                                                                            async def generate_career_recommendations(user_id: str):
-                                                                                                                                                                                                                                                                                                                                                                                                                profile = await db.user_profiles.find_one({"id": user_id})
-                                                                                                                                                                                                                                                                                                                                                                                                                    if not profile:
-                                                                                                                                                                                                                                                                                                                                                                                                                            raise HTTPException(status_code=404, detail="Profile not found")
-                                                                                                                                                                                                                                                                                                                                                                                                                                
-                                                                                                                                                                                                                                                                                                                                                                                                                                    # Generate AI-powered recommendations
-                                                                                                                                                                                                                                                                                                                                                                                                                                        prompt = f"""
-                                                                                                                                                                                                                                                                                                                                                                                                                                            Based on this user profile, generate 5 personalized career recommendations:
-                                                                                                                                                                                                                                                                                                                                                                                                                                                
-                                                                                                                                                                                                                                                                                                                                                                                                                                                    Name: {profile.get('name')}
-                                                                                                                                                                                                                                                                                                                                                                                                                                                        Education: {profile.get('education')}
-                                                                                                                                                                                                                                                                                                                                                                                                                                                            Current Role: {profile.get('current_role', 'Not specified')}
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                Experience: {profile.get('experience_years', 0)} years
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                    Skills: {', '.join(profile.get('skills', []))}
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                        Interests: {', '.join(profile.get('interests', []))}
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                            Career Goals: {', '.join(profile.get('career_goals', []))}
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                Preferred Industries: {', '.join(profile.get('preferred_industries', []))}
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        For each recommendation, provide:
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            1. Job title
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                2. Brief description (2-3 sentences)
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    3. Required skills (list of 5-8 skills)
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        4. Salary range (realistic based on location and experience)
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            5. Growth potential (High/Medium/Low with brief explanation)
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                6. Match percentage (0-100%)
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    7. 3-4 specific reasons why this role fits
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        8. 3-4 learning resources (with titles and types like "Course", "Certification", "Book")
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                Format as JSON array with these exact field names: job_title, description, required_skills, salary_range, growth_potential, match_percentage, reasons, learning_resources.
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    """
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            try:
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    user_message = UserMessage(text=prompt)
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            response = await llm_chat.send_message(user_message)
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            # Parse AI response
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    recommendations_data = json.loads(response)
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            recommendations = []
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            for rec_data in recommendations_data:
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        recommendation = CareerRecommendation(
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        user_id=user_id,
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        job_title=rec_data['job_title'],
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        description=rec_data['description'],
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        required_skills=rec_data['required_skills'],
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        salary_range=rec_data['salary_range'],
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        growth_potential=rec_data['growth_potential'],
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        match_percentage=rec_data['match_percentage'],
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        reasons=rec_data['reasons'],
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        learning_resources=rec_data['learning_resources']
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    )
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            # Store in database
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        rec_for_db = recommendation.dict()
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    rec_for_db['created_at'] = rec_for_db['created_at'].isoformat()
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                await db.career_recommendations.insert_one(rec_for_db)
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        recommendations.append(recommendation)
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        return recommendations
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    except Exception as e:
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            # Fallback with demo data if AI fails
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    demo_recommendations = [
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                {
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                "job_title": "Data Scientist",
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                "description": "Analyze complex data sets to help organizations make informed business decisions.",
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                "required_skills": ["Python", "Machine Learning", "SQL", "Statistics", "Data Visualization"],
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                "salary_range": "$80,000 - $130,000",
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                "growth_potential": "High - Data science is rapidly growing with excellent career prospects",
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                "match_percentage": 85.0,
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                "reasons": [
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    "Strong analytical background aligns with data science requirements",
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        "Technical skills complement machine learning needs",
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            "Growing demand in preferred industries"
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            ],
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            "learning_resources": [
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                {"title": "Python for Data Science", "type": "Course"},
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    {"title": "Machine Learning Specialization", "type": "Certification"},
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        {"title": "Hands-On Machine Learning", "type": "Book"}
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        ]
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    }
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            ]
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            recommendations = []
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    for rec_data in demo_recommendations:
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                recommendation = CareerRecommendation(
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                user_id=user_id,
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                **rec_data
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            )
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    # Store in database
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                rec_for_db = recommendation.dict()
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            rec_for_db['created_at'] = rec_for_db['created_at'].isoformat()
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        await db.career_recommendations.insert_one(rec_for_db)
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                recommendations.append(recommendation)
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                return recommendations
-
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                @api_router.post("/skill-gap-analysis/{user_id}", response_model=SkillGapAnalysis)
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                async def analyze_skill_gap(user_id: str, target_role: str):
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    profile = await db.user_profiles.find_one({"id": user_id})
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        if not profile:
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                raise HTTPException(status_code=404, detail="Profile not found")
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        current_skills = profile.get('skills', [])
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                # Generate AI-powered skill gap analysis
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    prompt = f"""
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        Analyze the skill gap for this career transition:
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                Current Skills: {', '.join(current_skills)}
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    Target Role: {target_role}
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        Experience Level: {profile.get('experience_years', 0)} years
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            Education: {profile.get('education')}
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    Provide a comprehensive skill gap analysis with:
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        1. Required skills for the target role (list of 8-12 skills)
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            2. Missing skills the user needs to develop
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                3. Detailed skill gaps with priority levels (High/Medium/Low), descriptions, and estimated learning time
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    4. 5-6 specific learning recommendations with titles, types, and URLs/providers
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        5. Estimated total time to bridge the gap
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            6. Top 5 priority skills to focus on first
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    Format as JSON with these exact fields: required_skills, missing_skills, skill_gaps (array with skill, priority, description, learning_time), learning_recommendations (array with title, type, provider), estimated_time_to_bridge, priority_skills.
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        """
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                try:
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        user_message = UserMessage(text=prompt)
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                response = await llm_chat.send_message(user_message)
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                # Parse AI response
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        analysis_data = json.loads(response)
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        skill_gap_analysis = SkillGapAnalysis(
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    user_id=user_id,
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                target_role=target_role,
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            current_skills=current_skills,
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        required_skills=analysis_data['required_skills'],
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    missing_skills=analysis_data['missing_skills'],
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                skill_gaps=analysis_data['skill_gaps'],
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            learning_recommendations=analysis_data['learning_recommendations'],
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        estimated_time_to_bridge=analysis_data['estimated_time_to_bridge'],
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    priority_skills=analysis_data['priority_skills']
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            )
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            # Store in database
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    analysis_for_db = skill_gap_analysis.dict()
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            analysis_for_db['created_at'] = analysis_for_db['created_at'].isoformat()
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    await db.skill_gap_analyses.insert_one(analysis_for_db)
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    return skill_gap_analysis
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                except Exception as e:
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        # Fallback with demo data
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                demo_analysis = {
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            "required_skills": ["Python", "Machine Learning", "SQL", "Statistics", "Data Visualization", "Deep Learning"],
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        "missing_skills": ["Machine Learning", "Deep Learning", "Advanced Statistics"],
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    "skill_gaps": [
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    {"skill": "Machine Learning", "priority": "High", "description": "Core requirement for data science roles", "learning_time": "3-4 months"},
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    {"skill": "Deep Learning", "priority": "Medium", "description": "Advanced AI techniques", "learning_time": "2-3 months"}
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                ],
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            "learning_recommendations": [
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            {"title": "Machine Learning Course", "type": "Course", "provider": "Coursera"},
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            {"title": "Python Data Science Handbook", "type": "Book", "provider": "O'Reilly"}
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        ],
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    "estimated_time_to_bridge": "6-8 months with consistent learning",
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                "priority_skills": ["Python", "Machine Learning", "SQL", "Statistics", "Data Visualization"]
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        }
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        skill_gap_analysis = SkillGapAnalysis(
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    user_id=user_id,
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                target_role=target_role,
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            current_skills=current_skills,
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        **demo_analysis
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                )
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                # Store in database
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        analysis_for_db = skill_gap_analysis.dict()
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                analysis_for_db['created_at'] = analysis_for_db['created_at'].isoformat()
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        await db.skill_gap_analyses.insert_one(analysis_for_db)
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        return skill_gap_analysis
-
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        @api_router.post("/chat", response_model=ChatMessage)
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        async def chat_with_mentor(chat_request: ChatRequest):
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            try:
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    # Get user profile for context
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            profile = await db.user_profiles.find_one({"id": chat_request.user_id})
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            context = ""
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    if profile:
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                context = f"""
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            User Context:
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        Name: {profile.get('name')}
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    Role: {profile.get('current_role', 'Not specified')}
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                Experience: {profile.get('experience_years', 0)} years
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            Skills: {', '.join(profile.get('skills', []))}
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        Career Goals: {', '.join(profile.get('career_goals', []))}
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    """
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    enhanced_prompt = f"{context}\n\nUser Question: {chat_request.message}\n\nProvide personalized career guidance based on the user's background."
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    user_message = UserMessage(text=enhanced_prompt)
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            response = await llm_chat.send_message(user_message)
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            chat_message = ChatMessage(
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        user_id=chat_request.user_id,
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    message=chat_request.message,
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                response=response
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        )
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        # Store in database
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                chat_for_db = chat_message.dict()
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        chat_for_db['timestamp'] = chat_for_db['timestamp'].isoformat()
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                await db.chat_messages.insert_one(chat_for_db)
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                return chat_message
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            except Exception as e:
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    # Fallback response
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            fallback_response = "I'm here to help with your career guidance! Could you please rephrase your question or try asking about career recommendations, skill development, or learning paths?"
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            chat_message = ChatMessage(
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        user_id=chat_request.user_id,
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    message=chat_request.message,
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                response=fallback_response
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        )
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        # Store in database
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                chat_for_db = chat_message.dict()
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        chat_for_db['timestamp'] = chat_for_db['timestamp'].isoformat()
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                await db.chat_messages.insert_one(chat_for_db)
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                return chat_message
-
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                @api_router.get("/chat/{user_id}", response_model=List[ChatMessage])
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                async def get_chat_history(user_id: str):
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    messages = await db.chat_messages.find({"user_id": user_id}).sort("timestamp", -1).limit(50).to_list(50)
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            # Parse timestamps
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                for message in messages:
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        if isinstance(message.get('timestamp'), str):
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    message['timestamp'] = datetime.fromisoformat(message['timestamp'])
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            return [ChatMessage(**message) for message in messages]
-
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            @api_router.get("/learning-resources/{user_id}")
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            async def get_learning_resources(user_id: str):
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                """Get personalized learning resources based on user profile and skill gaps"""
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    profile = await db.user_profiles.find_one({"id": user_id})
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        if not profile:
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                return []
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        # Demo learning resources - in production, these would come from real APIs
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            resources = [
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    {
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                "id": str(uuid.uuid4()),
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            "title": "Complete Python Bootcamp",
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        "provider": "Udemy",
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    "type": "Course",
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                "duration": "22 hours",
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            "rating": 4.8,
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        "price": "Free",
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    "url": "https://www.udemy.com/course/complete-python-bootcamp/",
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                "description": "Learn Python like a Professional Start from the basics and go all the way to creating your own applications"
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        },
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                {
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            "id": str(uuid.uuid4()),
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        "title": "Google Data Analytics Certificate",
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    "provider": "Coursera",
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                "type": "Certification",
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            "duration": "6 months",
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        "rating": 4.7,
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    "price": "Free",
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                "url": "https://www.coursera.org/professional-certificates/google-data-analytics",
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            "description": "Prepare for a career in data analytics with this professional certificate from Google"
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    },
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            {
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        "id": str(uuid.uuid4()),
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    "title": "Machine Learning A-Z",
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                "provider": "Udemy",
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            "type": "Course",
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        "duration": "44 hours",
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    "rating": 4.5,
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                "price": "Free",
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            "url": "https://www.udemy.com/course/machinelearning/",
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        "description": "Learn to create Machine Learning Algorithms in Python and R from two Data Science experts"
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                }
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    ]
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            return resources
-
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            # Include the router in the main app
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            app.include_router(api_router)
-
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            app.add_middleware(
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                CORSMiddleware,
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    allow_credentials=True,
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            allow_methods=["*"],
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                allow_headers=["*"],
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                )
-
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                # Configure logging
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                logging.basicConfig(
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                    level=logging.INFO,
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        )
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        logger = logging.getLogger(__name__)
-
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        @app.on_event("shutdown")
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                        async def shutdown_db_client():
-                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                            client.close()
\ No newline at end of file
+    system_message="""You are TutoBit AI, an expert career guidance counselor and mentor. You provide personalized career advice, skill gap analysis, and learning recommendations. Always be encouraging, professional, and provide actionable insights. Focus on practical advice that helps users advance their careers.""",
+    routes={
+        "recommendations": ModelRoute.parse(
+            os.environ.get('LLM_MODEL_RECOMMENDATIONS', 'openai:gpt-4o'),
+            os.environ.get('LLM_HEDGE_MODEL_RECOMMENDATIONS', 'openai:gpt-4o')
+        ),
+        "recommendations_batch": ModelRoute.parse(
+            os.environ.get('LLM_MODEL_RECOMMENDATIONS_BATCH', 'openai:gpt-4o'),
+            os.environ.get('LLM_HEDGE_MODEL_RECOMMENDATIONS_BATCH', 'openai:gpt-4o')
+        ),
+        "skill_gap": ModelRoute.parse(
+            os.environ.get('LLM_MODEL_SKILL_GAP', 'openai:gpt-4o'),
+            os.environ.get('LLM_HEDGE_MODEL_SKILL_GAP', 'openai:gpt-4o')
+        ),
+        "chat": ModelRoute.parse(
+            os.environ.get('LLM_MODEL_CHAT', 'openai:gpt-4o'),
+            os.environ.get('LLM_HEDGE_MODEL_CHAT', 'openai:gpt-4o-mini')
+        ),
+        "chat_short": ModelRoute.parse(
+            os.environ.get('LLM_MODEL_CHAT_SHORT', 'openai:gpt-4o-mini'),
+            os.environ.get('LLM_HEDGE_MODEL_CHAT_SHORT', 'openai:gpt-4o-mini')
+        ),
+    },
+    default_route=ModelRoute.parse(os.environ.get('LLM_MODEL_DEFAULT', 'openai:gpt-4o')),
+    hedge_percentile=float(os.environ.get('LLM_HEDGE_PERCENTILE', '0.9')),
+    initial_deadline=float(os.environ.get('LLM_HEDGE_INITIAL_DEADLINE', '20')),
+    min_deadline=float(os.environ.get('LLM_HEDGE_MIN_DEADLINE', '2')),
+    max_deadline=float(os.environ.get('LLM_HEDGE_MAX_DEADLINE', '60')),
+)
+
+# Circuit breaker in front of the LLM provider: while open, endpoints go straight to their fallbacks
+llm_breaker = CircuitBreaker(
+    "llm",
+    failure_rate_threshold=float(os.environ.get('LLM_BREAKER_FAILURE_RATE', '0.5')),
+    slow_call_seconds=float(os.environ.get('LLM_BREAKER_SLOW_CALL_SECONDS', '45')),
+    slow_call_rate_threshold=float(os.environ.get('LLM_BREAKER_SLOW_CALL_RATE', '0.8')),
+    min_calls=int(os.environ.get('LLM_BREAKER_MIN_CALLS', '10')),
+    open_seconds=float(os.environ.get('LLM_BREAKER_OPEN_SECONDS', '30')),
+    call_timeout=float(os.environ.get('LLM_CALL_TIMEOUT', '90')),
+)
+
+async def ask_llm(prompt: str, endpoint: str) -> str:
+    return await llm_breaker.call(lambda: llm_router.send(prompt, endpoint=endpoint))
+
+# Batched recommendation generation for bulk/backfill work. Batch calls are long by
+# design, so they bypass the breaker's slow-call accounting but stop while it is open.
+LLM_BATCH_CALL_TIMEOUT = float(os.environ.get('LLM_BATCH_CALL_TIMEOUT', '240'))
+
+async def _ask_llm_batch(prompt: str) -> str:
+    if llm_breaker.is_open:
+        raise CircuitOpenError("llm")
+    return await asyncio.wait_for(llm_router.send(prompt, endpoint="recommendations_batch"), timeout=LLM_BATCH_CALL_TIMEOUT)
+
+batch_generator = BatchRecommendationGenerator(
+    _ask_llm_batch,
+    AdaptiveBatchSizer(
+        token_budget=int(os.environ.get('LLM_BATCH_TOKEN_BUDGET', '12000')),
+        initial_size=int(os.environ.get('LLM_BATCH_INITIAL_SIZE', '4')),
+        max_size=int(os.environ.get('LLM_BATCH_MAX_SIZE', '20')),
+    ),
+)
+# The batch endpoint answers within one HTTP request, so it takes about one or two
+# batches of users; larger runs go through scripts/backfill_recommendations.py
+RECOMMENDATIONS_BATCH_MAX_USERS = int(os.environ.get('RECOMMENDATIONS_BATCH_MAX_USERS', '20'))
+
+# Cohort skill gap analytics, maintained incrementally as analyses are stored
+skill_gap_rollups = SkillGapRollups(db)
+
+# Speculative precompute after profile writes
+PRECOMPUTE_MAX_SKILL_GAPS = int(os.environ.get('PRECOMPUTE_MAX_SKILL_GAPS', '2'))
+
+async def _precompute_jobs(profile: dict):
+    """Background LLM work worth doing as soon as a profile is written"""
+    if llm_breaker.is_open:
+        return []
+    jobs = []
+    # A near-duplicate profile's recommendations will be reused on request; don't pay for a generation
+    if not await similar_reuse.available(profile):
+        jobs.append(("recommendations", None, lambda: _generate_recommendations_data(profile)))
+    # Goals are free text ("Become a Data Scientist"); only those naming a known role are
+    # worth a call, keyed by the canonical role that analyze_skill_gap looks up
+    target_roles = list(dict.fromkeys(filter(None, map(role_in_goal, profile.get('career_goals', [])))))
+    for target_role in target_roles[:PRECOMPUTE_MAX_SKILL_GAPS]:
+        jobs.append(("skill_gap", target_role, lambda target_role=target_role: _generate_skill_gap_data(profile, target_role)))
+    return jobs
+
+precomputer = SpeculativePrecomputer(
+    db.precomputed_results,
+    _precompute_jobs,
+    delay_seconds=float(os.environ.get('PRECOMPUTE_DELAY_SECONDS', '5')),
+    max_calls_per_hour=int(os.environ.get('PRECOMPUTE_MAX_CALLS_PER_HOUR', '60')),
+    enabled=os.environ.get('PRECOMPUTE_ENABLED', 'true').lower() == 'true',
+)
+
+# Reuse of a near-duplicate profile's recent recommendations (MinHash LSH over profile features)
+profile_index = ProfileLshIndex(
+    db.profile_signatures,
+    MinHasher(int(os.environ.get('PROFILE_LSH_BANDS', '16')), int(os.environ.get('PROFILE_LSH_ROWS', '4'))),
+    threshold=float(os.environ.get('SIMILAR_REUSE_THRESHOLD', '0.8')),
+)
+similar_reuse = SimilarProfileReuse(
+    profile_index,
+    db.career_recommendations,
+    db.user_profiles,
+    max_age_hours=float(os.environ.get('SIMILAR_REUSE_MAX_AGE_HOURS', '72')),
+    shadow_rate=float(os.environ.get('SIMILAR_REUSE_SHADOW_RATE', '0.05')),
+    enabled=os.environ.get('SIMILAR_REUSE_ENABLED', 'true').lower() == 'true',
+)
+
+# Define Models
+class UserProfile(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    name: str
+    email: str
+    age: Optional[int] = None
+    education: str
+    current_role: Optional[str] = None
+    experience_years: Optional[int] = 0
+    skills: List[str] = []
+    interests: List[str] = []
+    career_goals: List[str] = []
+    preferred_industries: List[str] = []
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class UserProfileCreate(BaseModel):
+    name: str
+    email: str
+    age: Optional[int] = None
+    education: str
+    current_role: Optional[str] = None
+    experience_years: Optional[int] = 0
+    skills: List[str] = []
+    interests: List[str] = []
+    career_goals: List[str] = []
+    preferred_industries: List[str] = []
+
+class CareerRecommendation(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    user_id: str
+    job_title: str
+    description: str
+    required_skills: List[str]
+    salary_range: str
+    growth_potential: str
+    match_percentage: float
+    reasons: List[str]
+    learning_resources: List[Dict[str, str]]
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class SkillGapAnalysis(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    user_id: str
+    target_role: str
+    current_skills: List[str]
+    required_skills: List[str]
+    missing_skills: List[str]
+    skill_gaps: List[Dict[str, Any]]
+    learning_recommendations: List[Dict[str, str]]
+    estimated_time_to_bridge: str
+    priority_skills: List[str]
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class ChatMessage(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    user_id: str
+    message: str
+    response: str
+    skills_mentioned: List[str] = []
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class ChatRequest(BaseModel):
+    user_id: str
+    message: str
+
+class BatchRecommendationRequest(BaseModel):
+    user_ids: List[str] = Field(..., min_length=1, max_length=RECOMMENDATIONS_BATCH_MAX_USERS)
+
+class BatchRecommendationResult(BaseModel):
+    recommendations: Dict[str, List[CareerRecommendation]]
+    failed: List[str]
+    not_found: List[str]
+
+class DashboardData(BaseModel):
+    profile: UserProfile
+    chat_history: List[ChatMessage]
+    learning_resources: List[Dict[str, Any]]
+    recommendations: List[CareerRecommendation]
+    skill_gap_analysis: Optional[SkillGapAnalysis] = None
+
+async def _record_unknown_terms(kind: str, terms: List[str]):
+    """Count free-text terms the skill/role index did not recognise, for alias curation"""
+    if not terms:
+        return
+    now = datetime.now(timezone.utc).isoformat()
+    await db.unknown_terms.bulk_write([
+        UpdateOne(
+            {"kind": kind, "term": term.lower()},
+            {"$inc": {"count": 1}, "$set": {"last_seen": now}, "$setOnInsert": {"example": term}},
+            upsert=True
+        )
+        for term in terms
+    ], ordered=False)
+
+async def _canonicalize_profile(profile_dict: dict):
+    """Rewrite skills that are exact synonyms to their canonical names in place.
+
+    The current role is kept as entered; its canonical name, when the whole role is a
+    known synonym, is stored alongside it in ``current_role_canonical``.
+    """
+    skills, unknown_skills = SKILLS.canonicalize_all(profile_dict.get('skills', []))
+    profile_dict['skills'] = skills
+
+    unknown_roles = []
+    current_role = (profile_dict.get('current_role') or '').strip()
+    profile_dict['current_role'] = current_role or None
+    profile_dict['current_role_canonical'] = canonical_role(current_role)
+    if current_role and profile_dict['current_role_canonical'] is None:
+        unknown_roles.append(current_role)
+
+    await asyncio.gather(
+        _record_unknown_terms("skill", unknown_skills),
+        _record_unknown_terms("role", unknown_roles),
+    )
+
+# Routes
+@api_router.get("/")
+async def root():
+    return {"message": "TutoBit AI API is running!"}
+
+@api_router.post("/profile", response_model=UserProfile)
+async def create_profile(profile_data: UserProfileCreate):
+    profile_dict = profile_data.dict()
+    await _canonicalize_profile(profile_dict)
+    profile_obj = UserProfile(**profile_dict)
+
+    # Prepare for MongoDB
+    profile_for_db = profile_obj.dict()
+    profile_for_db['created_at'] = profile_for_db['created_at'].isoformat()
+    profile_for_db['updated_at'] = profile_for_db['updated_at'].isoformat()
+    profile_for_db['current_role_canonical'] = profile_dict['current_role_canonical']
+
+    await db.user_profiles.insert_one(profile_for_db)
+    reads.note_write(profile_obj.id)
+    await profile_index.upsert(profile_for_db)
+    precomputer.schedule(profile_obj.id, profile_for_db)
+    return profile_obj
+
+@api_router.get("/profile/{user_id}", response_model=UserProfile)
+async def get_profile(user_id: str, request: Request):
+    profile = await reads.collection("user_profiles", "get_profile", user_id).find_one({"id": user_id})
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    # Parse dates
+    if isinstance(profile.get('created_at'), str):
+        profile['created_at'] = datetime.fromisoformat(profile['created_at'])
+    if isinstance(profile.get('updated_at'), str):
+        profile['updated_at'] = datetime.fromisoformat(profile['updated_at'])
+
+    return conditional_json(request, UserProfile(**profile), last_modified=latest_timestamp([profile.get('updated_at')]))
+
+@api_router.put("/profile/{user_id}", response_model=UserProfile)
+async def update_profile(user_id: str, profile_data: UserProfileCreate):
+    existing_profile = await db.user_profiles.find_one({"id": user_id})
+    if not existing_profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    profile_dict = profile_data.dict()
+    await _canonicalize_profile(profile_dict)
+    profile_dict['id'] = user_id
+    profile_dict['created_at'] = existing_profile['created_at']
+    profile_dict['updated_at'] = datetime.now(timezone.utc).isoformat()
+
+    await db.user_profiles.replace_one({"id": user_id}, profile_dict)
+    reads.note_write(user_id)
+    await profile_index.upsert(profile_dict)
+    if profile_fingerprint(profile_dict) != profile_fingerprint(existing_profile):
+        precomputer.schedule(user_id, profile_dict)
+
+    # Parse date for response
+    if isinstance(profile_dict.get('created_at'), str):
+        profile_dict['created_at'] = datetime.fromisoformat(profile_dict['created_at'])
+    profile_dict['updated_at'] = datetime.fromisoformat(profile_dict['updated_at'])
+
+    return UserProfile(**profile_dict)
+
+async def _generate_recommendations_data(profile: dict) -> List[Dict[str, Any]]:
+    """Ask the LLM for career recommendations and return the parsed JSON array"""
+    prompt = f"""
+    Based on this user profile, generate 5 personalized career recommendations:
+
+    Name: {profile.get('name')}
+    Education: {profile.get('education')}
+    Current Role: {profile.get('current_role', 'Not specified')}
+    Experience: {profile.get('experience_years', 0)} years
+    Skills: {', '.join(profile.get('skills', []))}
+    Interests: {', '.join(profile.get('interests', []))}
+    Career Goals: {', '.join(profile.get('career_goals', []))}
+    Preferred Industries: {', '.join(profile.get('preferred_industries', []))}
+
+    For each recommendation, provide:
+    1. Job title
+    2. Brief description (2-3 sentences)
+    3. Required skills (list of 5-8 skills)
+    4. Salary range (realistic based on location and experience)
+    5. Growth potential (High/Medium/Low with brief explanation)
+    6. Match percentage (0-100%)
+    7. 3-4 specific reasons why this role fits
+    8. 3-4 learning resources (with titles and types like "Course", "Certification", "Book")
+
+    Format as JSON array with these exact field names: job_title, description, required_skills, salary_range, growth_potential, match_percentage, reasons, learning_resources.
+    """
+
+    response = await ask_llm(prompt, endpoint="recommendations")
+    return json.loads(response)
+
+async def _store_recommendations(user_id: str, recommendations_data: List[Dict[str, Any]], provenance: Dict[str, Any]) -> List[CareerRecommendation]:
+    """Validate and store one generated recommendation set for the user"""
+    batch_id = str(uuid.uuid4())
+    recommendations = []
+    docs = []
+
+    for rec_data in recommendations_data:
+        recommendation = CareerRecommendation(
+            user_id=user_id,
+            job_title=rec_data['job_title'],
+            description=rec_data['description'],
+            required_skills=rec_data['required_skills'],
+            salary_range=rec_data['salary_range'],
+            growth_potential=rec_data['growth_potential'],
+            match_percentage=rec_data['match_percentage'],
+            reasons=rec_data['reasons'],
+            learning_resources=rec_data['learning_resources']
+        )
+
+        rec_for_db = recommendation.dict()
+        rec_for_db['created_at'] = rec_for_db['created_at'].isoformat()
+        rec_for_db['batch_id'] = batch_id
+        rec_for_db.update(provenance)
+        docs.append(rec_for_db)
+        recommendations.append(recommendation)
+
+    # Store in database
+    await db.career_recommendations.insert_many(docs)
+    reads.note_write(user_id)
+    return recommendations
+
+@api_router.post("/recommendations/batch", response_model=BatchRecommendationResult)
+async def generate_career_recommendations_batch(batch_request: BatchRecommendationRequest):
+    """Generate recommendations for a few users with batched LLM prompts (see RECOMMENDATIONS_BATCH_MAX_USERS)"""
+    user_ids = list(dict.fromkeys(batch_request.user_ids))
+    profiles = await db.user_profiles.find({"id": {"$in": user_ids}}).to_list(len(user_ids))
+    found = {profile['id'] for profile in profiles}
+
+    generated, failed = await batch_generator.generate(profiles)
+
+    stored = {}
+    for user_id, recommendations_data in generated.items():
+        try:
+            stored[user_id] = await _store_recommendations(user_id, recommendations_data, {"source": "llm_batch"})
+        except Exception as e:
+            logger.warning(f"Batch recommendations for {user_id} could not be stored: {e}")
+            failed.append(user_id)
+
+    return BatchRecommendationResult(
+        recommendations=stored,
+        failed=failed,
+        not_found=[user_id for user_id in user_ids if user_id not in found],
+    )
+
+@api_router.post("/recommendations/{user_id}", response_model=List[CareerRecommendation])
+async def generate_career_recommendations(user_id: str):
+    profile = await db.user_profiles.find_one({"id": user_id})
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    try:
+        # Serve the speculative result if one was computed for this profile version,
+        # then a near-duplicate profile's recent recommendations, then a fresh generation
+        provenance = {"source": "precomputed"}
+        recommendations_data = await precomputer.take(user_id, "recommendations", profile)
+        if recommendations_data is None:
+            reused = await similar_reuse.find(profile)
+            if reused is not None:
+                recommendations_data, provenance = reused[0], {"source": "similar_profile", **reused[1]}
+                if not llm_breaker.is_open:
+                    similar_reuse.maybe_shadow(recommendations_data, lambda: _generate_recommendations_data(profile))
+        if recommendations_data is None:
+            provenance = {"source": "llm"}
+            recommendations_data = await _generate_recommendations_data(profile)
+
+        return await _store_recommendations(user_id, recommendations_data, provenance)
+
+    except Exception as e:
+        # Prefer the user's last stored recommendations over generic demo data
+        cached_recommendations = await _load_latest_recommendations(user_id)
+        if cached_recommendations:
+            return cached_recommendations
+
+        # Fallback with demo data if AI fails
+        demo_recommendations = [
+            {
+                "job_title": "Data Scientist",
+                "description": "Analyze complex data sets to help organizations make informed business decisions.",
+                "required_skills": ["Python", "Machine Learning", "SQL", "Statistics", "Data Visualization"],
+                "salary_range": "$80,000 - $130,000",
+                "growth_potential": "High - Data science is rapidly growing with excellent career prospects",
+                "match_percentage": 85.0,
+                "reasons": [
+                    "Strong analytical background aligns with data science requirements",
+                    "Technical skills complement machine learning needs",
+                    "Growing demand in preferred industries"
+                ],
+                "learning_resources": [
+                    {"title": "Python for Data Science", "type": "Course"},
+                    {"title": "Machine Learning Specialization", "type": "Certification"},
+                    {"title": "Hands-On Machine Learning", "type": "Book"}
+                ]
+            }
+        ]
+
+        return await _store_recommendations(user_id, demo_recommendations, {"source": "fallback"})
+
+async def _generate_skill_gap_data(profile: dict, target_role: str) -> Dict[str, Any]:
+    """Ask the LLM for a skill gap analysis and return the parsed JSON object"""
+    prompt = f"""
+    Analyze the skill gap for this career transition:
+
+    Current Skills: {', '.join(profile.get('skills', []))}
+    Target Role: {target_role}
+    Experience Level: {profile.get('experience_years', 0)} years
+    Education: {profile.get('education')}
+
+    Provide a comprehensive skill gap analysis with:
+    1. Required skills for the target role (list of 8-12 skills)
+    2. Missing skills the user needs to develop
+    3. Detailed skill gaps with priority levels (High/Medium/Low), descriptions, and estimated learning time
+    4. 5-6 specific learning recommendations with titles, types, and URLs/providers
+    5. Estimated total time to bridge the gap
+    6. Top 5 priority skills to focus on first
+
+    Format as JSON with these exact fields: required_skills, missing_skills, skill_gaps (array with skill, priority, description, learning_time), learning_recommendations (array with title, type, provider), estimated_time_to_bridge, priority_skills.
+    """
+
+    response = await ask_llm(prompt, endpoint="skill_gap")
+    return json.loads(response)
+
+async def _update_skill_gap_rollups(analysis_for_db: dict):
+    """Fold a stored analysis into the cohort rollups, replacing the user's previous one for the role"""
+    try:
+        await skill_gap_rollups.fold(analysis_for_db)
+    except Exception:
+        # Rollups can always be rebuilt; never fail the user's request over them
+        logger.exception("Failed to update skill gap rollups")
+
+@api_router.post("/skill-gap-analysis/{user_id}", response_model=SkillGapAnalysis)
+async def analyze_skill_gap(user_id: str, target_role: str):
+    profile = await db.user_profiles.find_one({"id": user_id})
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    current_skills = profile.get('skills', [])
+    # The LLM and the stored analysis get the role as asked; analytics group by its canonical name
+    target_role = target_role.strip()
+    target_role_canonical = canonical_role(target_role)
+
+    try:
+        # Serve the speculative result if one was computed for this profile version and role
+        analysis_data = None
+        if target_role_canonical:
+            analysis_data = await precomputer.take(user_id, "skill_gap", profile, target_role=target_role_canonical)
+        if analysis_data is None:
+            analysis_data = await _generate_skill_gap_data(profile, target_role)
+
+        skill_gap_analysis = SkillGapAnalysis(
+            user_id=user_id,
+            target_role=target_role,
+            current_skills=current_skills,
+            required_skills=analysis_data['required_skills'],
+            missing_skills=analysis_data['missing_skills'],
+            skill_gaps=analysis_data['skill_gaps'],
+            learning_recommendations=analysis_data['learning_recommendations'],
+            estimated_time_to_bridge=analysis_data['estimated_time_to_bridge'],
+            priority_skills=analysis_data['priority_skills']
+        )
+
+        # Store in database
+        analysis_for_db = skill_gap_analysis.dict()
+        analysis_for_db['created_at'] = analysis_for_db['created_at'].isoformat()
+        analysis_for_db['experience_bucket'] = experience_bucket(profile.get('experience_years'))
+        analysis_for_db['target_role_canonical'] = target_role_canonical
+        await db.skill_gap_analyses.insert_one(analysis_for_db)
+        reads.note_write(user_id)
+        await _update_skill_gap_rollups(analysis_for_db)
+
+        return skill_gap_analysis
+
+    except Exception as e:
+        # Prefer the user's last stored analysis for this role over generic demo data
+        cached_analysis = await _load_latest_skill_gap(user_id, target_role=target_role)
+        if cached_analysis:
+            return cached_analysis
+
+        # Fallback with demo data
+        demo_analysis = {
+            "required_skills": ["Python", "Machine Learning", "SQL", "Statistics", "Data Visualization", "Deep Learning"],
+            "missing_skills": ["Machine Learning", "Deep Learning", "Advanced Statistics"],
+            "skill_gaps": [
+                {"skill": "Machine Learning", "priority": "High", "description": "Core requirement for data science roles", "learning_time": "3-4 months"},
+                {"skill": "Deep Learning", "priority": "Medium", "description": "Advanced AI techniques", "learning_time": "2-3 months"}
+            ],
+            "learning_recommendations": [
+                {"title": "Machine Learning Course", "type": "Course", "provider": "Coursera"},
+                {"title": "Python Data Science Handbook", "type": "Book", "provider": "O'Reilly"}
+            ],
+            "estimated_time_to_bridge": "6-8 months with consistent learning",
+            "priority_skills": ["Python", "Machine Learning", "SQL", "Statistics", "Data Visualization"]
+        }
+
+        skill_gap_analysis = SkillGapAnalysis(
+            user_id=user_id,
+            target_role=target_role,
+            current_skills=current_skills,
+            **demo_analysis
+        )
+
+        # Store in database; demo data is kept out of the analytics rollups
+        analysis_for_db = skill_gap_analysis.dict()
+        analysis_for_db['created_at'] = analysis_for_db['created_at'].isoformat()
+        analysis_for_db['experience_bucket'] = experience_bucket(profile.get('experience_years'))
+        analysis_for_db['target_role_canonical'] = target_role_canonical
+        analysis_for_db['source'] = "fallback"
+        await db.skill_gap_analyses.insert_one(analysis_for_db)
+        reads.note_write(user_id)
+
+        return skill_gap_analysis
+
+CHAT_FALLBACK_RESPONSE = "I'm here to help with your career guidance! Could you please rephrase your question or try asking about career recommendations, skill development, or learning paths?"
+
+def _chat_context(profile: Optional[dict]) -> str:
+    if not profile:
+        return ""
+
+    return f"""
+    User Context:
+    Name: {profile.get('name')}
+    Role: {profile.get('current_role', 'Not specified')}
+    Experience: {profile.get('experience_years', 0)} years
+    Skills: {', '.join(profile.get('skills', []))}
+    Career Goals: {', '.join(profile.get('career_goals', []))}
+    """
+
+def _chat_prompt(context: str, message: str, history: Optional[List[tuple]] = None) -> str:
+    earlier = ""
+    if history:
+        turns = "\n".join(f"User: {question}\nMentor: {answer}" for question, answer in history)
+        earlier = f"\n\nEarlier in this conversation:\n{turns}"
+
+    return f"{context}{earlier}\n\nUser Question: {message}\n\nProvide personalized career guidance based on the user's background."
+
+def _chat_endpoint(message: str) -> str:
+    # Short questions get a smaller, faster model
+    return "chat_short" if len(message) <= CHAT_SHORT_MESSAGE_CHARS else "chat"
+
+async def _store_chat_message(chat_message: ChatMessage):
+    chat_for_db = chat_message.dict()
+    chat_for_db['timestamp'] = chat_for_db['timestamp'].isoformat()
+    await db.chat_messages.insert_one(chat_for_db)
+    reads.note_write(chat_message.user_id)
+
+@api_router.post("/chat", response_model=ChatMessage)
+async def chat_with_mentor(chat_request: ChatRequest):
+    try:
+        # Get user profile for context
+        profile = await db.user_profiles.find_one({"id": chat_request.user_id})
+
+        enhanced_prompt = _chat_prompt(_chat_context(profile), chat_request.message)
+        response = await ask_llm(enhanced_prompt, endpoint=_chat_endpoint(chat_request.message))
+
+        chat_message = ChatMessage(
+            user_id=chat_request.user_id,
+            message=chat_request.message,
+            response=response,
+            skills_mentioned=SKILLS.extract(chat_request.message)
+        )
+
+        # Store in database
+        await _store_chat_message(chat_message)
+
+        return chat_message
+
+    except Exception as e:
+        # Fallback response
+        chat_message = ChatMessage(
+            user_id=chat_request.user_id,
+            message=chat_request.message,
+            response=CHAT_FALLBACK_RESPONSE,
+            skills_mentioned=SKILLS.extract(chat_request.message)
+        )
+
+        # Store in database
+        await _store_chat_message(chat_message)
+
+        return chat_message
+
+# Persistent WebSocket chat
+WS_CHAT_HEARTBEAT_SECONDS = float(os.environ.get('WS_CHAT_HEARTBEAT_SECONDS', '20'))
+WS_CHAT_IDLE_TIMEOUT_SECONDS = float(os.environ.get('WS_CHAT_IDLE_TIMEOUT_SECONDS', '300'))
+WS_CHAT_HISTORY_TURNS = int(os.environ.get('WS_CHAT_HISTORY_TURNS', '5'))
+
+async def _ws_reload_profile(session: ChatSocketSession):
+    profile = await db.user_profiles.find_one({"id": session.user_id})
+    session.profile = profile or {}
+    session.context = _chat_context(profile)
+
+async def _ws_handle_message(session: ChatSocketSession, thread_id: str, message: str):
+    history = session.thread_history.setdefault(thread_id, [])
+    prompt = _chat_prompt(session.context, message, history)
+
+    try:
+        response = await ask_llm(prompt, endpoint=_chat_endpoint(message))
+    except Exception:
+        response = CHAT_FALLBACK_RESPONSE
+
+    # The provider returns whole replies, so stream them out word by word
+    for chunk in re.findall(r"\S+\s*", response):
+        await session.send({"type": "chunk", "thread_id": thread_id, "delta": chunk})
+
+    chat_message = ChatMessage(user_id=session.user_id, message=message, response=response, skills_mentioned=SKILLS.extract(message))
+    await _store_chat_message(chat_message)
+
+    history.append((message, response))
+    del history[:-WS_CHAT_HISTORY_TURNS]
+
+    await session.send({"type": "done", "thread_id": thread_id, "message": jsonable_encoder(chat_message)})
+
+@api_router.websocket("/ws/chat")
+async def chat_socket(websocket: WebSocket, user_id: str):
+    """Mentor chat over one socket: profile context loaded once, replies streamed, threads multiplexed"""
+    await websocket.accept()
+    session = ChatSocketSession(
+        websocket,
+        user_id,
+        handle_message=_ws_handle_message,
+        reload_profile=_ws_reload_profile,
+        heartbeat_seconds=WS_CHAT_HEARTBEAT_SECONDS,
+        idle_timeout_seconds=WS_CHAT_IDLE_TIMEOUT_SECONDS,
+    )
+    await session.run()
+
+async def _load_chat_history(user_id: str, endpoint: str = "get_chat_history") -> List[ChatMessage]:
+    messages = await reads.collection("chat_messages", endpoint, user_id).find({"user_id": user_id}).sort("timestamp", -1).limit(50).to_list(50)
+
+    # Parse timestamps
+    for message in messages:
+        if isinstance(message.get('timestamp'), str):
+            message['timestamp'] = datetime.fromisoformat(message['timestamp'])
+
+    return [ChatMessage(**message) for message in messages]
+
+@api_router.get("/chat/{user_id}", response_model=List[ChatMessage])
+async def get_chat_history(user_id: str, request: Request):
+    messages = await _load_chat_history(user_id)
+    return conditional_json(request, messages, last_modified=latest_timestamp(m.timestamp for m in messages))
+
+EXPORT_BATCH_SIZE = int(os.environ.get('CHAT_EXPORT_BATCH_SIZE', '500'))
+EXPORT_CHUNK_BYTES = 64 * 1024
+EXPORT_CSV_FIELDS = ["id", "user_id", "timestamp", "message", "response", "skills_mentioned"]
+
+async def _export_chat_lines(query: dict, fmt: str):
+    """Yield the encoded export in ~64KB chunks while walking the cursor batch by batch"""
+    chat_messages = reads.collection("chat_messages", "export_chat_history", query["user_id"])
+    cursor = chat_messages.find(query, {"_id": 0}).sort("timestamp", 1).batch_size(EXPORT_BATCH_SIZE)
+    buffer = io.StringIO()
+    writer = None
+    if fmt == "csv":
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_CSV_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+
+    async for message in cursor:
+        if writer:
+            writer.writerow({**message, "skills_mentioned": ";".join(message.get("skills_mentioned", []))})
+        else:
+            buffer.write(json.dumps(message, default=str))
+            buffer.write("\n")
+
+        if buffer.tell() >= EXPORT_CHUNK_BYTES:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+def _utc_isoformat(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat()
+
+async def _gzip_stream(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+@api_router.get("/chat/{user_id}/export")
+async def export_chat_history(
+    user_id: str,
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    gzip: bool = False
+):
+    """Stream the complete chat history as NDJSON or CSV, oldest first, in constant memory"""
+    query: Dict[str, Any] = {"user_id": user_id}
+    # Timestamps are stored as UTC ISO strings, which order correctly as strings
+    timestamp_range = {}
+    if since:
+        timestamp_range["$gte"] = _utc_isoformat(since)
+    if until:
+        timestamp_range["$lt"] = _utc_isoformat(until)
+    if timestamp_range:
+        query["timestamp"] = timestamp_range
+
+    body = _export_chat_lines(query, fmt)
+    media_type = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    # The id comes from the path; only a slug of it may go into the header
+    slug = re.sub(r"[^A-Za-z0-9-]+", "_", user_id).strip("_")[:80] or "user"
+    file_name = f"chat-{slug}.{fmt}"
+    if gzip:
+        body = _gzip_stream(body)
+        media_type = "application/gzip"
+        file_name += ".gz"
+
+    return StreamingResponse(body, media_type=media_type, headers={"Content-Disposition": f'attachment; filename="{file_name}"'})
+
+async def _load_learning_resources(profile: dict) -> List[Dict[str, Any]]:
+    # Demo learning resources - in production, these would come from real APIs.
+    # Ids are derived from the URL so repeat loads produce identical payloads.
+    resources = [
+        {
+            "id": str(uuid.uuid5(uuid.NAMESPACE_URL, "https://www.udemy.com/course/complete-python-bootcamp/")),
+            "title": "Complete Python Bootcamp",
+            "provider": "Udemy",
+            "type": "Course",
+            "duration": "22 hours",
+            "rating": 4.8,
+            "price": "Free",
+            "url": "https://www.udemy.com/course/complete-python-bootcamp/",
+            "description": "Learn Python like a Professional Start from the basics and go all the way to creating your own applications"
+        },
+        {
+            "id": str(uuid.uuid5(uuid.NAMESPACE_URL, "https://www.coursera.org/professional-certificates/google-data-analytics")),
+            "title": "Google Data Analytics Certificate",
+            "provider": "Coursera",
+            "type": "Certification",
+            "duration": "6 months",
+            "rating": 4.7,
+            "price": "Free",
+            "url": "https://www.coursera.org/professional-certificates/google-data-analytics",
+            "description": "Prepare for a career in data analytics with this professional certificate from Google"
+        },
+        {
+            "id": str(uuid.uuid5(uuid.NAMESPACE_URL, "https://www.udemy.com/course/machinelearning/")),
+            "title": "Machine Learning A-Z",
+            "provider": "Udemy",
+            "type": "Course",
+            "duration": "44 hours",
+            "rating": 4.5,
+            "price": "Free",
+            "url": "https://www.udemy.com/course/machinelearning/",
+            "description": "Learn to create Machine Learning Algorithms in Python and R from two Data Science experts"
+        }
+    ]
+
+    return resources
+
+@api_router.get("/learning-resources/{user_id}")
+async def get_learning_resources(user_id: str, request: Request):
+    """Get personalized learning resources based on user profile and skill gaps"""
+    profile = await reads.collection("user_profiles", "get_learning_resources", user_id).find_one({"id": user_id})
+    if not profile:
+        return []
+
+    resources = await _load_learning_resources(profile)
+    return conditional_json(request, resources, last_modified=latest_timestamp([profile.get('updated_at')]))
+
+async def _load_latest_recommendations(user_id: str, endpoint: str = "generate_career_recommendations") -> List[CareerRecommendation]:
+    """Most recently generated recommendation set for the user"""
+    career_recommendations = reads.collection("career_recommendations", endpoint, user_id)
+    latest = await career_recommendations.find_one({"user_id": user_id}, sort=[("created_at", -1)])
+    if not latest:
+        return []
+
+    if latest.get('batch_id'):
+        docs = await career_recommendations.find({"user_id": user_id, "batch_id": latest['batch_id']}).to_list(100)
+    else:
+        docs = [latest]
+
+    for doc in docs:
+        if isinstance(doc.get('created_at'), str):
+            doc['created_at'] = datetime.fromisoformat(doc['created_at'])
+
+    return [CareerRecommendation(**doc) for doc in docs]
+
+async def _load_latest_skill_gap(user_id: str, target_role: Optional[str] = None, endpoint: str = "analyze_skill_gap") -> Optional[SkillGapAnalysis]:
+    query = {"user_id": user_id}
+    if target_role is not None:
+        query["target_role"] = target_role
+    latest = await reads.collection("skill_gap_analyses", endpoint, user_id).find_one(query, sort=[("created_at", -1)])
+    if not latest:
+        return None
+
+    if isinstance(latest.get('created_at'), str):
+        latest['created_at'] = datetime.fromisoformat(latest['created_at'])
+
+    return SkillGapAnalysis(**latest)
+
+@api_router.get("/analytics/skill-gaps")
+async def get_skill_gap_analytics(
+    role: str,
+    min_experience_years: Optional[int] = Query(None, ge=0, description="Inclusive bucket edge: 0, 1, 3, 5 or 10"),
+    max_experience_years: Optional[int] = Query(None, ge=1, description="Exclusive bucket edge: 1, 3, 5 or 10 (3 means under 3 years)"),
+    limit: int = Query(10, ge=1, le=100)
+):
+    """Top missing skills for a target role among users in the given experience range.
+
+    Counts are kept per experience bucket, so both bounds must fall on bucket edges.
+    """
+    try:
+        return await skill_gap_rollups.top_missing_skills(
+            canonical_role(role) or role.strip(),
+            min_experience_years=min_experience_years,
+            max_experience_years=max_experience_years,
+            limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@api_router.get("/skills/unknown")
+async def get_unknown_terms(kind: Optional[str] = Query(None, pattern="^(skill|role)$"), limit: int = Query(50, ge=1, le=500)):
+    """Most frequent skill/role terms that have no alias yet"""
+    query = {"kind": kind} if kind else {}
+    terms = await db.unknown_terms.find(query, {"_id": 0}).sort("count", -1).limit(limit).to_list(limit)
+    return terms
+
+@api_router.get("/metrics")
+async def get_metrics():
+    """Runtime statistics for LLM routing, the LLM circuit breaker, background precompute, recommendation reuse and the event loop"""
+    return {
+        "llm": llm_router.stats(),
+        "llm_circuit_breaker": llm_breaker.stats(),
+        "precompute": {**precomputer.stats, "budget_used_last_hour": precomputer.budget.used},
+        "similar_profile_reuse": similar_reuse.stats(),
+        "recommendations_batch": batch_generator.describe(),
+        "event_loop": loop_lag_monitor.stats,
+        "mongo_read_routing": reads.describe(),
+    }
+
+@api_router.get("/dashboard/{user_id}", response_model=DashboardData)
+async def get_dashboard(user_id: str, request: Request):
+    """Everything the dashboard needs on load, with a single profile lookup"""
+    profile = await reads.collection("user_profiles", "get_dashboard", user_id).find_one({"id": user_id})
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    chat_history, learning_resources, recommendations, skill_gap_analysis = await asyncio.gather(
+        _load_chat_history(user_id, endpoint="get_dashboard"),
+        _load_learning_resources(profile),
+        _load_latest_recommendations(user_id, endpoint="get_dashboard"),
+        _load_latest_skill_gap(user_id, endpoint="get_dashboard"),
+    )
+
+    # Parse dates
+    if isinstance(profile.get('created_at'), str):
+        profile['created_at'] = datetime.fromisoformat(profile['created_at'])
+    if isinstance(profile.get('updated_at'), str):
+        profile['updated_at'] = datetime.fromisoformat(profile['updated_at'])
+
+    dashboard = DashboardData(
+        profile=UserProfile(**profile),
+        chat_history=chat_history,
+        learning_resources=learning_resources,
+        recommendations=recommendations,
+        skill_gap_analysis=skill_gap_analysis
+    )
+
+    last_modified = latest_timestamp(
+        [profile['updated_at']]
+        + [m.timestamp for m in chat_history]
+        + [r.created_at for r in recommendations]
+        + ([skill_gap_analysis.created_at] if skill_gap_analysis else [])
+    )
+    return conditional_json(request, dashboard, last_modified=last_modified)
+
+# Include the router in the main app
+app.include_router(api_router)
+
+# Opt-in request profiling: "X-Profile: <PROFILE_TOKEN>" header or random sampling
+app.add_middleware(
+    RequestProfilingMiddleware,
+    output_dir=Path(os.environ.get('PROFILE_DIR', ROOT_DIR / 'profiles')),
+    token=os.environ.get('PROFILE_TOKEN'),
+    sample_rate=float(os.environ.get('PROFILE_SAMPLE_RATE', '0')),
+    interval=float(os.environ.get('PROFILE_INTERVAL_MS', '5')) / 1000,
+)
+
+# Idempotency-Key support for every POST route under /api
+app.add_middleware(
+    IdempotencyMiddleware,
+    collection=db.idempotency_keys,
+    path_prefix=api_router.prefix,
+    ttl_seconds=int(os.environ.get('IDEMPOTENCY_TTL_SECONDS', str(24 * 3600))),
+    wait_timeout=float(os.environ.get('IDEMPOTENCY_WAIT_TIMEOUT', '120')),
+    claim_seconds=float(os.environ.get('IDEMPOTENCY_CLAIM_SECONDS', '120')),
+)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_credentials=True,
+    allow_origins=os.environ.get('CORS_ORIGINS', '*').split(','),
+    allow_methods=["*"],
+    allow_headers=["*"],
+    expose_headers=["ETag", "Last-Modified", "X-Profile-File", "Idempotent-Replayed"],
+)
+
+# Compress JSON bodies above the threshold (brotli when installed, otherwise gzip)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.environ.get('COMPRESSION_MIN_SIZE', '1024')),
+)
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Logs the loop thread's stack whenever sync work blocks the event loop
+loop_lag_monitor = EventLoopLagMonitor(threshold=float(os.environ.get('LOOP_LAG_THRESHOLD_MS', '100')) / 1000)
+
+@app.on_event("startup")
+async def startup_precompute():
+    await precomputer.ensure_indexes()
+
+@app.on_event("startup")
+async def startup_similar_reuse_indexes():
+    await similar_reuse.ensure_indexes()
+
+@app.on_event("startup")
+async def startup_idempotency_indexes():
+    await ensure_idempotency_indexes(db.idempotency_keys)
+
+@app.on_event("startup")
+async def startup_analytics_indexes():
+    await skill_gap_rollups.ensure_indexes()
+
+@app.on_event("startup")
+async def startup_unknown_terms_indexes():
+    await db.unknown_terms.create_index([("kind", 1), ("term", 1)], unique=True)
+    await db.unknown_terms.create_index([("count", -1)])
+
+@app.on_event("startup")
+async def startup_chat_indexes():
+    # Serves both the latest-50 history read and the time-ordered export
+    await db.chat_messages.create_index([("user_id", 1), ("timestamp", 1)])
+
+@app.on_event("startup")
+async def startup_loop_lag_monitor():
+    if os.environ.get('LOOP_LAG_MONITOR_ENABLED', 'true').lower() == 'true':
+        loop_lag_monitor.start()
+
+@app.on_event("shutdown")
+async def shutdown_db_client():
+    await loop_lag_monitor.stop()
+    await precomputer.shutdown()
+    await similar_reuse.shutdown()
+    client.close()
@@ -0,0 +1,338 @@
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# canonical name -> true synonyms (matching is case-insensitive; "-", "_" and "/" count as spaces).
+# Distinct tools stay distinct here; their broader categories live in SKILL_CATEGORIES.
+SKILL_ALIASES: Dict[str, List[str]] = {
+    "JavaScript": ["javascript", "js", "ecmascript", "es6", "vanilla js"],
+    "TypeScript": ["typescript", "ts"],
+    "Python": ["python", "python3"],
+    "Java": ["java", "core java"],
+    "C": ["c language", "ansi c"],
+    "C++": ["c++", "cpp", "cplusplus"],
+    "C#": ["c#", "csharp", "c sharp"],
+    ".NET": [".net", "dotnet", ".net core"],
+    "ASP.NET": ["asp.net", "asp.net core"],
+    "Go": ["golang", "go lang"],
+    "Rust": ["rust", "rustlang"],
+    "Ruby": ["ruby"],
+    "Ruby on Rails": ["ruby on rails", "rails", "ror"],
+    "PHP": ["php"],
+    "Kotlin": ["kotlin"],
+    "Swift": ["swift"],
+    "R": ["r language", "r programming", "rstats"],
+    "SQL": ["sql", "structured query language"],
+    "T-SQL": ["t sql", "tsql", "transact sql"],
+    "PL/SQL": ["pl sql", "plsql"],
+    "PostgreSQL": ["postgresql", "postgres", "psql"],
+    "MySQL": ["mysql"],
+    "MongoDB": ["mongodb", "mongo"],
+    "Redis": ["redis"],
+    "HTML": ["html", "html5"],
+    "CSS": ["css", "css3"],
+    "Tailwind CSS": ["tailwind", "tailwindcss", "tailwind css"],
+    "React": ["react", "reactjs", "react.js", "react js"],
+    "React Native": ["react native"],
+    "Angular": ["angular", "angularjs", "angular.js"],
+    "Vue.js": ["vue", "vuejs", "vue.js", "vue js"],
+    "Node.js": ["node", "nodejs", "node.js", "node js"],
+    "Express": ["express", "expressjs", "express.js"],
+    "Django": ["django"],
+    "Flask": ["flask"],
+    "FastAPI": ["fastapi", "fast api"],
+    "Spring": ["spring", "spring framework"],
+    "Spring Boot": ["spring boot", "springboot"],
+    "GraphQL": ["graphql"],
+    "REST APIs": ["rest api", "rest apis", "restful", "restful apis"],
+    "Git": ["git"],
+    "GitHub": ["github"],
+    "GitLab": ["gitlab"],
+    "Docker": ["docker"],
+    "Kubernetes": ["kubernetes", "k8s"],
+    "AWS": ["aws", "amazon web services"],
+    "Azure": ["azure", "microsoft azure"],
+    "Google Cloud": ["gcp", "google cloud", "google cloud platform"],
+    "CI/CD": ["ci/cd", "ci cd", "continuous integration", "continuous delivery", "continuous deployment"],
+    "Linux": ["linux"],
+    "Unix": ["unix"],
+    "Bash": ["bash"],
+    "Shell Scripting": ["shell scripting", "shell scripts"],
+    "Machine Learning": ["machine learning", "ml"],
+    "Deep Learning": ["deep learning", "dl"],
+    "Neural Networks": ["neural networks", "neural nets"],
+    "Natural Language Processing": ["natural language processing", "nlp"],
+    "Computer Vision": ["computer vision"],
+    "TensorFlow": ["tensorflow", "tf"],
+    "Keras": ["keras"],
+    "PyTorch": ["pytorch"],
+    "scikit-learn": ["scikit learn", "sklearn"],
+    "Pandas": ["pandas"],
+    "NumPy": ["numpy"],
+    "Statistics": ["statistics", "stats", "statistical analysis"],
+    "Data Analysis": ["data analysis", "data analytics"],
+    "Data Visualization": ["data visualization", "data visualisation", "dataviz", "data viz"],
+    "Tableau": ["tableau"],
+    "Power BI": ["power bi", "powerbi"],
+    "Excel": ["excel", "ms excel", "microsoft excel"],
+    "Spark": ["spark", "apache spark"],
+    "PySpark": ["pyspark"],
+    "Hadoop": ["hadoop"],
+    "Data Engineering": ["data engineering"],
+    "ETL": ["etl", "extract transform load"],
+    "Cloud Computing": ["cloud computing", "cloud"],
+    "Cybersecurity": ["cybersecurity", "cyber security", "information security", "infosec", "security"],
+    "Agile": ["agile", "agile methodology"],
+    "Scrum": ["scrum"],
+    "Kanban": ["kanban"],
+    "Project Management": ["project management"],
+    "PMP": ["pmp"],
+    "Product Management": ["product management"],
+    "UI/UX Design": ["ui/ux", "ui ux", "ui/ux design"],
+    "UX Design": ["ux", "ux design", "user experience", "user experience design"],
+    "UI Design": ["ui", "ui design", "user interface design"],
+    "Figma": ["figma"],
+    "Communication": ["communication", "communication skills"],
+    "Public Speaking": ["public speaking"],
+    "Leadership": ["leadership", "team leadership"],
+    "People Management": ["people management"],
+    "Problem Solving": ["problem solving"],
+    "Critical Thinking": ["critical thinking"],
+}
+
+# Broader skill a specific tool or practice counts towards (never used to rewrite user data)
+SKILL_CATEGORIES: Dict[str, str] = {
+    "Figma": "UI/UX Design",
+    "UX Design": "UI/UX Design",
+    "UI Design": "UI/UX Design",
+    "Keras": "Deep Learning",
+    "TensorFlow": "Deep Learning",
+    "PyTorch": "Deep Learning",
+    "Neural Networks": "Deep Learning",
+    "Scrum": "Agile",
+    "Kanban": "Agile",
+    "GitHub": "Git",
+    "GitLab": "Git",
+    "Bash": "Shell Scripting",
+    "Unix": "Linux",
+    "Spring Boot": "Spring",
+    "ASP.NET": ".NET",
+    "T-SQL": "SQL",
+    "PL/SQL": "SQL",
+    "PostgreSQL": "SQL",
+    "MySQL": "SQL",
+    "PySpark": "Spark",
+    "ETL": "Data Engineering",
+    "PMP": "Project Management",
+    "Public Speaking": "Communication",
+    "People Management": "Leadership",
+}
+
+ROLE_ALIASES: Dict[str, List[str]] = {
+    "Software Engineer": ["software engineer", "software developer", "swe", "sde", "programmer", "developer"],
+    "Senior Software Engineer": ["senior software engineer", "senior developer", "senior software developer", "senior swe"],
+    "Frontend Developer": ["frontend developer", "front end developer", "frontend engineer", "front end engineer"],
+    "Backend Developer": ["backend developer", "back end developer", "backend engineer", "back end engineer"],
+    "Full Stack Developer": ["full stack developer", "fullstack developer", "full stack engineer", "fullstack engineer"],
+    "Mobile Developer": ["mobile developer", "mobile engineer", "mobile app developer"],
+    "iOS Developer": ["ios developer", "ios engineer"],
+    "Android Developer": ["android developer", "android engineer"],
+    "Data Scientist": ["data scientist"],
+    "Data Analyst": ["data analyst"],
+    "Business Intelligence Analyst": ["business intelligence analyst", "bi analyst"],
+    "Data Engineer": ["data engineer"],
+    "Machine Learning Engineer": ["machine learning engineer", "ml engineer", "mle"],
+    "AI Engineer": ["ai engineer"],
+    "DevOps Engineer": ["devops engineer"],
+    "Site Reliability Engineer": ["site reliability engineer", "sre"],
+    "Platform Engineer": ["platform engineer"],
+    "Cloud Architect": ["cloud architect"],
+    "Solutions Architect": ["solutions architect", "solution architect"],
+    "Cloud Engineer": ["cloud engineer"],
+    "Cybersecurity Analyst": ["cybersecurity analyst", "security analyst", "cyber security analyst"],
+    "Security Engineer": ["security engineer"],
+    "Product Manager": ["product manager"],
+    "Product Owner": ["product owner"],
+    "Project Manager": ["project manager"],
+    "Program Manager": ["program manager"],
+    "UX Designer": ["ux designer", "ui/ux designer", "user experience designer"],
+    "UI Designer": ["ui designer", "user interface designer"],
+    "Product Designer": ["product designer"],
+    "Business Analyst": ["business analyst"],
+    "QA Engineer": ["qa engineer", "quality assurance engineer", "test engineer", "sdet"],
+    "Engineering Manager": ["engineering manager"],
+    "Tech Lead": ["tech lead", "technical lead"],
+    "Student": ["student"],
+    "Intern": ["intern"],
+}
+
+# Aliases that are also ordinary words ("go abroad", "plan C", "express my ideas"): they
+# resolve a whole term through ``canonical`` but are never picked out of free text
+EXACT_ONLY_TERMS = {
+    "c", "r", "go", "express", "swift", "spring", "node", "cloud", "security", "ui", "ux",
+    "rust", "ruby", "flask", "spark", "excel", "pandas", "rails", "stats", "agile", "communication",
+    "leadership", "developer", "programmer", "student", "intern",
+}
+
+_SEPARATORS = re.compile(r"[-_/]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_term(text: str) -> str:
+    """Lower-case, treat - _ / as spaces and collapse whitespace"""
+    return _WHITESPACE.sub(" ", _SEPARATORS.sub(" ", text.lower())).strip()
+
+
+class AliasIndex:
+    """Alias dictionary compiled into an Aho-Corasick automaton.
+
+    ``canonical`` resolves a whole term (a canonical name or one of its aliases) with
+    a dict lookup. ``extract`` finds the listed aliases in free text in one pass over
+    the characters and keeps the leftmost-longest, non-overlapping matches that sit on
+    word boundaries. Canonical names are not searched for unless they are also listed
+    as aliases, and ``exact_only`` aliases are never searched for.
+    """
+
+    def __init__(self, aliases: Dict[str, List[str]], exact_only: Iterable[str] = ()):
+        self._lookup: Dict[str, str] = {}
+        searchable: Dict[str, str] = {}
+        exact_only = {normalize_term(term) for term in exact_only}
+        for canonical, names in aliases.items():
+            self._lookup.setdefault(normalize_term(canonical), canonical)
+            for name in names:
+                alias = normalize_term(name)
+                self._lookup.setdefault(alias, canonical)
+                if alias not in exact_only:
+                    searchable.setdefault(alias, canonical)
+
+        # Automaton: goto transitions, failure links and (length, canonical) outputs per state
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, str]]] = [[]]
+        for alias, canonical in searchable.items():
+            state = 0
+            for char in alias:
+                if char not in self._goto[state]:
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._goto[state][char] = len(self._goto) - 1
+                state = self._goto[state][char]
+            self._out[state].append((len(alias), canonical))
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, target in self._goto[state].items():
+                queue.append(target)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[target] = self._goto[fallback].get(char, 0)
+                self._out[target] = self._out[target] + self._out[self._fail[target]]
+
+    def canonical(self, term: str) -> Optional[str]:
+        return self._lookup.get(normalize_term(term))
+
+    def canonicalize_all(self, terms: Iterable[str]) -> Tuple[List[str], List[str]]:
+        """Canonical names in input order without duplicates, plus the terms that were not recognised"""
+        result, unknown, seen = [], [], set()
+        for term in terms:
+            term = term.strip()
+            if not term:
+                continue
+            name = self.canonical(term)
+            if name is None:
+                unknown.append(term)
+                name = term
+            if name.lower() not in seen:
+                seen.add(name.lower())
+                result.append(name)
+        return result, unknown
+
+    def extract(self, text: str) -> List[str]:
+        """Canonical names mentioned in free text, in order of first mention"""
+        text = normalize_term(text)
+        matches = []
+        state = 0
+        for end, char in enumerate(text, start=1):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for length, canonical in self._out[state]:
+                start = end - length
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                if end < len(text) and text[end].isalnum():
+                    continue
+                matches.append((start, -length, canonical))
+
+        found, seen, covered_until = [], set(), 0
+        for start, neg_length, canonical in sorted(matches):
+            if start < covered_until:
+                continue
+            covered_until = start - neg_length
+            if canonical not in seen:
+                seen.add(canonical)
+                found.append(canonical)
+        return found
+
+
+SKILLS = AliasIndex(SKILL_ALIASES, exact_only=EXACT_ONLY_TERMS)
+ROLES = AliasIndex(ROLE_ALIASES, exact_only=EXACT_ONLY_TERMS)
+
+
+def canonical_role(text: Optional[str]) -> Optional[str]:
+    """Canonical role when the whole text is a known role name or synonym, None otherwise.
+
+    Qualified titles ("Senior Data Scientist", "Game Developer") are deliberately not
+    reduced to a role they merely contain.
+    """
+    if not text or not text.strip():
+        return None
+    return ROLES.canonical(text)
+
+
+def skill_category(skill: str) -> Optional[str]:
+    """Broader skill that a canonical skill counts towards, e.g. Figma -> UI/UX Design"""
+    return SKILL_CATEGORIES.get(skill)
+
+
+if __name__ == "__main__":
+    # Throughput benchmark: python skill_index.py
+    import random
+    import time
+
+    words = "I have been working with react and node js for a while and want to move into ml engineer roles " \
+            "using pytorch, sql, aws and docker; my manager says my communication and leadership are good".split()
+    texts = [" ".join(random.choice(words) for _ in range(random.randint(20, 120))) for _ in range(5000)]
+    total_bytes = sum(len(t) for t in texts)
+
+    started = time.perf_counter()
+    for text in texts:
+        SKILLS.extract(text)
+    elapsed = time.perf_counter() - started
+    print(f"extract: {len(texts) / elapsed:,.0f} texts/s, {total_bytes / elapsed / 1e6:.2f} MB/s, "
+          f"{elapsed / len(texts) * 1e6:.1f} us/text (avg {total_bytes // len(texts)} chars)")
+
+    terms = [random.choice(words) for _ in range(100000)]
+    started = time.perf_counter()
+    for term in terms:
+        SKILLS.canonical(term)
+    elapsed = time.perf_counter() - started
+    print(f"canonical: {len(terms) / elapsed:,.0f} terms/s")
+
+
+def role_in_goal(goal: Optional[str]) -> Optional[str]:
+    """Canonical role a free-text career goal aims at ("Become a Data Scientist").
+
+    None when the goal names no role, or several ("from data analyst to data engineer").
+    """
+    if not goal or not goal.strip():
+        return None
+    role = canonical_role(goal)
+    if role:
+        return role
+    roles = ROLES.extract(goal)
+    return roles[0] if len(roles) == 1 else None
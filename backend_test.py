@@ -254,6 +254,139 @@ class CareerCraftAPITester:
         
         return success
 
+    def test_dashboard(self):
+        """Test dashboard aggregate endpoint"""
+        if not self.test_user_id:
+            print("❌ Skipping - No user ID available")
+            return False
+
+        success, response = self.run_test(
+            "Get Dashboard",
+            "GET",
+            f"dashboard/{self.test_user_id}",
+            200
+        )
+
+        if success:
+            required_fields = ['profile', 'chat_history', 'learning_resources', 'recommendations', 'skill_gap_analysis']
+            missing_fields = [field for field in required_fields if field not in response]
+            if missing_fields:
+                print(f"   ⚠️  Missing fields in dashboard: {missing_fields}")
+            else:
+                print(f"   ✅ All required fields present in dashboard")
+
+        success2, response2 = self.run_test(
+            "Dashboard Unknown User",
+            "GET",
+            "dashboard/invalid-id",
+            404
+        )
+
+        return success and success2
+
+    def test_chat_export(self):
+        """Test chat history export as NDJSON and CSV"""
+        if not self.test_user_id:
+            print("❌ Skipping - No user ID available")
+            return False
+
+        success, response = self.run_test(
+            "Export Chat History (NDJSON)",
+            "GET",
+            f"chat/{self.test_user_id}/export",
+            200
+        )
+
+        success2, response2 = self.run_test(
+            "Export Chat History (CSV)",
+            "GET",
+            f"chat/{self.test_user_id}/export",
+            200,
+            params={"format": "csv"}
+        )
+
+        success3, response3 = self.run_test(
+            "Export Chat History (Invalid Format)",
+            "GET",
+            f"chat/{self.test_user_id}/export",
+            422,
+            params={"format": "xml"}
+        )
+
+        return success and success2 and success3
+
+    def test_skill_gap_analytics(self):
+        """Test skill gap analytics rollups"""
+        success, response = self.run_test(
+            "Skill Gap Analytics",
+            "GET",
+            "analytics/skill-gaps",
+            200,
+            params={"role": "Data Scientist", "min_experience_years": 1, "max_experience_years": 5}
+        )
+
+        if success:
+            required_fields = ['role', 'users', 'top_missing_skills']
+            missing_fields = [field for field in required_fields if field not in response]
+            if missing_fields:
+                print(f"   ⚠️  Missing fields in analytics: {missing_fields}")
+            else:
+                print(f"   Users counted: {response.get('users')}")
+
+        # Bounds must fall on experience bucket edges
+        success2, response2 = self.run_test(
+            "Skill Gap Analytics (Off-Edge Bound)",
+            "GET",
+            "analytics/skill-gaps",
+            400,
+            params={"role": "Data Scientist", "max_experience_years": 4}
+        )
+
+        return success and success2
+
+    def test_unknown_skills(self):
+        """Test unknown skill/role term listing"""
+        success, response = self.run_test(
+            "Unknown Skill Terms",
+            "GET",
+            "skills/unknown",
+            200,
+            params={"kind": "skill", "limit": 10}
+        )
+
+        if success and isinstance(response, list):
+            print(f"   Retrieved {len(response)} unknown terms")
+
+        return success
+
+    def test_batch_recommendations(self):
+        """Test batched recommendation generation"""
+        if not self.test_user_id:
+            print("❌ Skipping - No user ID available")
+            return False
+
+        batch_request = {"user_ids": [self.test_user_id, "invalid-id"]}
+
+        success, response = self.run_test(
+            "Batch Career Recommendations",
+            "POST",
+            "recommendations/batch",
+            200,
+            data=batch_request
+        )
+
+        if success:
+            required_fields = ['recommendations', 'failed', 'not_found']
+            missing_fields = [field for field in required_fields if field not in response]
+            if missing_fields:
+                print(f"   ⚠️  Missing fields in batch result: {missing_fields}")
+            elif response['not_found'] != ["invalid-id"]:
+                print(f"   ⚠️  Unexpected not_found: {response['not_found']}")
+            else:
+                print(f"   Generated for {len(response['recommendations'])} users, failed: {response['failed']}")
+
+        return success
+
     def test_error_handling(self):
         """Test error handling for invalid requests"""
         print(f"\n🔍 Testing Error Handling...")
@@ -304,6 +437,21 @@ def main():
     
     # Learning resources test
     test_results.append(tester.test_learning_resources())
+
+    # Dashboard test
+    test_results.append(tester.test_dashboard())
+
+    # Chat export tests
+    test_results.append(tester.test_chat_export())
+
+    # Skill gap analytics tests
+    test_results.append(tester.test_skill_gap_analytics())
+
+    # Unknown skill terms test
+    test_results.append(tester.test_unknown_skills())
+
+    # Batch recommendations test
+    test_results.append(tester.test_batch_recommendations())
     
     # Error handling tests
     test_results.append(tester.test_error_handling())
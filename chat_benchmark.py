@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Mentor chat throughput benchmark: HTTP POST /api/chat vs the /api/ws/chat WebSocket.
+
+Run it against a single uvicorn worker to get messages/sec per worker, e.g.
+
+    cd backend && uvicorn server:app --workers 1 --port 8001
+    python chat_benchmark.py --base-url http://localhost:8001 --messages 200 --concurrency 8
+
+Each HTTP message opens a new connection (as the browser does without keep-alive)
+unless --http-keepalive is passed. The WebSocket run sends the same messages over one
+socket, spread across --concurrency conversation threads. LLM latency dominates both
+paths; run the server with an invalid EMERGENT_LLM_KEY (every reply is then the
+fallback) to compare transport and per-message server overhead only.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+import websockets
+
+
+async def create_user(base_url):
+    async with httpx.AsyncClient() as client:
+        response = await client.post(f"{base_url}/api/profile", json={
+            "name": "Benchmark User",
+            "email": "bench@example.com",
+            "education": "Bachelor's in Computer Science",
+            "current_role": "Software Developer",
+            "experience_years": 3,
+            "skills": ["Python", "JavaScript", "SQL"],
+            "career_goals": ["Become a Data Scientist"],
+        })
+        response.raise_for_status()
+        return response.json()["id"]
+
+
+async def bench_http(base_url, user_id, messages, concurrency, keepalive):
+    queue = asyncio.Queue()
+    for i in range(messages):
+        queue.put_nowait(f"Benchmark question {i}: how do I get better at SQL?")
+
+    shared = httpx.AsyncClient(timeout=120) if keepalive else None
+
+    async def worker():
+        while not queue.empty():
+            message = queue.get_nowait()
+            payload = {"user_id": user_id, "message": message}
+            if shared:
+                response = await shared.post(f"{base_url}/api/chat", json=payload)
+            else:
+                async with httpx.AsyncClient(timeout=120) as client:
+                    response = await client.post(f"{base_url}/api/chat", json=payload)
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    if shared:
+        await shared.aclose()
+    return elapsed
+
+
+async def bench_websocket(base_url, user_id, messages, concurrency):
+    ws_url = base_url.replace("http://", "ws://").replace("https://", "wss://")
+    async with websockets.connect(f"{ws_url}/api/ws/chat?user_id={user_id}", max_size=None) as ws:
+        ready = json.loads(await ws.recv())
+        assert ready["type"] == "ready", ready
+
+        started = time.perf_counter()
+        for i in range(messages):
+            await ws.send(json.dumps({
+                "type": "message",
+                "thread_id": f"thread-{i % concurrency}",
+                "message": f"Benchmark question {i}: how do I get better at SQL?",
+            }))
+
+        done = 0
+        while done < messages:
+            frame = json.loads(await ws.recv())
+            if frame["type"] == "ping":
+                await ws.send(json.dumps({"type": "pong"}))
+            elif frame["type"] == "done":
+                done += 1
+            elif frame["type"] == "error":
+                raise RuntimeError(frame)
+        return time.perf_counter() - started
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8001")
+    parser.add_argument("--user-id", help="existing profile id (one is created if omitted)")
+    parser.add_argument("--messages", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--http-keepalive", action="store_true")
+    args = parser.parse_args()
+
+    user_id = args.user_id or await create_user(args.base_url)
+    print(f"🧪 {args.messages} messages, concurrency {args.concurrency}, user {user_id}")
+
+    http_elapsed = await bench_http(args.base_url, user_id, args.messages, args.concurrency, args.http_keepalive)
+    print(f"HTTP POST /api/chat: {args.messages / http_elapsed:8.1f} msg/s ({http_elapsed:.2f}s)")
+
+    ws_elapsed = await bench_websocket(args.base_url, user_id, args.messages, args.concurrency)
+    print(f"WebSocket /api/ws/chat: {args.messages / ws_elapsed:8.1f} msg/s ({ws_elapsed:.2f}s)")
+
+    print(f"📊 WebSocket speedup: {http_elapsed / ws_elapsed:.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
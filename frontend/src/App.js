@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from "react";
+import React, { useState, useEffect, useRef } from "react";
 import "./App.css";
 import { BrowserRouter, Routes, Route, useNavigate } from "react-router-dom";
 import axios from "axios";
@@ -563,6 +563,8 @@ const Dashboard = () => {
   const [loading, setLoading] = useState(false);
   const [activeTab, setActiveTab] = useState("overview");
   const [learningResources, setLearningResources] = useState([]);
+  // Idempotency keys of requests still in flight, so a double click reuses the same key
+  const inFlightKeys = useRef({});
   
   const { isListening, transcript, startListening, stopListening, isSupported } = useVoiceRecognition();
 
@@ -584,34 +586,43 @@ const Dashboard = () => {
 
   const loadUserData = async (userId) => {
     try {
-      // Load user profile
-      const profileResponse = await axios.get(`${API}/profile/${userId}`);
-      setUser(profileResponse.data);
+      // Load profile, learning resources, chat history and latest results in one request
+      const response = await axios.get(`${API}/dashboard/${userId}`);
+      const dashboard = response.data;
 
-      // Load learning resources
-      const resourcesResponse = await axios.get(`${API}/learning-resources/${userId}`);
-      setLearningResources(resourcesResponse.data);
-
-      // Load chat history
-      const chatResponse = await axios.get(`${API}/chat/${userId}`);
-      setChatMessages(chatResponse.data.reverse());
+      setUser(dashboard.profile);
+      setLearningResources(dashboard.learning_resources);
+      setChatMessages(dashboard.chat_history.reverse());
+      setRecommendations(dashboard.recommendations);
+      setSkillGapAnalysis(dashboard.skill_gap_analysis);
     } catch (error) {
       console.error('Error loading user data:', error);
     }
   };
 
+  const idempotencyHeaders = (action) => {
+    if (!inFlightKeys.current[action]) {
+      inFlightKeys.current[action] = window.crypto?.randomUUID
+        ? window.crypto.randomUUID()
+        : `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+    }
+    return { headers: { 'Idempotency-Key': inFlightKeys.current[action] } };
+  };
+
   const generateRecommendations = async () => {
     if (!user) return;
     
+    const action = `recommendations:${user.id}`;
     setLoading(true);
     try {
-      const response = await axios.post(`${API}/recommendations/${user.id}`);
+      const response = await axios.post(`${API}/recommendations/${user.id}`, null, idempotencyHeaders(action));
       setRecommendations(response.data);
       toast("Career recommendations generated!");
     } catch (error) {
       toast("Error generating recommendations");
       console.error(error);
     } finally {
+      delete inFlightKeys.current[action];
       setLoading(false);
     }
   };
@@ -619,15 +630,21 @@ const Dashboard = () => {
   const analyzeSkillGap = async (targetRole) => {
     if (!user) return;
     
+    const action = `skill-gap:${user.id}:${targetRole}`;
     setLoading(true);
     try {
-      const response = await axios.post(`${API}/skill-gap-analysis/${user.id}?target_role=${encodeURIComponent(targetRole)}`);
+      const response = await axios.post(
+        `${API}/skill-gap-analysis/${user.id}?target_role=${encodeURIComponent(targetRole)}`,
+        null,
+        idempotencyHeaders(action)
+      );
       setSkillGapAnalysis(response.data);
       toast("Skill gap analysis completed!");
     } catch (error) {
       toast("Error analyzing skill gap");
       console.error(error);
     } finally {
+      delete inFlightKeys.current[action];
       setLoading(false);
     }
   };
@@ -649,17 +666,21 @@ const Dashboard = () => {
     };
     setChatMessages(prev => [...prev, newUserMessage]);
 
+    // Each chat message is its own action; the key only matters for transport retries
+    const action = `chat:${newUserMessage.id}`;
     try {
       const response = await axios.post(`${API}/chat`, {
         user_id: user.id,
         message: userMessage
-      });
+      }, idempotencyHeaders(action));
       
       // Add AI response to chat
       setChatMessages(prev => [...prev, { ...response.data, isUser: false }]);
     } catch (error) {
       toast("Error sending message");
       console.error(error);
+    } finally {
+      delete inFlightKeys.current[action];
     }
   };
 
@@ -0,0 +1,36 @@
+"""Backfill career recommendations for profiles that have none yet.
+
+    python scripts/backfill_recommendations.py [limit]
+
+Uses the server's database, LLM routing and batch generator settings (backend/.env),
+so run it where the API would run. Larger runs than the /api/recommendations/batch
+endpoint accepts belong here.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from batch_generation import backfill_recommendations  # noqa: E402
+from server import _store_recommendations, batch_generator, client, db  # noqa: E402
+
+
+async def main(limit):
+    try:
+        result = await backfill_recommendations(
+            db,
+            batch_generator,
+            lambda user_id, data: _store_recommendations(user_id, data, {"source": "llm_batch"}),
+            limit=limit,
+        )
+        print(f"Backfilled recommendations: {result}")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 or (sys.argv[1:] and not sys.argv[1].isdigit()):
+        print("usage: python scripts/backfill_recommendations.py [limit]")
+        sys.exit(1)
+    asyncio.run(main(int(sys.argv[1]) if sys.argv[1:] else None))
@@ -0,0 +1,47 @@
+#!/usr/bin/env bash
+# Local three-node MongoDB replica set for exercising read-preference routing.
+#
+#   scripts/mongo_replica_set.sh start
+#   MONGO_URL="mongodb://localhost:27117,localhost:27118,localhost:27119/?replicaSet=tutobit-rs" \
+#       uvicorn server:app --port 8001        # from backend/
+#   scripts/mongo_replica_set.sh stop
+#
+# GET /api/metrics shows how many reads went to secondaries vs. the primary
+# ("mongo_read_routing"). Requires mongod and mongosh on PATH.
+set -euo pipefail
+
+REPL_SET="tutobit-rs"
+PORTS=(27117 27118 27119)
+DATA_ROOT="${DATA_ROOT:-/tmp/tutobit-replica-set}"
+
+start() {
+    for port in "${PORTS[@]}"; do
+        mkdir -p "$DATA_ROOT/$port"
+        mongod --replSet "$REPL_SET" --port "$port" --bind_ip localhost \
+            --dbpath "$DATA_ROOT/$port" --logpath "$DATA_ROOT/$port.log" --fork
+    done
+
+    mongosh --quiet --port "${PORTS[0]}" --eval "
+        rs.initiate({
+            _id: '$REPL_SET',
+            members: [
+                { _id: 0, host: 'localhost:${PORTS[0]}', priority: 2 },
+                { _id: 1, host: 'localhost:${PORTS[1]}' },
+                { _id: 2, host: 'localhost:${PORTS[2]}' }
+            ]
+        })
+    "
+    echo "Replica set $REPL_SET starting on ports ${PORTS[*]}"
+}
+
+stop() {
+    for port in "${PORTS[@]}"; do
+        mongosh --quiet --port "$port" --eval "db.getSiblingDB('admin').shutdownServer()" || true
+    done
+}
+
+case "${1:-}" in
+    start) start ;;
+    stop) stop ;;
+    *) echo "usage: $0 start|stop" >&2; exit 1 ;;
+esac
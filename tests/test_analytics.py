@@ -0,0 +1,161 @@
+import asyncio
+
+import pytest
+
+from analytics import SkillGapRollups, buckets_between, experience_bucket, rollup_role
+
+
+@pytest.mark.parametrize("years,bucket", [(None, "<1"), (0, "<1"), (1, "1-2"), (2, "1-2"), (4, "3-4"), (9, "5-9"), (30, "10+")])
+def test_experience_bucket(years, bucket):
+    assert experience_bucket(years) == bucket
+
+
+def test_buckets_between_edges():
+    assert buckets_between(None, None) == ["<1", "1-2", "3-4", "5-9", "10+"]
+    assert buckets_between(None, 3) == ["<1", "1-2"]
+    assert buckets_between(3, 10) == ["3-4", "5-9"]
+    assert buckets_between(10, None) == ["10+"]
+
+
+@pytest.mark.parametrize("min_years,max_years", [(None, 4), (2, None), (5, 5), (5, 3)])
+def test_buckets_between_rejects_bounds_off_bucket_edges(min_years, max_years):
+    with pytest.raises(ValueError):
+        buckets_between(min_years, max_years)
+
+
+def test_rollup_role_prefers_canonical_role():
+    assert rollup_role({"target_role": "data scientist", "target_role_canonical": "Data Scientist"}) == "Data Scientist"
+    assert rollup_role({"target_role": "Head of Data Science", "target_role_canonical": None}) == "Head of Data Science"
+
+
+def matches(doc, query):
+    for field, condition in query.items():
+        if field == "$or":
+            if not any(matches(doc, branch) for branch in condition):
+                return False
+        elif isinstance(condition, dict) and "$ne" in condition:
+            if doc.get(field) == condition["$ne"]:
+                return False
+        elif doc.get(field) != condition:
+            return False
+    return True
+
+
+class FakeAnalyses:
+    def __init__(self, docs):
+        self.docs = docs
+        self.fail_updates = False
+
+    async def find_one(self, query):
+        return next((dict(doc) for doc in self.docs if matches(doc, query)), None)
+
+    async def update_one(self, query, update):
+        if self.fail_updates:
+            raise RuntimeError("write failed")
+        for doc in self.docs:
+            if matches(doc, query):
+                doc.update(update["$set"])
+                return
+
+
+class FakeCounts:
+    def __init__(self):
+        self.docs = {}
+        self.fail = False
+
+    async def bulk_write(self, operations, ordered=True):
+        if self.fail:
+            raise RuntimeError("bulk write failed")
+        for operation in operations:
+            doc = self.docs.setdefault(operation._filter["_id"], {})
+            doc.update(operation._doc["$set"])
+            for field, delta in operation._doc["$inc"].items():
+                doc[field] = doc.get(field, 0) + delta
+
+
+class FakeDatabase:
+    def __init__(self, analyses):
+        self.skill_gap_analyses = FakeAnalyses(analyses)
+        self.collections = {"skill_gap_rollups": FakeCounts(), "skill_gap_cohorts": FakeCounts()}
+
+    def __getitem__(self, name):
+        return self.collections[name]
+
+    def counts(self):
+        skills = {key: doc["count"] for key, doc in self["skill_gap_rollups"].docs.items() if doc["count"]}
+        users = {key: doc["users"] for key, doc in self["skill_gap_cohorts"].docs.items() if doc["users"]}
+        return skills, users
+
+
+def analysis(analysis_id, missing_skills, bucket="1-2"):
+    return {
+        "id": analysis_id, "user_id": "u1", "target_role": "data scientist", "target_role_canonical": "Data Scientist",
+        "experience_bucket": bucket, "missing_skills": missing_skills,
+    }
+
+
+def test_fold_replaces_the_previous_analysis_exactly_once():
+    async def scenario():
+        a = analysis("a", ["SQL", "Statistics"])
+        b = analysis("b", ["Statistics", "Tableau"], bucket="3-4")
+        db = FakeDatabase([a, b])
+        rollups = SkillGapRollups(db)
+
+        await rollups.fold(a)
+        await rollups.fold(b)
+        assert db.counts() == (
+            {"Data Scientist|3-4|Statistics": 1, "Data Scientist|3-4|Tableau": 1},
+            {"Data Scientist|3-4": 1},
+        )
+        assert (a["rolled_up"], b["rolled_up"]) == (False, True)
+
+        # Folding again finds B as the counted one, so A is not subtracted a second time
+        c = analysis("c", ["Tableau"], bucket="3-4")
+        db.skill_gap_analyses.docs.append(c)
+        await rollups.fold(c)
+        assert db.counts() == ({"Data Scientist|3-4|Tableau": 1}, {"Data Scientist|3-4": 1})
+
+    asyncio.run(scenario())
+
+
+def test_fold_does_not_subtract_an_analysis_that_was_never_counted():
+    async def scenario():
+        legacy = analysis("old", ["SQL"])
+        new = analysis("new", ["Python"])
+        db = FakeDatabase([legacy, new])
+
+        await SkillGapRollups(db).fold(new)
+        assert db.counts() == ({"Data Scientist|1-2|Python": 1}, {"Data Scientist|1-2": 1})
+        assert "rolled_up" not in legacy
+
+    asyncio.run(scenario())
+
+
+def test_failed_marking_leaves_counts_untouched():
+    async def scenario():
+        a = analysis("a", ["SQL"])
+        db = FakeDatabase([a])
+        db.skill_gap_analyses.fail_updates = True
+
+        with pytest.raises(RuntimeError):
+            await SkillGapRollups(db).fold(a)
+        assert db.counts() == ({}, {})
+
+    asyncio.run(scenario())
+
+
+def test_failed_count_update_moves_the_marker_back():
+    async def scenario():
+        a = analysis("a", ["SQL"])
+        b = analysis("b", ["Python"])
+        db = FakeDatabase([a, b])
+        rollups = SkillGapRollups(db)
+        await rollups.fold(a)
+
+        db["skill_gap_rollups"].fail = True
+        with pytest.raises(RuntimeError):
+            await rollups.fold(b)
+        assert (a["rolled_up"], b["rolled_up"]) == (True, False)
+        assert db.counts() == ({"Data Scientist|1-2|SQL": 1}, {"Data Scientist|1-2": 1})
+
+    asyncio.run(scenario())
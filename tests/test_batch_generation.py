@@ -0,0 +1,200 @@
+import asyncio
+import json
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+import server
+from batch_generation import (
+    RECOMMENDATION_FIELDS,
+    AdaptiveBatchSizer,
+    BatchRecommendationGenerator,
+    backfill_recommendations,
+    compact_profile_summary,
+)
+
+
+def recommendation(title):
+    rec = {field: "x" for field in RECOMMENDATION_FIELDS}
+    rec["job_title"] = title
+    return rec
+
+
+def prompt_profiles(prompt):
+    """{ref: education} for the profile lines in a batch prompt"""
+    return dict(re.findall(r"^(u\d+) \| education: ([^|]+?) \|", prompt, flags=re.MULTILINE))
+
+
+class FakeLLM:
+    """Answers batch prompts; profiles are tagged through their education field.
+
+    ``max_profiles`` simulates truncation: bigger batches get cut-off JSON.
+    Profiles educated in "skip" are left out of the answer, "fail" ones raise.
+    """
+
+    def __init__(self, max_profiles=100):
+        self.max_profiles = max_profiles
+        self.batches = []
+
+    async def __call__(self, prompt):
+        profiles = prompt_profiles(prompt)
+        self.batches.append(sorted(profiles.values()))
+        if any(education == "fail" for education in profiles.values()):
+            raise RuntimeError("upstream error")
+        answer = {
+            ref: [recommendation(f"role for {education}")]
+            for ref, education in profiles.items()
+            if education != "skip"
+        }
+        text = json.dumps(answer)
+        return text if len(profiles) <= self.max_profiles else text[:len(text) // 2]
+
+
+def profiles(*educations):
+    return [{"id": f"id-{education}", "education": education, "skills": ["Python"]} for education in educations]
+
+
+def test_compact_summary_has_no_personal_details():
+    line = compact_profile_summary("u3", {"name": "Ada", "email": "ada@example.com", "education": "BSc", "skills": ["SQL"]})
+    assert line.startswith("u3 | education: BSc | ")
+    assert "skills: SQL" in line
+    assert "Ada" not in line and "example.com" not in line
+
+
+def test_results_are_split_back_per_profile():
+    async def scenario():
+        llm = FakeLLM()
+        generator = BatchRecommendationGenerator(llm, AdaptiveBatchSizer(initial_size=4))
+        results, failed = await generator.generate(profiles("a", "b", "c"))
+
+        assert failed == []
+        assert {user_id: recs[0]["job_title"] for user_id, recs in results.items()} == {
+            "id-a": "role for a", "id-b": "role for b", "id-c": "role for c",
+        }
+        assert llm.batches == [["a", "b", "c"]]
+        assert generator.describe()["profiles_per_call"] == 3
+
+    asyncio.run(scenario())
+
+
+def test_truncated_response_is_retried_as_halves():
+    async def scenario():
+        llm = FakeLLM(max_profiles=2)
+        sizer = AdaptiveBatchSizer(initial_size=4)
+        generator = BatchRecommendationGenerator(llm, sizer)
+        results, failed = await generator.generate(profiles("a", "b", "c", "d"))
+
+        assert failed == []
+        assert set(results) == {"id-a", "id-b", "id-c", "id-d"}
+        assert llm.batches == [["a", "b", "c", "d"], ["a", "b"], ["c", "d"]]
+        assert generator.stats["parse_failures"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_profiles_missing_from_a_response_are_retried():
+    async def scenario():
+        llm = FakeLLM()
+        generator = BatchRecommendationGenerator(llm, AdaptiveBatchSizer(initial_size=4))
+        results, failed = await generator.generate(profiles("a", "skip"))
+
+        # Retried on its own; omitted again, so it is given up on
+        assert set(results) == {"id-a"}
+        assert failed == ["id-skip"]
+        assert llm.batches == [["a", "skip"], ["skip"]]
+
+    asyncio.run(scenario())
+
+
+def test_failed_call_marks_only_that_batch():
+    async def scenario():
+        llm = FakeLLM()
+        generator = BatchRecommendationGenerator(llm, AdaptiveBatchSizer(initial_size=1, max_size=1))
+        results, failed = await generator.generate(profiles("a", "fail", "b"))
+
+        assert set(results) == {"id-a", "id-b"}
+        assert failed == ["id-fail"]
+        assert generator.stats["call_failures"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_sizer_grows_additively_and_halves_on_failure():
+    sizer = AdaptiveBatchSizer(token_budget=10 ** 6, initial_size=4, max_size=6)
+    sizer.on_success(4, 4000)
+    assert sizer.size == 5
+    sizer.on_success(5, 5000)
+    sizer.on_success(6, 6000)
+    assert sizer.size == 6
+    sizer.on_failure(6)
+    assert sizer.size == 3
+    sizer.on_failure(1)
+    assert sizer.size == 1
+
+
+def test_sizer_respects_the_token_budget():
+    sizer = AdaptiveBatchSizer(token_budget=5000, initial_size=20, max_size=20, output_tokens_per_profile=1000)
+    room = sizer.token_budget - sizer.prefix_tokens
+    assert sizer.next_size(summary_tokens=100) == room // 1100
+    assert sizer.next_size(summary_tokens=10 ** 6) == 1
+
+    # Larger observed completions shrink the cap
+    before = sizer.budget_cap(100)
+    sizer.on_success(1, 3000)
+    assert sizer.output_tokens_per_profile == pytest.approx(1600)
+    assert sizer.budget_cap(100) < before
+
+
+class AsyncRows(list):
+    async def __aiter__(self):
+        for row in self:
+            yield row
+
+    async def to_list(self, length):
+        return list(self)
+
+
+class FakeBackfillDatabase:
+    """user_profiles and the user ids that already have career_recommendations"""
+
+    def __init__(self, profiles, have):
+        self.user_profiles = self
+        self.career_recommendations = self
+        self.profiles = profiles
+        self.have = have
+
+    async def distinct(self, field):
+        return list(self.have)
+
+    def find(self, query, projection=None):
+        ids = query.get("id", {}).get("$in")
+        return AsyncRows(p for p in self.profiles if ids is None or p["id"] in ids)
+
+
+def test_backfill_generates_only_for_profiles_without_recommendations():
+    async def scenario():
+        db = FakeBackfillDatabase(profiles("a", "b", "fail", "c", "d"), have={"id-a"})
+        stored = {}
+
+        async def store(user_id, data):
+            if user_id == "id-d":
+                raise RuntimeError("write failed")
+            stored[user_id] = data
+
+        generator = BatchRecommendationGenerator(FakeLLM(), AdaptiveBatchSizer(initial_size=1, max_size=1))
+        totals = await backfill_recommendations(db, generator, store, chunk_size=2)
+
+        assert totals == {"profiles": 4, "generated": 2, "failed": 2}
+        assert set(stored) == {"id-b", "id-c"}
+
+        limited = await backfill_recommendations(db, generator, store, limit=1)
+        assert limited["profiles"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_batch_endpoint_rejects_more_users_than_fit_in_a_request():
+    user_ids = [f"u{i}" for i in range(server.RECOMMENDATIONS_BATCH_MAX_USERS + 1)]
+    response = TestClient(server.app).post("/api/recommendations/batch", json={"user_ids": user_ids})
+    assert response.status_code == 422
@@ -0,0 +1,108 @@
+import csv
+import gzip
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+import server
+
+MESSAGES = [
+    {"id": f"m{day}", "user_id": "u1", "message": f"question {day}", "response": f"answer {day}",
+     "skills_mentioned": ["Python"], "timestamp": f"2024-05-0{day}T12:00:00+00:00"}
+    for day in (1, 2, 3)
+]
+
+
+class FakeCursor:
+    def __init__(self, docs, query):
+        self.docs = docs
+        self.query = query
+
+    def sort(self, field, direction):
+        self.docs = sorted(self.docs, key=lambda doc: doc[field], reverse=direction < 0)
+        return self
+
+    def batch_size(self, size):
+        return self
+
+    async def __aiter__(self):
+        for doc in self.docs:
+            yield dict(doc)
+
+
+class FakeMessages:
+    """chat_messages supporting the export query: user_id plus a string timestamp range"""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.queries = []
+
+    def find(self, query, projection=None):
+        self.queries.append(query)
+        timestamp = query.get("timestamp", {})
+        docs = [
+            doc for doc in self.docs
+            if doc["user_id"] == query["user_id"]
+            and doc["timestamp"] >= timestamp.get("$gte", "")
+            and doc["timestamp"] < timestamp.get("$lt", "\uffff")
+        ]
+        return FakeCursor(docs, query)
+
+
+@pytest.fixture
+def messages(monkeypatch):
+    collection = FakeMessages(MESSAGES)
+    monkeypatch.setattr(server.reads, "collection", lambda name, endpoint, user_id=None: collection)
+    return collection
+
+
+@pytest.fixture
+def client():
+    # No context manager: the startup hooks would try to reach MongoDB
+    return TestClient(server.app)
+
+
+def ndjson(text):
+    return [json.loads(line) for line in text.splitlines()]
+
+
+def test_ndjson_export_is_oldest_first(client, messages):
+    response = client.get("/api/chat/u1/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["content-disposition"] == 'attachment; filename="chat-u1.ndjson"'
+    assert [message["id"] for message in ndjson(response.text)] == ["m1", "m2", "m3"]
+
+
+def test_csv_export(client, messages):
+    response = client.get("/api/chat/u1/export", params={"format": "csv"})
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert response.headers["content-disposition"] == 'attachment; filename="chat-u1.csv"'
+    assert [row["message"] for row in rows] == ["question 1", "question 2", "question 3"]
+    assert rows[0]["skills_mentioned"] == "Python"
+
+
+def test_since_and_until_are_a_utc_string_range(client, messages):
+    response = client.get("/api/chat/u1/export", params={"since": "2024-05-02T14:00:00+02:00", "until": "2024-05-03T00:00:00"})
+    assert messages.queries[-1]["timestamp"] == {"$gte": "2024-05-02T12:00:00+00:00", "$lt": "2024-05-03T00:00:00+00:00"}
+    assert [message["id"] for message in ndjson(response.text)] == ["m2"]
+
+
+def test_gzip_export(client, messages):
+    response = client.get("/api/chat/u1/export", params={"gzip": "true"}, headers={"Accept-Encoding": "identity"})
+    assert response.headers["content-type"] == "application/gzip"
+    assert response.headers["content-disposition"] == 'attachment; filename="chat-u1.ndjson.gz"'
+    assert "content-encoding" not in response.headers
+    assert [message["id"] for message in ndjson(gzip.decompress(response.content).decode())] == ["m1", "m2", "m3"]
+
+
+def test_file_name_is_sanitised(client, messages):
+    response = client.get("/api/chat/a%22b%0D%0Ac/export")
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="chat-a_b_c.ndjson"'
+
+
+def test_unknown_format_is_rejected(client, messages):
+    assert client.get("/api/chat/u1/export", params={"format": "xml"}).status_code == 422
@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI, WebSocket
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocketDisconnect
+
+from chat_ws import ChatSocketSession
+
+DELAYS = {"slow": 0.3, "fast": 0.0}
+
+
+async def handle_message(session, thread_id, text):
+    if text == "boom":
+        raise RuntimeError("connection refused: mongodb://10.0.0.5:27017")
+    await asyncio.sleep(DELAYS[text])
+    await session.send({"type": "done", "thread_id": thread_id, "message": text})
+
+
+async def reload_profile(session):
+    session.profile = {"id": session.user_id}
+
+
+def socket_client(**options):
+    app = FastAPI()
+
+    @app.websocket("/ws")
+    async def chat(websocket: WebSocket):
+        await websocket.accept()
+        await ChatSocketSession(websocket, "u1", handle_message, reload_profile, **options).run()
+
+    return TestClient(app)
+
+
+def receive_until_done(ws, count):
+    frames = []
+    while len(frames) < count:
+        frame = ws.receive_json()
+        if frame["type"] != "ping":
+            frames.append(frame)
+    return frames
+
+
+def test_threads_are_answered_concurrently():
+    with socket_client().websocket_connect("/ws") as ws:
+        assert ws.receive_json() == {"type": "ready", "user_id": "u1"}
+        ws.send_json({"type": "message", "thread_id": "a", "message": "slow"})
+        ws.send_json({"type": "message", "thread_id": "b", "message": "fast"})
+        frames = receive_until_done(ws, 2)
+
+    assert [frame["thread_id"] for frame in frames] == ["b", "a"]
+
+
+def test_messages_on_one_thread_are_answered_in_order():
+    with socket_client().websocket_connect("/ws") as ws:
+        ws.receive_json()
+        ws.send_json({"type": "message", "thread_id": "a", "message": "slow"})
+        ws.send_json({"type": "message", "thread_id": "a", "message": "fast"})
+        frames = receive_until_done(ws, 2)
+
+    assert [frame["message"] for frame in frames] == ["slow", "fast"]
+
+
+@pytest.mark.parametrize("raw", ["not json", "[1, 2]"])
+def test_frames_that_are_not_json_objects_are_rejected(raw):
+    with socket_client().websocket_connect("/ws") as ws:
+        ws.receive_json()
+        ws.send_text(raw)
+        assert ws.receive_json() == {"type": "error", "detail": "Frames must be JSON objects"}
+        # The connection stays usable
+        ws.send_json({"type": "message", "thread_id": "a", "message": "fast"})
+        assert ws.receive_json()["type"] == "done"
+
+
+def test_thread_limit_per_connection():
+    with socket_client(max_threads=2).websocket_connect("/ws") as ws:
+        ws.receive_json()
+        for thread_id in ("a", "b"):
+            ws.send_json({"type": "message", "thread_id": thread_id, "message": "fast"})
+        receive_until_done(ws, 2)
+
+        ws.send_json({"type": "message", "thread_id": "c", "message": "fast"})
+        assert ws.receive_json() == {"type": "error", "thread_id": "c", "detail": "Too many threads on this connection"}
+        # Known threads keep working
+        ws.send_json({"type": "message", "thread_id": "a", "message": "fast"})
+        assert ws.receive_json()["thread_id"] == "a"
+
+
+def test_handler_errors_do_not_leak_details():
+    with socket_client().websocket_connect("/ws") as ws:
+        ws.receive_json()
+        ws.send_json({"type": "message", "thread_id": "a", "message": "boom"})
+        frame = ws.receive_json()
+
+    assert frame["type"] == "error" and frame["thread_id"] == "a"
+    assert "mongodb" not in frame["detail"] and "refused" not in frame["detail"]
+
+
+def test_closes_when_pings_go_unanswered():
+    with socket_client(heartbeat_seconds=0.05).websocket_connect("/ws") as ws:
+        ws.receive_json()
+        with pytest.raises(WebSocketDisconnect) as closed:
+            while True:
+                assert ws.receive_json() == {"type": "ping"}
+
+    assert closed.value.code == 1001
+
+
+def test_closes_an_idle_connection_that_answers_pings():
+    with socket_client(heartbeat_seconds=0.05, idle_timeout_seconds=0.2).websocket_connect("/ws") as ws:
+        ws.receive_json()
+        pings = 0
+        with pytest.raises(WebSocketDisconnect) as closed:
+            while True:
+                assert ws.receive_json() == {"type": "ping"}
+                pings += 1
+                ws.send_json({"type": "pong"})
+
+    assert closed.value.code == 1000
+    assert pings >= 2
@@ -0,0 +1,142 @@
+import asyncio
+
+import pytest
+
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+
+
+async def ok():
+    return "ok"
+
+
+async def fail():
+    raise RuntimeError("boom")
+
+
+def make_breaker(**kwargs):
+    options = dict(window=4, min_calls=4, failure_rate_threshold=0.5, open_seconds=0.05, half_open_probes=2)
+    options.update(kwargs)
+    return CircuitBreaker("test", **options)
+
+
+async def trip(breaker):
+    for _ in range(breaker.min_calls):
+        with pytest.raises(RuntimeError):
+            await breaker.call(fail)
+    assert breaker.state == OPEN
+
+
+def test_opens_on_failure_rate_and_rejects():
+    async def scenario():
+        breaker = make_breaker()
+        await trip(breaker)
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(ok)
+        assert breaker.counters["rejected"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_half_open_probes_close_the_breaker():
+    async def scenario():
+        breaker = make_breaker()
+        await trip(breaker)
+        await asyncio.sleep(0.06)
+        assert await breaker.call(ok) == "ok"
+        assert breaker.state == HALF_OPEN
+        assert await breaker.call(ok) == "ok"
+        assert breaker.state == CLOSED
+
+    asyncio.run(scenario())
+
+
+def test_failed_probe_reopens():
+    async def scenario():
+        breaker = make_breaker()
+        await trip(breaker)
+        await asyncio.sleep(0.06)
+        with pytest.raises(RuntimeError):
+            await breaker.call(fail)
+        assert breaker.state == OPEN
+
+    asyncio.run(scenario())
+
+
+def test_half_open_limits_concurrent_probes():
+    async def scenario():
+        breaker = make_breaker(half_open_probes=1)
+        await trip(breaker)
+        await asyncio.sleep(0.06)
+        release = asyncio.Event()
+
+        async def slow_ok():
+            await release.wait()
+            return "ok"
+
+        probe = asyncio.create_task(breaker.call(slow_ok))
+        await asyncio.sleep(0)
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(ok)
+        release.set()
+        assert await probe == "ok"
+        assert breaker.state == CLOSED
+
+    asyncio.run(scenario())
+
+
+def test_straggler_from_closed_state_is_not_a_probe():
+    async def scenario():
+        breaker = make_breaker(slow_call_seconds=10)
+        release = asyncio.Event()
+
+        async def straggler():
+            await release.wait()
+            return "late"
+
+        # Admitted while closed, finishes after the breaker has gone half-open
+        late_success = asyncio.create_task(breaker.call(straggler))
+        await asyncio.sleep(0)
+        await trip(breaker)
+        await asyncio.sleep(0.06)
+        assert await breaker.call(ok) == "ok"
+        assert breaker.state == HALF_OPEN
+
+        release.set()
+        assert await late_success == "late"
+        # Still one real probe success of two, and only one more probe slot
+        assert breaker.state == HALF_OPEN
+        assert breaker._probe_successes == 1
+        assert breaker._probes_in_flight == 0
+
+        assert await breaker.call(ok) == "ok"
+        assert breaker.state == CLOSED
+
+    asyncio.run(scenario())
+
+
+def test_failing_straggler_does_not_reopen_half_open_breaker():
+    async def scenario():
+        breaker = make_breaker()
+        release = asyncio.Event()
+
+        async def straggler():
+            await release.wait()
+            raise RuntimeError("late timeout")
+
+        late_failure = asyncio.create_task(breaker.call(straggler))
+        await asyncio.sleep(0)
+        await trip(breaker)
+        await asyncio.sleep(0.06)
+        await breaker.call(ok)
+        assert breaker.state == HALF_OPEN
+
+        release.set()
+        with pytest.raises(RuntimeError):
+            await late_failure
+        assert breaker.state == HALF_OPEN
+        assert breaker.counters["failures"] == breaker.min_calls + 1
+
+        await breaker.call(ok)
+        assert breaker.state == CLOSED
+
+    asyncio.run(scenario())
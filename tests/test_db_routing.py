@@ -0,0 +1,90 @@
+import pytest
+from pymongo.read_preferences import Primary, SecondaryPreferred
+
+import db_routing
+from db_routing import MIN_MAX_STALENESS_SECONDS, ReadRouter, parse_read_preferences, pool_options
+
+
+class FakeDatabase:
+    """Returns (collection name, read preference or None for the default primary handle)"""
+
+    def __getitem__(self, name):
+        return name, None
+
+    def get_collection(self, name, read_preference=None):
+        return name, read_preference
+
+
+def test_parse_read_preferences():
+    spec = " get_profile=secondaryPreferred, get_dashboard = NEAREST,,export_chat_history=primary "
+    assert parse_read_preferences(spec) == {
+        "get_profile": "secondarypreferred",
+        "get_dashboard": "nearest",
+        "export_chat_history": "primary",
+    }
+    assert parse_read_preferences("") == {}
+
+
+@pytest.mark.parametrize("spec", ["get_profile=secondaryish", "get_profile", "get_profile="])
+def test_parse_read_preferences_rejects_unknown_modes(spec):
+    with pytest.raises(ValueError):
+        parse_read_preferences(spec)
+
+
+def test_pool_options_only_include_configured_settings():
+    assert pool_options(None, None, None) == {}
+    assert pool_options("50", "", "60000") == {"maxPoolSize": 50, "maxIdleTimeMS": 60000}
+    assert pool_options("50", "5", None) == {"maxPoolSize": 50, "minPoolSize": 5}
+
+
+def test_max_staleness_is_clamped_to_the_server_minimum():
+    router = ReadRouter(FakeDatabase(), {"get_profile": "secondarypreferred"}, max_staleness_seconds=10)
+    assert router.max_staleness_seconds == MIN_MAX_STALENESS_SECONDS
+    _, preference = router.collection("user_profiles", "get_profile")
+    assert preference.max_staleness == MIN_MAX_STALENESS_SECONDS
+
+
+def make_router(**kwargs):
+    return ReadRouter(FakeDatabase(), {"get_profile": "secondarypreferred", "get_chat_history": "primary"}, **kwargs)
+
+
+def test_listed_endpoint_reads_from_secondaries():
+    router = make_router(max_staleness_seconds=120)
+    name, preference = router.collection("user_profiles", "get_profile", "u1")
+    assert name == "user_profiles"
+    assert isinstance(preference, SecondaryPreferred)
+    assert preference.max_staleness == 120
+    assert router.stats["secondarypreferred"] == 1
+
+
+def test_explicit_primary_mode_has_no_staleness_bound():
+    _, preference = make_router().collection("chat_messages", "get_chat_history")
+    assert isinstance(preference, Primary)
+
+
+def test_unlisted_endpoint_reads_from_the_primary():
+    router = make_router()
+    assert router.collection("user_profiles", "create_profile", "u1") == ("user_profiles", None)
+    assert router.stats["primary"] == 1
+
+
+def test_user_stays_on_the_primary_after_a_write(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(db_routing.time, "monotonic", lambda: now[0])
+    router = make_router(stickiness_seconds=5)
+
+    router.note_write("u1")
+    assert router.collection("user_profiles", "get_profile", "u1") == ("user_profiles", None)
+    # Other users and anonymous reads are unaffected
+    assert router.collection("user_profiles", "get_profile", "u2")[1] is not None
+    assert router.collection("user_profiles", "get_profile")[1] is not None
+    assert router.describe()["sticky_users"] == 1
+
+    now[0] += 5.1
+    assert router.collection("user_profiles", "get_profile", "u1")[1] is not None
+    assert router.stats["sticky_primary"] == 1
+    assert router.describe()["sticky_users"] == 0
+
+
+def test_stickiness_defaults_to_the_staleness_bound():
+    assert make_router(max_staleness_seconds=150).stickiness_seconds == 150
@@ -0,0 +1,147 @@
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from http_caching import CompressionMiddleware, choose_encoding, conditional_json
+
+
+@pytest.mark.parametrize("header,available,expected", [
+    ("gzip, deflate, br", ("br", "gzip"), "br"),
+    ("gzip, deflate, br", ("gzip",), "gzip"),
+    ("br;q=0, gzip", ("br", "gzip"), "gzip"),
+    ("gzip;q=0", ("gzip",), None),
+    ("gzip;q=0, br;q=0", ("br", "gzip"), None),
+    ("gzip;q=1.0, br;q=0.5", ("br", "gzip"), "gzip"),
+    ("*", ("br", "gzip"), "br"),
+    ("*;q=0.5, br;q=0", ("br", "gzip"), "gzip"),
+    ("identity", ("br", "gzip"), None),
+    ("", ("gzip",), None),
+    ("GZIP;Q=0.8", ("gzip",), "gzip"),
+    ("gzip;q=abc", ("gzip",), None),
+])
+def test_choose_encoding_honours_q_values(header, available, expected):
+    assert choose_encoding(header, available) == expected
+
+
+UPDATED = datetime(2024, 5, 1, 12, 0, 0, 500000, tzinfo=timezone.utc)
+BIG = "x" * 4096
+
+
+def caching_app():
+    app = FastAPI()
+
+    @app.get("/doc")
+    async def doc(request: Request):
+        return conditional_json(request, {"value": 1}, last_modified=UPDATED)
+
+    return TestClient(app)
+
+
+def test_conditional_json_sets_validators():
+    response = caching_app().get("/doc")
+    assert response.status_code == 200
+    assert response.json() == {"value": 1}
+    assert response.headers["etag"].startswith('W/"')
+    assert response.headers["last-modified"] == "Wed, 01 May 2024 12:00:00 GMT"
+
+
+def test_if_none_match_returns_304():
+    client = caching_app()
+    etag = client.get("/doc").headers["etag"]
+
+    for header in (etag, etag.removeprefix("W/"), f'"other", {etag}', "*"):
+        response = client.get("/doc", headers={"If-None-Match": header})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+    assert client.get("/doc", headers={"If-None-Match": '"other"'}).status_code == 200
+
+
+def test_if_modified_since_returns_304_when_not_newer():
+    client = caching_app()
+    assert client.get("/doc", headers={"If-Modified-Since": "Wed, 01 May 2024 12:00:00 GMT"}).status_code == 304
+    assert client.get("/doc", headers={"If-Modified-Since": "Wed, 01 May 2024 11:59:59 GMT"}).status_code == 200
+    assert client.get("/doc", headers={"If-Modified-Since": "not a date"}).status_code == 200
+
+
+def test_if_none_match_takes_precedence_over_if_modified_since():
+    response = caching_app().get("/doc", headers={
+        "If-None-Match": '"other"',
+        "If-Modified-Since": "Wed, 01 May 2024 12:00:00 GMT",
+    })
+    assert response.status_code == 200
+
+
+def compression_app():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/small")
+    async def small():
+        return {"value": 1}
+
+    @app.get("/big")
+    async def big():
+        return {"value": BIG}
+
+    @app.get("/encoded")
+    async def encoded():
+        return Response(BIG.encode(), media_type="application/json", headers={"Content-Encoding": "identity"})
+
+    @app.get("/binary")
+    async def binary():
+        return Response(BIG.encode(), media_type="image/png")
+
+    @app.get("/stream")
+    async def stream():
+        async def lines():
+            for i in range(3):
+                yield f'{{"line": {i}}}\n'.encode()
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    @app.get("/text")
+    async def text():
+        return PlainTextResponse(BIG)
+
+    return TestClient(app)
+
+
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+def test_small_bodies_are_not_compressed():
+    response = compression_app().get("/small", headers=GZIP)
+    assert "content-encoding" not in response.headers
+    assert response.json() == {"value": 1}
+
+
+def test_large_json_is_compressed_with_vary():
+    response = compression_app().get("/big", headers=GZIP)
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) < len(BIG)
+    assert response.json() == {"value": BIG}
+
+
+def test_responses_with_content_encoding_or_binary_type_pass_through():
+    client = compression_app()
+    encoded = client.get("/encoded", headers=GZIP)
+    assert encoded.headers["content-encoding"] == "identity"
+    assert encoded.content == BIG.encode()
+    assert "content-encoding" not in client.get("/binary", headers=GZIP).headers
+
+
+def test_streaming_bodies_are_compressed():
+    response = compression_app().get("/stream", headers=GZIP)
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.text == '{"line": 0}\n{"line": 1}\n{"line": 2}\n'
+
+
+def test_no_compression_when_client_refuses():
+    response = compression_app().get("/text", headers={"Accept-Encoding": "gzip;q=0"})
+    assert "content-encoding" not in response.headers
+    assert response.text == BIG
@@ -0,0 +1,259 @@
+import asyncio
+import copy
+import json
+from datetime import datetime, timezone
+
+import httpx
+from pymongo.errors import DuplicateKeyError
+
+from idempotency import COMPLETED, IN_PROGRESS, IdempotencyMiddleware
+
+
+class FakeCollection:
+    """Just enough of a Motor collection for the middleware: unique ``_id`` and ``$set``"""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def insert_one(self, doc):
+        if doc["_id"] in self.docs:
+            raise DuplicateKeyError(f"duplicate key: {doc['_id']}")
+        self.docs[doc["_id"]] = copy.deepcopy(doc)
+
+    async def find_one(self, query):
+        doc = self.docs.get(query["_id"])
+        return copy.deepcopy(doc) if doc else None
+
+    def _match(self, query):
+        doc = self.docs.get(query["_id"])
+        if doc and all(doc.get(field) == value for field, value in query.items()):
+            return doc
+        return None
+
+    async def update_one(self, query, update):
+        doc = self._match(query)
+        if doc:
+            doc.update(copy.deepcopy(update["$set"]))
+
+    async def delete_one(self, query):
+        if self._match(query):
+            del self.docs[query["_id"]]
+
+    def expire(self):
+        """What the TTL monitor would do now"""
+        now = datetime.now(timezone.utc)
+        self.docs = {key: doc for key, doc in self.docs.items() if doc["expires_at"] > now}
+
+
+class CountingApp:
+    """ASGI app that echoes the request body with a call counter.
+
+    Calls wait on ``gate`` if given, or on ``gates[call number]``.
+    """
+
+    def __init__(self, status=200, gate=None, gates=None):
+        self.status = status
+        self.gate = gate
+        self.gates = gates or {}
+        self.calls = 0
+
+    async def __call__(self, scope, receive, send):
+        message = await receive()
+        self.calls += 1
+        call = self.calls
+        gate = self.gates.get(call, self.gate)
+        if gate is not None:
+            await gate.wait()
+        body = json.dumps({"call": call, "echo": message["body"].decode()}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": self.status,
+            "headers": [(b"content-type", b"application/json"), (b"x-internal", b"dropped")],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def client_for(middleware):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=middleware), base_url="http://test")
+
+
+def post(client, key=None, body="{}", path="/api/work"):
+    headers = {"Idempotency-Key": key} if key else {}
+    return client.post(path, content=body, headers=headers)
+
+
+def test_replays_the_stored_response():
+    async def scenario():
+        app, collection = CountingApp(status=201), FakeCollection()
+        async with client_for(IdempotencyMiddleware(app, collection)) as client:
+            first = await post(client, "k1", '{"a": 1}')
+            second = await post(client, "k1", '{"a": 1}')
+
+        assert app.calls == 1
+        assert first.status_code == second.status_code == 201
+        assert second.json() == first.json() == {"call": 1, "echo": '{"a": 1}'}
+        assert "idempotent-replayed" not in first.headers
+        assert second.headers["idempotent-replayed"] == "true"
+        assert second.headers["content-type"] == "application/json"
+        assert "x-internal" not in second.headers
+        assert collection.docs["k1"]["status"] == COMPLETED
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_duplicates_share_one_run():
+    async def scenario():
+        gate = asyncio.Event()
+        app = CountingApp(gate=gate)
+        async with client_for(IdempotencyMiddleware(app, FakeCollection())) as client:
+            first = asyncio.ensure_future(post(client, "k1"))
+            second = asyncio.ensure_future(post(client, "k1"))
+            await asyncio.sleep(0.01)
+            gate.set()
+            first, second = await asyncio.gather(first, second)
+
+        assert app.calls == 1
+        assert first.json() == second.json()
+        assert "true" in (first.headers.get("idempotent-replayed"), second.headers.get("idempotent-replayed"))
+
+    asyncio.run(scenario())
+
+
+def test_duplicate_on_another_worker_polls_until_completed():
+    async def scenario():
+        gate = asyncio.Event()
+        collection = FakeCollection()
+        owner_app, other_app = CountingApp(gate=gate), CountingApp()
+        owner = IdempotencyMiddleware(owner_app, collection, poll_interval=0.01)
+        other = IdempotencyMiddleware(other_app, collection, poll_interval=0.01)
+        async with client_for(owner) as owner_client, client_for(other) as other_client:
+            first = asyncio.ensure_future(post(owner_client, "k1"))
+            await asyncio.sleep(0.01)
+            assert collection.docs["k1"]["status"] == IN_PROGRESS
+            second = asyncio.ensure_future(post(other_client, "k1"))
+            await asyncio.sleep(0.03)
+            gate.set()
+            first, second = await asyncio.gather(first, second)
+
+        assert (owner_app.calls, other_app.calls) == (1, 0)
+        assert second.json() == first.json()
+        assert second.headers["idempotent-replayed"] == "true"
+
+    asyncio.run(scenario())
+
+
+def test_wait_timeout_returns_409():
+    async def scenario():
+        gate = asyncio.Event()
+        collection = FakeCollection()
+        owner = IdempotencyMiddleware(CountingApp(gate=gate), collection)
+        other = IdempotencyMiddleware(CountingApp(), collection, wait_timeout=0.03, poll_interval=0.01)
+        async with client_for(owner) as owner_client, client_for(other) as other_client:
+            first = asyncio.ensure_future(post(owner_client, "k1"))
+            await asyncio.sleep(0.01)
+            second = await post(other_client, "k1")
+            gate.set()
+            await first
+
+        assert second.status_code == 409
+
+    asyncio.run(scenario())
+
+
+def test_reusing_a_key_with_another_body_is_rejected():
+    async def scenario():
+        app = CountingApp()
+        async with client_for(IdempotencyMiddleware(app, FakeCollection())) as client:
+            await post(client, "k1", '{"a": 1}')
+            mismatch = await post(client, "k1", '{"a": 2}')
+
+        assert mismatch.status_code == 422
+        assert app.calls == 1
+
+    asyncio.run(scenario())
+
+
+def test_server_errors_are_not_stored():
+    async def scenario():
+        app, collection = CountingApp(status=503), FakeCollection()
+        async with client_for(IdempotencyMiddleware(app, collection)) as client:
+            first = await post(client, "k1")
+            retry = await post(client, "k1")
+
+        assert first.status_code == retry.status_code == 503
+        assert "idempotent-replayed" not in retry.headers
+        assert app.calls == 2
+        assert collection.docs == {}
+
+    asyncio.run(scenario())
+
+
+def test_requests_without_a_key_or_outside_the_prefix_pass_through():
+    async def scenario():
+        app, collection = CountingApp(), FakeCollection()
+        async with client_for(IdempotencyMiddleware(app, collection)) as client:
+            await post(client)
+            await post(client)
+            await post(client, "k1", path="/other")
+            await post(client, "k1", path="/other")
+
+        assert app.calls == 4
+        assert collection.docs == {}
+
+    asyncio.run(scenario())
+
+
+def test_claim_is_renewed_while_the_handler_runs():
+    async def scenario():
+        gate = asyncio.Event()
+        app, collection = CountingApp(gate=gate), FakeCollection()
+        middleware = IdempotencyMiddleware(app, collection, claim_seconds=0.08)
+        async with client_for(middleware) as client:
+            first = asyncio.ensure_future(post(client, "k1"))
+            await asyncio.sleep(0.25)
+            collection.expire()
+            assert collection.docs["k1"]["status"] == IN_PROGRESS
+
+            second = asyncio.ensure_future(post(client, "k1"))
+            await asyncio.sleep(0.01)
+            gate.set()
+            first, second = await asyncio.gather(first, second)
+
+        assert app.calls == 1
+        assert second.json() == first.json()
+
+    asyncio.run(scenario())
+
+
+def test_a_lapsed_owner_does_not_touch_the_new_claim():
+    async def scenario():
+        first_gate, second_gate = asyncio.Event(), asyncio.Event()
+        app, collection = CountingApp(gates={1: first_gate, 2: second_gate}), FakeCollection()
+        middleware = IdempotencyMiddleware(app, collection)
+        async with client_for(middleware) as client:
+            first = asyncio.ensure_future(post(client, "k1"))
+            await asyncio.sleep(0.01)
+            # The claim lapsed (e.g. the owner's worker stalled) and a retry took the key over
+            del collection.docs["k1"]
+            second = asyncio.ensure_future(post(client, "k1"))
+            await asyncio.sleep(0.01)
+            second_owner = collection.docs["k1"]["owner"]
+
+            first_gate.set()
+            assert (await first).json()["call"] == 1
+            assert collection.docs["k1"]["owner"] == second_owner
+            assert collection.docs["k1"]["status"] == IN_PROGRESS
+            # A duplicate still joins the running second request on this worker
+            assert "k1" in middleware._in_flight
+            third = asyncio.ensure_future(post(client, "k1"))
+            await asyncio.sleep(0.01)
+
+            second_gate.set()
+            second, third = await asyncio.gather(second, third)
+
+        assert app.calls == 2
+        assert second.json()["call"] == third.json()["call"] == 2
+        assert collection.docs["k1"]["status"] == COMPLETED
+        assert json.loads(collection.docs["k1"]["response_body"])["call"] == 2
+
+    asyncio.run(scenario())
@@ -0,0 +1,141 @@
+import asyncio
+
+import pytest
+
+from llm_router import HedgedLlmRouter, LatencyTracker, ModelRoute
+
+
+def test_model_route_parse():
+    route = ModelRoute.parse("openai:gpt-4o", "anthropic:claude-3-haiku")
+    assert route.primary == ("openai", "gpt-4o")
+    assert route.hedge == ("anthropic", "claude-3-haiku")
+    assert ModelRoute.parse("openai:gpt-4o-mini").hedge == ("openai", "gpt-4o-mini")
+
+
+@pytest.mark.parametrize("spec", ["gpt-4o", "openai:", ":gpt-4o", ""])
+def test_model_route_rejects_specs_without_provider_and_model(spec):
+    with pytest.raises(ValueError):
+        ModelRoute.parse(spec)
+    with pytest.raises(ValueError):
+        ModelRoute.parse("openai:gpt-4o", spec or "x")
+
+
+def test_latency_tracker_percentile():
+    tracker = LatencyTracker(window=10)
+    assert tracker.percentile(0.9) is None
+    for seconds in range(1, 11):
+        tracker.record(float(seconds))
+    assert tracker.percentile(0.0) == 1.0
+    assert tracker.percentile(0.9) == 9.0
+
+
+PRIMARY = ("openai", "primary")
+HEDGE = ("openai", "hedge")
+
+
+class FakeModels:
+    """``complete`` for the router: per model, a delay and optionally an error"""
+
+    def __init__(self, **behaviour):
+        self.behaviour = behaviour
+        self.started = []
+        self.cancelled = []
+
+    async def __call__(self, model, prompt):
+        name = model[1]
+        delay, error = self.behaviour[name]
+        self.started.append(name)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(name)
+            raise
+        if error:
+            raise RuntimeError(f"{name} failed")
+        return f"{name}: answer"
+
+
+def make_router(models, deadline=0.05):
+    route = ModelRoute(primary=PRIMARY, hedge=HEDGE)
+    return HedgedLlmRouter(None, "system", {}, route, initial_deadline=deadline, complete=models)
+
+
+def counters(router):
+    return {name: count for name, count in router.stats()["chat"]["counters"].items() if count}
+
+
+def test_fast_primary_is_not_hedged():
+    async def scenario():
+        models = FakeModels(primary=(0, False), hedge=(0, False))
+        router = make_router(models)
+        assert await router.send("hi", "chat") == "primary: answer"
+        assert models.started == ["primary"]
+        assert counters(router) == {"calls": 1, "primary_wins": 1}
+
+    asyncio.run(scenario())
+
+
+def test_slow_primary_is_hedged_and_the_loser_cancelled():
+    async def scenario():
+        models = FakeModels(primary=(1.0, False), hedge=(0.01, False))
+        router = make_router(models)
+        assert await router.send("hi", "chat") == "hedge: answer"
+        await asyncio.sleep(0)
+        assert models.started == ["primary", "hedge"]
+        assert models.cancelled == ["primary"]
+        assert counters(router) == {"calls": 1, "hedged": 1, "hedge_wins": 1}
+
+    asyncio.run(scenario())
+
+
+def test_hedged_primary_can_still_win():
+    async def scenario():
+        models = FakeModels(primary=(0.08, False), hedge=(1.0, False))
+        router = make_router(models)
+        assert await router.send("hi", "chat") == "primary: answer"
+        await asyncio.sleep(0)
+        assert models.cancelled == ["hedge"]
+        assert counters(router) == {"calls": 1, "hedged": 1, "primary_wins": 1}
+
+    asyncio.run(scenario())
+
+
+def test_primary_error_fails_over_without_waiting_for_the_deadline():
+    async def scenario():
+        models = FakeModels(primary=(0, True), hedge=(0, False))
+        router = make_router(models, deadline=10)
+        assert await asyncio.wait_for(router.send("hi", "chat"), timeout=1) == "hedge: answer"
+        assert counters(router) == {"calls": 1, "failovers": 1, "hedge_wins": 1}
+
+    asyncio.run(scenario())
+
+
+def test_hedge_error_waits_for_the_slow_primary():
+    async def scenario():
+        models = FakeModels(primary=(0.1, False), hedge=(0, True))
+        router = make_router(models)
+        assert await router.send("hi", "chat") == "primary: answer"
+        assert counters(router) == {"calls": 1, "hedged": 1, "primary_wins": 1}
+
+    asyncio.run(scenario())
+
+
+def test_both_failing_raises_the_last_error():
+    async def scenario():
+        models = FakeModels(primary=(0, True), hedge=(0, True))
+        router = make_router(models)
+        with pytest.raises(RuntimeError, match="hedge failed"):
+            await router.send("hi", "chat")
+        assert counters(router) == {"calls": 1, "failovers": 1, "failures": 1}
+
+    asyncio.run(scenario())
+
+
+def test_deadline_follows_recent_primary_latency():
+    router = HedgedLlmRouter(None, "system", {}, ModelRoute(PRIMARY, HEDGE), initial_deadline=20, min_deadline=2, max_deadline=60, min_samples=3)
+    assert router.deadline("chat") == 20
+    for seconds in (3.0, 4.0, 5.0):
+        router._tracker("chat", PRIMARY).record(seconds)
+    assert router.deadline("chat") == 5.0
+    router._tracker("chat", PRIMARY).record(500.0)
+    assert router.deadline("chat") == 60
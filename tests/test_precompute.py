@@ -0,0 +1,137 @@
+import asyncio
+
+import precompute
+from precompute import SpendBudget, SpeculativePrecomputer, profile_fingerprint
+
+
+def matches(doc, query):
+    for field, condition in query.items():
+        if isinstance(condition, dict) and "$ne" in condition:
+            if doc.get(field) == condition["$ne"]:
+                return False
+        elif doc.get(field) != condition:
+            return False
+    return True
+
+
+class FakeCollection:
+    """The few Motor collection methods the precomputer uses, kept in a list"""
+
+    def __init__(self):
+        self.docs = []
+
+    async def delete_many(self, query):
+        self.docs = [doc for doc in self.docs if not matches(doc, query)]
+
+    async def replace_one(self, query, replacement, upsert=False):
+        self.docs = [doc for doc in self.docs if not matches(doc, query)]
+        self.docs.append(dict(replacement))
+
+    async def find_one_and_delete(self, query):
+        for doc in self.docs:
+            if matches(doc, query):
+                self.docs.remove(doc)
+                return doc
+        return None
+
+
+PROFILE = {"id": "u1", "name": "Ada", "email": "ada@example.com", "education": "BSc", "skills": ["Python"], "career_goals": ["Become a Data Scientist"]}
+
+
+def test_fingerprint_ignores_fields_that_do_not_reach_the_prompt():
+    renamed = {**PROFILE, "name": "Ada L.", "email": "other@example.com", "age": 40}
+    assert profile_fingerprint(renamed) == profile_fingerprint(PROFILE)
+    assert profile_fingerprint({**PROFILE, "skills": ["Python", "SQL"]}) != profile_fingerprint(PROFILE)
+
+
+def test_spend_budget_caps_calls_per_hour(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(precompute.time, "monotonic", lambda: now[0])
+    budget = SpendBudget(max_calls_per_hour=2)
+
+    assert budget.try_acquire() and budget.try_acquire()
+    assert not budget.try_acquire()
+    assert budget.used == 2
+
+    # The window slides: calls older than an hour stop counting
+    now[0] += 3601
+    assert budget.try_acquire()
+    assert budget.used == 1
+
+
+def make_precomputer(collection, build_jobs, **kwargs):
+    return SpeculativePrecomputer(collection, build_jobs, delay_seconds=0.01, **kwargs)
+
+
+def test_result_is_served_only_for_the_profile_it_was_computed_for():
+    async def scenario():
+        collection = FakeCollection()
+
+        async def build_jobs(profile):
+            return [("skill_gap", "Data Scientist", lambda: asyncio.sleep(0, result={"skills": profile["skills"]}))]
+
+        precomputer = make_precomputer(collection, build_jobs)
+        precomputer.schedule("u1", PROFILE)
+        await asyncio.sleep(0.05)
+        assert precomputer.stats["computed"] == 1
+
+        changed = {**PROFILE, "skills": ["Go"]}
+        assert await precomputer.take("u1", "skill_gap", changed, target_role="Data Scientist") is None
+        assert await precomputer.take("u1", "skill_gap", PROFILE, target_role="Data Scientist") == {"skills": ["Python"]}
+        # Popped on first use
+        assert await precomputer.take("u1", "skill_gap", PROFILE, target_role="Data Scientist") is None
+        assert precomputer.stats["served"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_rescheduling_cancels_the_pending_run():
+    async def scenario():
+        collection = FakeCollection()
+        built_for = []
+
+        async def build_jobs(profile):
+            built_for.append(profile["skills"])
+            return [("recommendations", None, lambda: asyncio.sleep(0, result=profile["skills"]))]
+
+        precomputer = make_precomputer(collection, build_jobs)
+        precomputer.schedule("u1", PROFILE)
+        precomputer.schedule("u1", {**PROFILE, "skills": ["Go"]})
+        await asyncio.sleep(0.05)
+
+        assert precomputer.stats["cancelled"] == 1
+        assert built_for == [["Go"]]
+        assert [doc["data"] for doc in collection.docs] == [["Go"]]
+
+    asyncio.run(scenario())
+
+
+def test_budget_exhaustion_skips_remaining_jobs():
+    async def scenario():
+        async def build_jobs(profile):
+            return [(kind, None, lambda: asyncio.sleep(0, result="x")) for kind in ("a", "b", "c")]
+
+        precomputer = make_precomputer(FakeCollection(), build_jobs, max_calls_per_hour=2)
+        precomputer.schedule("u1", PROFILE)
+        await asyncio.sleep(0.05)
+
+        assert precomputer.stats["computed"] == 2
+        assert precomputer.stats["budget_skipped"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_failures_outside_jobs_are_counted():
+    async def scenario():
+        async def build_jobs(profile):
+            raise RuntimeError("mongo unavailable")
+
+        precomputer = make_precomputer(FakeCollection(), build_jobs)
+        precomputer.schedule("u1", PROFILE)
+        await asyncio.sleep(0.05)
+
+        assert precomputer.stats["failed"] == 1
+        assert precomputer.stats["computed"] == 0
+        assert precomputer._tasks == {}
+
+    asyncio.run(scenario())
@@ -0,0 +1,154 @@
+import asyncio
+
+import pytest
+
+from profile_lsh import (
+    GOAL_ALIGNMENT_BONUS,
+    MinHasher,
+    ProfileLshIndex,
+    adapt_recommendations,
+    compare_recommendations,
+    jaccard,
+    profile_features,
+)
+
+
+def test_jaccard():
+    assert jaccard({"a", "b"}, {"b", "c"}) == pytest.approx(1 / 3)
+    assert jaccard({"a"}, {"a"}) == 1.0
+    assert jaccard({"a"}, set()) == 0.0
+    assert jaccard(set(), set()) == 1.0
+
+
+def test_minhash_is_deterministic_and_banded():
+    features = {f"skill:{i}" for i in range(20)}
+    hasher = MinHasher(num_bands=8, rows_per_band=3)
+    signature = hasher.signature(features)
+    assert len(signature) == 24
+    assert signature == MinHasher(num_bands=8, rows_per_band=3).signature(set(sorted(features)))
+
+    bands = hasher.bands(signature)
+    assert len(bands) == 8
+    assert [band.split(":")[0] for band in bands] == [str(i) for i in range(8)]
+
+
+def test_minhash_agreement_estimates_jaccard():
+    hasher = MinHasher(num_bands=64, rows_per_band=4)
+    a = {f"f{i}" for i in range(0, 60)}
+    b = {f"f{i}" for i in range(20, 80)}  # Jaccard 0.5
+    agreement = sum(x == y for x, y in zip(hasher.signature(a), hasher.signature(b))) / 256
+    assert agreement == pytest.approx(jaccard(a, b), abs=0.1)
+
+    disjoint = {f"g{i}" for i in range(60)}
+    assert not set(hasher.bands(hasher.signature(a))) & set(hasher.bands(hasher.signature(disjoint)))
+
+
+def test_profile_features_canonicalize_skills_and_goals():
+    features = profile_features({
+        "education": "BSc Computer Science", "experience_years": 2, "skills": ["python3", "SQL"],
+        "career_goals": ["data scientist"], "interests": ["Machine-Learning"],
+    })
+    assert features == {
+        "exp:1-2", "edu:bsc computer science", "skill:python", "skill:sql",
+        "goal:data scientist", "interest:machine learning",
+    }
+
+
+def recommendation(title, match, required):
+    return {"job_title": title, "match_percentage": match, "required_skills": required, "description": "", "reasons": []}
+
+
+def test_adapt_recommendations_rescores_for_the_requesting_profile():
+    neighbor = profile_features({"skills": ["Python"], "career_goals": ["Data Scientist"]})
+    profile = {"skills": ["Python", "SQL", "Tableau", "Excel"], "career_goals": ["Data Analyst"]}
+    recommendations = [
+        recommendation("Data Scientist", 90, ["Python", "Machine Learning"]),
+        recommendation("Data Analyst", 70, ["SQL", "Tableau", "Excel", "Python"]),
+    ]
+
+    adapted = adapt_recommendations(recommendations, neighbor, profile)
+
+    # Analyst: coverage 1.0 vs 0.25 (+37.5) and now a stated goal (+5); scientist: lost goal (-5)
+    assert [(rec["job_title"], rec["match_percentage"]) for rec in adapted] == [
+        ("Data Analyst", 100.0),
+        ("Data Scientist", 90 - GOAL_ALIGNMENT_BONUS),
+    ]
+    # Inputs are not modified
+    assert recommendations[0]["match_percentage"] == 90
+
+
+def test_compare_recommendations():
+    adapted = [recommendation("Data Analyst", 80, []), recommendation("data scientist", 60, [])]
+    generated = [recommendation("Data Scientist", 70, []), recommendation("BI Developer", 50, [])]
+    comparison = compare_recommendations(adapted, generated)
+    assert comparison["title_overlap"] == pytest.approx(1 / 3)
+    assert comparison["match_abs_error"] == 10.0
+    assert compare_recommendations(adapted, [recommendation("Nurse", 50, [])])["match_abs_error"] is None
+
+
+class AsyncRows:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def __aiter__(self):
+        for row in self.rows:
+            yield row
+
+
+class FakeSignatures:
+    """profile_signatures with the candidate aggregation: band overlap, most shared first, limited"""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def replace_one(self, query, document, upsert=False):
+        self.docs[query["_id"]] = document
+
+    def aggregate(self, pipeline):
+        match, _, _, limit = pipeline
+        bands = set(match["$match"]["bands"]["$in"])
+        rows = [
+            {"_id": doc["_id"], "features": doc["features"], "shared_bands": len(bands & set(doc["bands"]))}
+            for doc in self.docs.values()
+            if doc["_id"] != match["$match"]["_id"]["$ne"] and bands & set(doc["bands"])
+        ]
+        rows.sort(key=lambda row: (-row["shared_bands"], row["_id"]))
+        return AsyncRows(rows[:limit["$limit"]])
+
+
+BASE = {
+    "education": "BSc Computer Science", "experience_years": 2, "current_role": "Software Engineer",
+    "skills": ["Python", "SQL", "Git", "Docker", "AWS"], "interests": ["Machine Learning"],
+    "career_goals": ["Data Scientist"], "preferred_industries": ["Technology"],
+}
+
+
+def test_nearest_keeps_the_candidates_sharing_most_bands():
+    async def scenario():
+        collection = FakeSignatures()
+        index = ProfileLshIndex(collection, threshold=0.8, max_candidates=3)
+        # Many common profiles that collide on some bands, indexed before the true neighbour
+        for i in range(30):
+            await index.upsert({**BASE, "id": f"common-{i:02d}", "skills": BASE["skills"][:3] + [f"Tool {i}"]})
+        await index.upsert({**BASE, "id": "twin", "preferred_industries": ["Technology", "Fintech"]})
+
+        query = {**BASE, "id": "me"}
+        query_bands = set(index._document(query)["bands"])
+        colliding = [doc for doc in collection.docs.values() if doc["_id"] != "twin" and query_bands & set(doc["bands"])]
+        assert len(colliding) > index.max_candidates
+
+        user_id, similarity, _ = await index.nearest(query)
+        assert user_id == "twin"
+        assert similarity >= 0.8
+
+    asyncio.run(scenario())
+
+
+def test_nearest_ignores_the_profile_itself_and_dissimilar_profiles():
+    async def scenario():
+        index = ProfileLshIndex(FakeSignatures(), threshold=0.8)
+        await index.upsert({**BASE, "id": "me"})
+        await index.upsert({"id": "other", "education": "MA History", "skills": ["Archiving"]})
+        assert await index.nearest({**BASE, "id": "me"}) is None
+
+    asyncio.run(scenario())
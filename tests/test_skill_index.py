@@ -0,0 +1,71 @@
+import pytest
+
+from skill_index import SKILLS, canonical_role, role_in_goal, skill_category
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("I want to go abroad", []),
+    ("Plan C is to express my ideas in a security talk", []),
+    ("Spring is my favourite season and I like Swift birds", []),
+    ("My node in the cloud has a UI bug", []),
+    ("I excel at problem solving", ["Problem Solving"]),
+])
+def test_extract_ignores_ordinary_words(text, expected):
+    assert SKILLS.extract(text) == expected
+
+
+def test_extract_finds_aliases_on_word_boundaries():
+    text = "I know ReactJS and node.js, I'm learning golang and k8s, and some information security"
+    assert SKILLS.extract(text) == ["React", "Node.js", "Go", "Kubernetes", "Cybersecurity"]
+
+
+def test_extract_prefers_longest_match():
+    assert SKILLS.extract("react native apps with ruby on rails") == ["React Native", "Ruby on Rails"]
+
+
+def test_canonical_resolves_exact_terms_including_short_names():
+    assert SKILLS.canonical("Go") == "Go"
+    assert SKILLS.canonical("c") == "C"
+    assert SKILLS.canonical("Express") == "Express"
+    assert SKILLS.canonical("golang") == "Go"
+
+
+def test_canonicalize_all_keeps_distinct_tools():
+    skills, unknown = SKILLS.canonicalize_all(["Figma", "Keras", "Scrum", "GitHub", "bash", "Spring", "js", "JavaScript", "Quantum"])
+    assert skills == ["Figma", "Keras", "Scrum", "GitHub", "Bash", "Spring", "JavaScript", "Quantum"]
+    assert unknown == ["Quantum"]
+
+
+def test_skill_categories_are_separate_from_aliases():
+    assert skill_category("Figma") == "UI/UX Design"
+    assert skill_category("Keras") == "Deep Learning"
+    assert skill_category("Python") is None
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("data scientist", "Data Scientist"),
+    ("Software Developer", "Software Engineer"),
+    ("SRE", "Site Reliability Engineer"),
+    ("Senior Data Scientist", None),
+    ("Head of Data Science", None),
+    ("Game Developer", None),
+    ("Developer Advocate", None),
+    ("Intern at Google", None),
+    ("", None),
+])
+def test_canonical_role_only_maps_whole_synonyms(text, expected):
+    assert canonical_role(text) == expected
+
+
+@pytest.mark.parametrize("goal,expected", [
+    ("Become a Data Scientist", "Data Scientist"),
+    ("data scientist", "Data Scientist"),
+    ("Become a Senior Developer", "Senior Software Engineer"),
+    ("Grow into an SRE role", "Site Reliability Engineer"),
+    ("Learn AI/ML", None),
+    ("Move from data analyst to data engineer", None),
+    ("Become a developer", None),
+    ("", None),
+])
+def test_role_in_goal(goal, expected):
+    assert role_in_goal(goal) == expected